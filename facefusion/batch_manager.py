@@ -0,0 +1,88 @@
+from typing import Any, Dict, List
+from threading import Condition
+from time import monotonic
+
+from facefusion.thread_helper import thread_lock
+from facefusion.typing import BatchRequest, BatchState, ProcessBatch
+
+BATCH_STATES : Dict[str, BatchState] = {}
+
+
+def get_batch_state(batch_name : str) -> BatchState:
+	with thread_lock():
+		if batch_name not in BATCH_STATES:
+			BATCH_STATES[batch_name] =\
+			{
+				'condition': Condition(),
+				'requests': [],
+				'is_busy': False
+			}
+	return BATCH_STATES[batch_name]
+
+
+def clear_batch_states() -> None:
+	global BATCH_STATES
+
+	BATCH_STATES = {}
+
+
+def run_batch(batch_name : str, batch_inputs : List[Any], process_batch : ProcessBatch, batch_size : int, batch_timeout : float) -> List[Any]:
+	batch_state = get_batch_state(batch_name)
+	batch_condition = batch_state.get('condition')
+	batch_request : BatchRequest =\
+	{
+		'inputs': batch_inputs,
+		'outputs': None,
+		'exception': None
+	}
+
+	with batch_condition:
+		batch_state.get('requests').append(batch_request)
+		batch_condition.notify_all()
+
+		while batch_request.get('outputs') is None and batch_request.get('exception') is None:
+			if batch_state.get('is_busy'):
+				batch_condition.wait()
+				continue
+			batch_state['is_busy'] = True
+			batch_deadline = monotonic() + batch_timeout
+			while count_batch_inputs(batch_state.get('requests')) < batch_size and monotonic() < batch_deadline:
+				batch_condition.wait(batch_deadline - monotonic())
+			batch_requests = pick_batch_requests(batch_state.get('requests'), batch_size)
+			batch_condition.release()
+			try:
+				resolve_batch_requests(batch_requests, process_batch)
+			finally:
+				batch_condition.acquire()
+				batch_state['is_busy'] = False
+				batch_condition.notify_all()
+
+	if batch_request.get('exception'):
+		raise batch_request.get('exception')
+	return batch_request.get('outputs')
+
+
+def resolve_batch_requests(batch_requests : List[BatchRequest], process_batch : ProcessBatch) -> None:
+	batch_inputs = [ batch_input for batch_request in batch_requests for batch_input in batch_request.get('inputs') ]
+
+	try:
+		batch_outputs = process_batch(batch_inputs)
+	except Exception as exception:
+		for batch_request in batch_requests:
+			batch_request['exception'] = exception
+		return
+	for batch_request in batch_requests:
+		batch_request['outputs'] = batch_outputs[:len(batch_request.get('inputs'))]
+		batch_outputs = batch_outputs[len(batch_request.get('inputs')):]
+
+
+def count_batch_inputs(batch_requests : List[BatchRequest]) -> int:
+	return sum(len(batch_request.get('inputs')) for batch_request in batch_requests)
+
+
+def pick_batch_requests(batch_requests : List[BatchRequest], batch_size : int) -> List[BatchRequest]:
+	picked_batch_requests = [ batch_requests.pop(0) ]
+
+	while batch_requests and count_batch_inputs(picked_batch_requests) + len(batch_requests[0].get('inputs')) <= batch_size:
+		picked_batch_requests.append(batch_requests.pop(0))
+	return picked_batch_requests
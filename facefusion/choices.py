@@ -1,8 +1,11 @@
 from typing import List, Dict
 
-from facefusion.typing import VideoMemoryStrategy, FaceSelectorMode, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceDetectorModel, FaceMaskType, FaceMaskRegion, TempFrameFormat, OutputVideoEncoder, OutputVideoPreset
+from facefusion.typing import ExecutionBackend, ExecutionGraphOptimization, ExecutionMode, VideoMemoryStrategy, FaceSelectorMode, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceDetectorModel, FaceMaskType, FaceMaskRegion, TempFrameMode, TempFrameFormat, TempFrameHwaccel, OutputVideoEncoder, OutputVideoPreset
 from facefusion.common_helper import create_int_range, create_float_range
 
+execution_backends : List[ExecutionBackend] = [ 'thread', 'process' ]
+execution_graph_optimizations : List[ExecutionGraphOptimization] = [ 'disable', 'basic', 'extended', 'all' ]
+execution_modes : List[ExecutionMode] = [ 'sequential', 'parallel' ]
 video_memory_strategies : List[VideoMemoryStrategy] = [ 'strict', 'moderate', 'tolerant' ]
 face_analyser_orders : List[FaceAnalyserOrder] = [ 'left-right', 'right-left', 'top-bottom', 'bottom-top', 'small-large', 'large-small', 'best-worst', 'worst-best' ]
 face_analyser_ages : List[FaceAnalyserAge] = [ 'child', 'teen', 'adult', 'senior' ]
@@ -18,7 +21,9 @@ face_detector_set : Dict[FaceDetectorModel, List[str]] =\
 face_selector_modes : List[FaceSelectorMode] = [ 'many', 'one', 'reference' ]
 face_mask_types : List[FaceMaskType] = [ 'box', 'occlusion', 'region' ]
 face_mask_regions : List[FaceMaskRegion] = [ 'skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip' ]
+temp_frame_modes : List[TempFrameMode] = [ 'file', 'stream' ]
 temp_frame_formats : List[TempFrameFormat] = [ 'bmp', 'jpg', 'png' ]
+temp_frame_hwaccels : List[TempFrameHwaccel] = [ 'auto', 'none', 'cuda', 'vaapi', 'qsv', 'd3d11va', 'dxva2', 'videotoolbox' ]
 output_video_encoders : List[OutputVideoEncoder] = [ 'libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf' ]
 output_video_presets : List[OutputVideoPreset] = [ 'ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow' ]
 
@@ -27,9 +32,15 @@ video_template_sizes : List[int] = [ 240, 360, 480, 540, 720, 1080, 1440, 2160,
 
 execution_thread_count_range : List[int] = create_int_range(1, 128, 1)
 execution_queue_count_range : List[int] = create_int_range(1, 32, 1)
+execution_concurrency_range : List[int] = create_int_range(0, 32, 1)
+execution_op_thread_count_range : List[int] = create_int_range(0, 128, 1)
 system_memory_limit_range : List[int] = create_int_range(0, 128, 1)
+face_store_memory_limit_range : List[int] = create_int_range(0, 4096, 1)
+inference_memory_limit_range : List[int] = create_int_range(0, 16384, 1)
 face_detector_score_range : List[float] = create_float_range(0.0, 1.0, 0.05)
 face_landmarker_score_range : List[float] = create_float_range(0.0, 1.0, 0.05)
+face_tracker_interval_range : List[int] = create_int_range(1, 60, 1)
+temp_chunk_duration_range : List[int] = create_int_range(0, 600, 1)
 face_mask_blur_range : List[float] = create_float_range(0.0, 1.0, 0.05)
 face_mask_padding_range : List[int] = create_int_range(0, 100, 1)
 reference_face_distance_range : List[float] = create_float_range(0.0, 1.5, 0.05)
@@ -0,0 +1,118 @@
+from typing import List, Optional
+import hashlib
+import json
+import os
+
+import facefusion.globals
+from facefusion.filesystem import get_temp_directory_path, is_file
+from facefusion.processors.frame import globals as frame_processors_globals
+from facefusion.typing import ChunkManifest, VideoChunk
+from facefusion.vision import detect_video_fps, detect_keyframe_numbers
+
+CHUNK_KEY_EXCLUDES =\
+[
+	'config_path',
+	'output_path',
+	'force_download',
+	'skip_download',
+	'headless',
+	'log_level',
+	'execution_device_id',
+	'execution_thread_count',
+	'execution_queue_count',
+	'execution_concurrency',
+	'video_memory_strategy',
+	'system_memory_limit',
+	'face_store_memory_limit',
+	'inference_memory_limit',
+	'face_cache_path',
+	'temp_frame_format',
+	'keep_temp',
+	'skip_audio',
+	'open_browser',
+	'ui_layouts'
+]
+
+
+def create_chunk_key(target_path : str) -> str:
+	chunk_key =\
+	[
+		os.path.abspath(target_path),
+		os.path.getsize(target_path),
+		os.path.getmtime(target_path),
+		{ key: getattr(facefusion.globals, key) for key in facefusion.globals.__annotations__ if key not in CHUNK_KEY_EXCLUDES },
+		{ key: getattr(frame_processors_globals, key) for key in frame_processors_globals.__annotations__ }
+	]
+	return hashlib.sha1(str(chunk_key).encode('utf-8')).hexdigest()
+
+
+def create_video_chunks(target_path : str, frame_start : int, frame_end : int, chunk_duration : int) -> List[VideoChunk]:
+	video_fps = detect_video_fps(target_path)
+	chunk_frame_total = max(round(chunk_duration * video_fps), 1)
+	keyframe_numbers = detect_keyframe_numbers(target_path, video_fps)
+	chunk_starts = list(range(frame_start, frame_end, chunk_frame_total))
+
+	if keyframe_numbers and chunk_starts:
+		chunk_starts = [ frame_start ]
+		for keyframe_number in keyframe_numbers:
+			if chunk_starts[-1] + chunk_frame_total <= keyframe_number < frame_end:
+				chunk_starts.append(keyframe_number)
+	return [ create_video_chunk(target_path, chunk_index, chunk_start, chunk_end) for chunk_index, (chunk_start, chunk_end) in enumerate(zip(chunk_starts, chunk_starts[1:] + [ frame_end ])) ]
+
+
+def create_video_chunk(target_path : str, chunk_index : int, frame_start : int, frame_end : int) -> VideoChunk:
+	_, target_extension = os.path.splitext(os.path.basename(target_path))
+	video_chunk : VideoChunk =\
+	{
+		'frame_start': frame_start,
+		'frame_end': frame_end,
+		'chunk_path': os.path.join(get_temp_directory_path(target_path), 'chunk_' + str(chunk_index).zfill(4) + target_extension)
+	}
+	return video_chunk
+
+
+def get_chunk_manifest_path(target_path : str) -> str:
+	return os.path.join(get_temp_directory_path(target_path), 'chunks.json')
+
+
+def create_chunk_manifest(target_path : str) -> ChunkManifest:
+	chunk_manifest : ChunkManifest =\
+	{
+		'chunk_key': create_chunk_key(target_path),
+		'video_chunks': []
+	}
+	return chunk_manifest
+
+
+def load_chunk_manifest(target_path : str) -> Optional[ChunkManifest]:
+	chunk_manifest_path = get_chunk_manifest_path(target_path)
+
+	if is_file(chunk_manifest_path):
+		try:
+			with open(chunk_manifest_path) as chunk_manifest_file:
+				chunk_manifest = json.load(chunk_manifest_file)
+		except (OSError, ValueError):
+			return None
+		if chunk_manifest.get('chunk_key') == create_chunk_key(target_path):
+			return chunk_manifest
+	return None
+
+
+def can_resume_chunks(target_path : str) -> bool:
+	if facefusion.globals.temp_frame_mode == 'stream' and facefusion.globals.temp_chunk_duration:
+		chunk_manifest = load_chunk_manifest(target_path)
+		return bool(chunk_manifest and chunk_manifest.get('video_chunks'))
+	return False
+
+
+def save_chunk_manifest(target_path : str, chunk_manifest : ChunkManifest) -> None:
+	chunk_manifest_path = get_chunk_manifest_path(target_path)
+	temp_chunk_manifest_path = chunk_manifest_path + '.tmp'
+
+	with open(temp_chunk_manifest_path, 'w') as chunk_manifest_file:
+		json.dump(chunk_manifest, chunk_manifest_file)
+	os.replace(temp_chunk_manifest_path, chunk_manifest_path)
+
+
+def is_video_chunk_done(chunk_manifest : ChunkManifest, video_chunk : VideoChunk) -> bool:
+	return video_chunk in chunk_manifest.get('video_chunks') and is_file(video_chunk.get('chunk_path'))
@@ -1,17 +1,19 @@
-from typing import Any
+from typing import Any, List
 from functools import lru_cache
+from itertools import islice
 from time import sleep
 import cv2
 import numpy
-import onnxruntime
 from tqdm import tqdm
 
 import facefusion.globals
-from facefusion import process_manager, wording
-from facefusion.thread_helper import thread_lock, conditional_thread_semaphore
+from facefusion import process_manager, logger, wording
+from facefusion.common_helper import get_first
+from facefusion.thread_helper import thread_lock, inference_semaphore
 from facefusion.typing import VisionFrame, ModelSet, Fps
-from facefusion.execution import apply_execution_provider_options
-from facefusion.vision import get_video_frame, count_video_frame_total, read_image, detect_video_fps
+from facefusion.inference_manager import get_inference_session, release_inference_session
+from facefusion.ffmpeg import open_sample_stream, read_stream_frames, close_stream
+from facefusion.vision import count_video_frame_total, read_image, detect_video_fps
 from facefusion.filesystem import resolve_relative_path, is_file
 from facefusion.download import conditional_download
 
@@ -26,6 +28,7 @@ MODELS : ModelSet =\
 }
 PROBABILITY_LIMIT = 0.80
 RATE_LIMIT = 10
+ANALYSE_BATCH_SIZE = 16
 STREAM_COUNTER = 0
 
 
@@ -37,13 +40,14 @@ def get_content_analyser() -> Any:
 			sleep(0.5)
 		if CONTENT_ANALYSER is None:
 			model_path = MODELS.get('open_nsfw').get('path')
-			CONTENT_ANALYSER = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			CONTENT_ANALYSER = get_inference_session(model_path)
 	return CONTENT_ANALYSER
 
 
 def clear_content_analyser() -> None:
 	global CONTENT_ANALYSER
 
+	release_inference_session(CONTENT_ANALYSER)
 	CONTENT_ANALYSER = None
 
 
@@ -69,21 +73,40 @@ def analyse_stream(vision_frame : VisionFrame, video_fps : Fps) -> bool:
 
 
 def analyse_frame(vision_frame : VisionFrame) -> bool:
+	return get_first(analyse_frames([ vision_frame ]))
+
+
+def analyse_frames(vision_frames : List[VisionFrame]) -> List[bool]:
+	content_analyser = get_content_analyser()
+	analyse_batch_size = detect_analyse_batch_size(MODELS.get('open_nsfw').get('path'))
+	prepare_vision_frames = prepare_frames(vision_frames)
+	probabilities = []
+
+	for index in range(0, len(prepare_vision_frames), analyse_batch_size):
+		with inference_semaphore('open_nsfw'):
+			probability = content_analyser.run(None,
+			{
+				content_analyser.get_inputs()[0].name: prepare_vision_frames[index:index + analyse_batch_size]
+			})[0][:, 1]
+		probabilities.extend(probability)
+	return [ bool(probability > PROBABILITY_LIMIT) for probability in probabilities ]
+
+
+@lru_cache(maxsize = None)
+def detect_analyse_batch_size(model_path : str) -> int:
 	content_analyser = get_content_analyser()
-	vision_frame = prepare_frame(vision_frame)
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
-		probability = content_analyser.run(None,
-		{
-			content_analyser.get_inputs()[0].name: vision_frame
-		})[0][0][1]
-	return probability > PROBABILITY_LIMIT
+	analyse_batch_size = content_analyser.get_inputs()[0].shape[0]
+
+	if isinstance(analyse_batch_size, int):
+		logger.debug(wording.get('batch_size_not_supported').format(model = 'open_nsfw'), __name__.upper())
+		return 1
+	return ANALYSE_BATCH_SIZE
 
 
-def prepare_frame(vision_frame : VisionFrame) -> VisionFrame:
-	vision_frame = cv2.resize(vision_frame, (224, 224)).astype(numpy.float32)
-	vision_frame -= numpy.array([ 104, 117, 123 ]).astype(numpy.float32)
-	vision_frame = numpy.expand_dims(vision_frame, axis = 0)
-	return vision_frame
+def prepare_frames(vision_frames : List[VisionFrame]) -> VisionFrame:
+	prepare_vision_frames = numpy.stack([ cv2.resize(vision_frame, (224, 224)) for vision_frame in vision_frames ]).astype(numpy.float32)
+	prepare_vision_frames -= numpy.array([ 104, 117, 123 ]).astype(numpy.float32)
+	return prepare_vision_frames
 
 
 @lru_cache(maxsize = None)
@@ -96,17 +119,26 @@ def analyse_image(image_path : str) -> bool:
 def analyse_video(video_path : str, start_frame : int, end_frame : int) -> bool:
 	video_frame_total = count_video_frame_total(video_path)
 	video_fps = detect_video_fps(video_path)
+	frame_step = max(int(video_fps), 1)
 	frame_range = range(start_frame or 0, end_frame or video_frame_total)
+	sample_total = len(range(-(-frame_range.start // frame_step) * frame_step, frame_range.stop, frame_step))
 	rate = 0.0
 	counter = 0
+	sample_counter = 0
 
 	with tqdm(total = len(frame_range), desc = wording.get('analysing'), unit = 'frame', ascii = ' =', disable = facefusion.globals.log_level in [ 'warn', 'error' ]) as progress:
-		for frame_number in frame_range:
-			if frame_number % int(video_fps) == 0:
-				frame = get_video_frame(video_path, frame_number)
-				if analyse_frame(frame):
-					counter += 1
-			rate = counter * int(video_fps) / len(frame_range) * 100
-			progress.update()
+		process = open_sample_stream(video_path, frame_range.start, frame_range.stop, frame_step, (224, 224))
+		stream_vision_frames = read_stream_frames(process, (224, 224))
+		vision_frames = list(islice(stream_vision_frames, ANALYSE_BATCH_SIZE))
+
+		while vision_frames:
+			counter += sum(analyse_frames(vision_frames))
+			sample_counter += len(vision_frames)
+			rate = counter * frame_step / len(frame_range) * 100
+			progress.update(min(len(vision_frames) * frame_step, progress.total - progress.n))
 			progress.set_postfix(rate = rate)
+			if rate > RATE_LIMIT or (counter + sample_total - sample_counter) * frame_step / len(frame_range) * 100 <= RATE_LIMIT or process_manager.is_stopping():
+				break
+			vision_frames = list(islice(stream_vision_frames, ANALYSE_BATCH_SIZE))
+		close_stream(process)
 	return rate > RATE_LIMIT
@@ -2,6 +2,7 @@ import os
 
 os.environ['OMP_NUM_THREADS'] = '1'
 
+from typing import Optional
 import signal
 import sys
 import warnings
@@ -10,14 +11,22 @@ import numpy
 import onnxruntime
 from time import sleep, time
 from argparse import ArgumentParser, HelpFormatter
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Event
+from subprocess import Popen
 
 import facefusion.choices
 import facefusion.globals
 from facefusion.face_analyser import get_one_face, get_average_face
 from facefusion.face_store import get_reference_faces, append_reference_face
+from facefusion.face_cache import load_face_cache, save_face_cache
+from facefusion.chunk_manager import create_video_chunks, create_chunk_manifest, load_chunk_manifest, save_chunk_manifest, is_video_chunk_done, can_resume_chunks
+from facefusion.typing import Fps, Resolution, StreamQueue
+from facefusion.thread_helper import put_stream_queue, iterate_stream_queue
 from facefusion import face_analyser, face_masker, content_analyser, config, process_manager, metadata, logger, wording, voice_extractor
 from facefusion.content_analyser import analyse_image, analyse_video
-from facefusion.processors.frame.core import get_frame_processors_modules, load_frame_processor_module
+from facefusion.processors.frame.core import get_frame_processors_modules, load_frame_processor_module, multi_process_chain, multi_process_stream
 from facefusion.common_helper import create_metavar, get_first
 from facefusion.execution import encode_execution_providers, decode_execution_providers
 from facefusion.normalizer import normalize_output_path, normalize_padding, normalize_fps
@@ -25,8 +34,8 @@ from facefusion.memory import limit_system_memory
 from facefusion.statistics import conditional_log_statistics
 from facefusion.download import conditional_download
 from facefusion.filesystem import get_temp_frame_paths, get_temp_file_path, create_temp, move_temp, clear_temp, is_image, is_video, filter_audio_paths, resolve_relative_path, list_directory
-from facefusion.ffmpeg import extract_frames, merge_video, copy_image, finalize_image, restore_audio, replace_audio
-from facefusion.vision import read_image, read_static_images, detect_image_resolution, restrict_video_fps, create_image_resolutions, get_video_frame, detect_video_resolution, detect_video_fps, restrict_video_resolution, restrict_image_resolution, create_video_resolutions, pack_resolution, unpack_resolution
+from facefusion.ffmpeg import extract_frames, merge_video, concat_video, copy_image, finalize_image, extract_audio, restore_audio, replace_audio, open_extract_stream, open_merge_stream, read_stream_frames, write_stream_frame, close_stream
+from facefusion.vision import read_image, read_static_images, detect_image_resolution, restrict_video_fps, create_image_resolutions, get_video_frame, clear_video_pool, detect_video_resolution, detect_video_fps, count_video_frame_total, restrict_video_resolution, restrict_image_resolution, create_video_resolutions, pack_resolution, unpack_resolution
 
 onnxruntime.set_default_logger_severity(3)
 warnings.filterwarnings('ignore', category = UserWarning, module = 'gradio')
@@ -53,12 +62,23 @@ def cli() -> None:
 	group_execution = program.add_argument_group('execution')
 	group_execution.add_argument('--execution-device-id', help = wording.get('help.execution_device_id'), default = config.get_str_value('execution.face_detector_size', '0'))
 	group_execution.add_argument('--execution-providers', help = wording.get('help.execution_providers').format(choices = ', '.join(execution_providers)), default = config.get_str_list('execution.execution_providers', 'cpu'), choices = execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
+	group_execution.add_argument('--execution-backend', help = wording.get('help.execution_backend'), default = config.get_str_value('execution.execution_backend', 'thread'), choices = facefusion.choices.execution_backends)
 	group_execution.add_argument('--execution-thread-count', help = wording.get('help.execution_thread_count'), type = int, default = config.get_int_value('execution.execution_thread_count', '4'), choices = facefusion.choices.execution_thread_count_range, metavar = create_metavar(facefusion.choices.execution_thread_count_range))
 	group_execution.add_argument('--execution-queue-count', help = wording.get('help.execution_queue_count'), type = int, default = config.get_int_value('execution.execution_queue_count', '1'), choices = facefusion.choices.execution_queue_count_range, metavar = create_metavar(facefusion.choices.execution_queue_count_range))
+	group_execution.add_argument('--execution-concurrency', help = wording.get('help.execution_concurrency'), type = int, default = config.get_int_value('execution.execution_concurrency', '0'), choices = facefusion.choices.execution_concurrency_range, metavar = create_metavar(facefusion.choices.execution_concurrency_range))
+	group_execution.add_argument('--execution-intra-op-thread-count', help = wording.get('help.execution_intra_op_thread_count'), type = int, default = config.get_int_value('execution.execution_intra_op_thread_count', '0'), choices = facefusion.choices.execution_op_thread_count_range, metavar = create_metavar(facefusion.choices.execution_op_thread_count_range))
+	group_execution.add_argument('--execution-inter-op-thread-count', help = wording.get('help.execution_inter_op_thread_count'), type = int, default = config.get_int_value('execution.execution_inter_op_thread_count', '0'), choices = facefusion.choices.execution_op_thread_count_range, metavar = create_metavar(facefusion.choices.execution_op_thread_count_range))
+	group_execution.add_argument('--execution-graph-optimization', help = wording.get('help.execution_graph_optimization'), default = config.get_str_value('execution.execution_graph_optimization', 'all'), choices = facefusion.choices.execution_graph_optimizations)
+	group_execution.add_argument('--execution-mode', help = wording.get('help.execution_mode'), default = config.get_str_value('execution.execution_mode', 'sequential'), choices = facefusion.choices.execution_modes)
+	group_execution.add_argument('--execution-cache-path', help = wording.get('help.execution_cache_path'), default = config.get_str_value('execution.execution_cache_path'))
 	# memory
 	group_memory = program.add_argument_group('memory')
 	group_memory.add_argument('--video-memory-strategy', help = wording.get('help.video_memory_strategy'), default = config.get_str_value('memory.video_memory_strategy', 'strict'), choices = facefusion.choices.video_memory_strategies)
 	group_memory.add_argument('--system-memory-limit', help = wording.get('help.system_memory_limit'), type = int, default = config.get_int_value('memory.system_memory_limit', '0'), choices = facefusion.choices.system_memory_limit_range, metavar = create_metavar(facefusion.choices.system_memory_limit_range))
+	group_memory.add_argument('--face-store-memory-limit', help = wording.get('help.face_store_memory_limit'), type = int, default = config.get_int_value('memory.face_store_memory_limit', '256'), choices = facefusion.choices.face_store_memory_limit_range, metavar = create_metavar(facefusion.choices.face_store_memory_limit_range))
+	group_memory.add_argument('--inference-memory-limit', help = wording.get('help.inference_memory_limit'), type = int, default = config.get_int_value('memory.inference_memory_limit', '4096'), choices = facefusion.choices.inference_memory_limit_range, metavar = create_metavar(facefusion.choices.inference_memory_limit_range))
+	group_memory.add_argument('--skip-memory-pattern', help = wording.get('help.skip_memory_pattern'), action = 'store_true', default = config.get_bool_value('memory.skip_memory_pattern'))
+	group_memory.add_argument('--skip-memory-arena', help = wording.get('help.skip_memory_arena'), action = 'store_true', default = config.get_bool_value('memory.skip_memory_arena'))
 	# face analyser
 	group_face_analyser = program.add_argument_group('face analyser')
 	group_face_analyser.add_argument('--face-analyser-order', help = wording.get('help.face_analyser_order'), default = config.get_str_value('face_analyser.face_analyser_order', 'left-right'), choices = facefusion.choices.face_analyser_orders)
@@ -68,6 +88,8 @@ def cli() -> None:
 	group_face_analyser.add_argument('--face-detector-size', help = wording.get('help.face_detector_size'), default = config.get_str_value('face_analyser.face_detector_size', '640x640'))
 	group_face_analyser.add_argument('--face-detector-score', help = wording.get('help.face_detector_score'), type = float, default = config.get_float_value('face_analyser.face_detector_score', '0.5'), choices = facefusion.choices.face_detector_score_range, metavar = create_metavar(facefusion.choices.face_detector_score_range))
 	group_face_analyser.add_argument('--face-landmarker-score', help = wording.get('help.face_landmarker_score'), type = float, default = config.get_float_value('face_analyser.face_landmarker_score', '0.5'), choices = facefusion.choices.face_landmarker_score_range, metavar = create_metavar(facefusion.choices.face_landmarker_score_range))
+	group_face_analyser.add_argument('--face-tracker-interval', help = wording.get('help.face_tracker_interval'), type = int, default = config.get_int_value('face_analyser.face_tracker_interval', '1'), choices = facefusion.choices.face_tracker_interval_range, metavar = create_metavar(facefusion.choices.face_tracker_interval_range))
+	group_face_analyser.add_argument('--face-cache-path', help = wording.get('help.face_cache_path'), default = config.get_str_value('face_analyser.face_cache_path'))
 	# face selector
 	group_face_selector = program.add_argument_group('face selector')
 	group_face_selector.add_argument('--face-selector-mode', help = wording.get('help.face_selector_mode'), default = config.get_str_value('face_selector.face_selector_mode', 'reference'), choices = facefusion.choices.face_selector_modes)
@@ -84,7 +106,10 @@ def cli() -> None:
 	group_frame_extraction = program.add_argument_group('frame extraction')
 	group_frame_extraction.add_argument('--trim-frame-start', help = wording.get('help.trim_frame_start'), type = int, default = facefusion.config.get_int_value('frame_extraction.trim_frame_start'))
 	group_frame_extraction.add_argument('--trim-frame-end',	help = wording.get('help.trim_frame_end'), type = int, default = facefusion.config.get_int_value('frame_extraction.trim_frame_end'))
+	group_frame_extraction.add_argument('--temp-frame-mode', help = wording.get('help.temp_frame_mode'), default = config.get_str_value('frame_extraction.temp_frame_mode', 'file'), choices = facefusion.choices.temp_frame_modes)
 	group_frame_extraction.add_argument('--temp-frame-format', help = wording.get('help.temp_frame_format'), default = config.get_str_value('frame_extraction.temp_frame_format', 'png'), choices = facefusion.choices.temp_frame_formats)
+	group_frame_extraction.add_argument('--temp-frame-hwaccel', help = wording.get('help.temp_frame_hwaccel'), default = config.get_str_value('frame_extraction.temp_frame_hwaccel', 'auto'), choices = facefusion.choices.temp_frame_hwaccels)
+	group_frame_extraction.add_argument('--temp-chunk-duration', help = wording.get('help.temp_chunk_duration'), type = int, default = config.get_int_value('frame_extraction.temp_chunk_duration', '0'), choices = facefusion.choices.temp_chunk_duration_range, metavar = create_metavar(facefusion.choices.temp_chunk_duration_range))
 	group_frame_extraction.add_argument('--keep-temp', help = wording.get('help.keep_temp'), action = 'store_true',	default = config.get_bool_value('frame_extraction.keep_temp'))
 	# output creation
 	group_output_creation = program.add_argument_group('output creation')
@@ -144,11 +169,22 @@ def apply_args(program : ArgumentParser) -> None:
 	# execution
 	facefusion.globals.execution_device_id = args.execution_device_id
 	facefusion.globals.execution_providers = decode_execution_providers(args.execution_providers)
+	facefusion.globals.execution_backend = args.execution_backend
 	facefusion.globals.execution_thread_count = args.execution_thread_count
 	facefusion.globals.execution_queue_count = args.execution_queue_count
+	facefusion.globals.execution_concurrency = args.execution_concurrency
+	facefusion.globals.execution_intra_op_thread_count = args.execution_intra_op_thread_count
+	facefusion.globals.execution_inter_op_thread_count = args.execution_inter_op_thread_count
+	facefusion.globals.execution_graph_optimization = args.execution_graph_optimization
+	facefusion.globals.execution_mode = args.execution_mode
+	facefusion.globals.execution_cache_path = args.execution_cache_path
 	# memory
 	facefusion.globals.video_memory_strategy = args.video_memory_strategy
 	facefusion.globals.system_memory_limit = args.system_memory_limit
+	facefusion.globals.face_store_memory_limit = args.face_store_memory_limit
+	facefusion.globals.inference_memory_limit = args.inference_memory_limit
+	facefusion.globals.skip_memory_pattern = args.skip_memory_pattern
+	facefusion.globals.skip_memory_arena = args.skip_memory_arena
 	# face analyser
 	facefusion.globals.face_analyser_order = args.face_analyser_order
 	facefusion.globals.face_analyser_age = args.face_analyser_age
@@ -160,6 +196,8 @@ def apply_args(program : ArgumentParser) -> None:
 		facefusion.globals.face_detector_size = '640x640'
 	facefusion.globals.face_detector_score = args.face_detector_score
 	facefusion.globals.face_landmarker_score = args.face_landmarker_score
+	facefusion.globals.face_tracker_interval = args.face_tracker_interval
+	facefusion.globals.face_cache_path = args.face_cache_path
 	# face selector
 	facefusion.globals.face_selector_mode = args.face_selector_mode
 	facefusion.globals.reference_face_position = args.reference_face_position
@@ -173,7 +211,10 @@ def apply_args(program : ArgumentParser) -> None:
 	# frame extraction
 	facefusion.globals.trim_frame_start = args.trim_frame_start
 	facefusion.globals.trim_frame_end = args.trim_frame_end
+	facefusion.globals.temp_frame_mode = args.temp_frame_mode
 	facefusion.globals.temp_frame_format = args.temp_frame_format
+	facefusion.globals.temp_frame_hwaccel = args.temp_frame_hwaccel
+	facefusion.globals.temp_chunk_duration = args.temp_chunk_duration
 	facefusion.globals.keep_temp = args.keep_temp
 	# output creation
 	facefusion.globals.output_image_quality = args.output_image_quality
@@ -238,7 +279,7 @@ def destroy() -> None:
 	process_manager.stop()
 	while process_manager.is_processing():
 		sleep(0.5)
-	if facefusion.globals.target_path:
+	if facefusion.globals.target_path and not can_resume_chunks(facefusion.globals.target_path):
 		clear_temp(facefusion.globals.target_path)
 	sys.exit(0)
 
@@ -277,14 +318,14 @@ def conditional_append_reference_faces() -> None:
 			reference_frame = get_video_frame(facefusion.globals.target_path, facefusion.globals.reference_frame_number)
 		else:
 			reference_frame = read_image(facefusion.globals.target_path)
-		reference_face = get_one_face(reference_frame, facefusion.globals.reference_face_position)
+		reference_face = get_one_face(reference_frame, facefusion.globals.reference_face_position, [ 'embedding' ])
 		append_reference_face('origin', reference_face)
 		if source_face and reference_face:
 			for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
 				abstract_reference_frame = frame_processor_module.get_reference_frame(source_face, reference_face, reference_frame)
 				if numpy.any(abstract_reference_frame):
 					reference_frame = abstract_reference_frame
-					reference_face = get_one_face(reference_frame, facefusion.globals.reference_face_position)
+					reference_face = get_one_face(reference_frame, facefusion.globals.reference_face_position, [ 'embedding' ])
 					append_reference_face(frame_processor_module.__name__, reference_face)
 
 
@@ -356,78 +397,191 @@ def process_video(start_time : float) -> None:
 	normed_output_path = normalize_output_path(facefusion.globals.target_path, facefusion.globals.output_path)
 	if analyse_video(facefusion.globals.target_path, facefusion.globals.trim_frame_start, facefusion.globals.trim_frame_end):
 		return
+	clear_video_pool()
 	# clear temp
-	logger.debug(wording.get('clearing_temp'), __name__.upper())
-	clear_temp(facefusion.globals.target_path)
+	if can_resume_chunks(facefusion.globals.target_path):
+		logger.info(wording.get('resuming_chunks'), __name__.upper())
+	else:
+		logger.debug(wording.get('clearing_temp'), __name__.upper())
+		clear_temp(facefusion.globals.target_path)
 	# create temp
 	logger.debug(wording.get('creating_temp'), __name__.upper())
 	create_temp(facefusion.globals.target_path)
-	# extract frames
 	process_manager.start()
-	temp_video_resolution = pack_resolution(restrict_video_resolution(facefusion.globals.target_path, unpack_resolution(facefusion.globals.output_video_resolution)))
-	temp_video_fps = restrict_video_fps(facefusion.globals.target_path, facefusion.globals.output_video_fps)
-	logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__.upper())
-	if extract_frames(facefusion.globals.target_path, temp_video_resolution, temp_video_fps):
-		logger.debug(wording.get('extracting_frames_succeed'), __name__.upper())
-	else:
-		if is_process_stopping():
-			return
-		logger.error(wording.get('extracting_frames_failed'), __name__.upper())
-		return
-	# process frames
-	temp_frame_paths = get_temp_frame_paths(facefusion.globals.target_path)
-	if temp_frame_paths:
-		for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
-			logger.info(wording.get('processing'), frame_processor_module.NAME)
-			frame_processor_module.process_video(facefusion.globals.source_paths, temp_frame_paths)
-			frame_processor_module.post_process()
-		if is_process_stopping():
-			return
-	else:
-		logger.error(wording.get('temp_frames_not_found'), __name__.upper())
-		return
-	# merge video
-	logger.info(wording.get('merging_video').format(resolution = facefusion.globals.output_video_resolution, fps = facefusion.globals.output_video_fps), __name__.upper())
-	if merge_video(facefusion.globals.target_path, facefusion.globals.output_video_resolution, facefusion.globals.output_video_fps):
-		logger.debug(wording.get('merging_video_succeed'), __name__.upper())
-	else:
-		if is_process_stopping():
-			return
-		logger.error(wording.get('merging_video_failed'), __name__.upper())
-		return
-	# handle audio
-	if facefusion.globals.skip_audio:
-		logger.info(wording.get('skipping_audio'), __name__.upper())
-		move_temp(facefusion.globals.target_path, normed_output_path)
-	else:
-		if 'lip_syncer' in facefusion.globals.frame_processors:
-			source_audio_path = get_first(filter_audio_paths(facefusion.globals.source_paths))
-			if source_audio_path and replace_audio(facefusion.globals.target_path, source_audio_path, normed_output_path):
-				logger.debug(wording.get('restoring_audio_succeed'), __name__.upper())
+	executor = ThreadPoolExecutor(max_workers = 1)
+	audio_future = None
+	if not facefusion.globals.skip_audio and 'lip_syncer' not in facefusion.globals.frame_processors:
+		audio_future = executor.submit(extract_audio, facefusion.globals.target_path, facefusion.globals.output_video_fps)
+	try:
+		temp_video_resolution = pack_resolution(restrict_video_resolution(facefusion.globals.target_path, unpack_resolution(facefusion.globals.output_video_resolution)))
+		temp_video_fps = restrict_video_fps(facefusion.globals.target_path, facefusion.globals.output_video_fps)
+		load_face_cache(facefusion.globals.target_path, temp_video_resolution, temp_video_fps)
+		is_streamed = False
+		# stream frames
+		if facefusion.globals.temp_frame_mode == 'stream':
+			logger.info(wording.get('streaming_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__.upper())
+			is_streamed = stream_frames(temp_video_resolution, temp_video_fps)
+			save_face_cache()
+			for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
+				frame_processor_module.post_process()
+			if is_process_stopping():
+				return
+			if is_streamed:
+				logger.debug(wording.get('streaming_frames_succeed'), __name__.upper())
+			else:
+				logger.warn(wording.get('streaming_frames_failed'), __name__.upper())
+		if not is_streamed:
+			# extract frames
+			logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__.upper())
+			if extract_frames(facefusion.globals.target_path, temp_video_resolution, temp_video_fps):
+				logger.debug(wording.get('extracting_frames_succeed'), __name__.upper())
 			else:
 				if is_process_stopping():
 					return
-				logger.warn(wording.get('restoring_audio_skipped'), __name__.upper())
-				move_temp(facefusion.globals.target_path, normed_output_path)
-		else:
-			if restore_audio(facefusion.globals.target_path, normed_output_path, facefusion.globals.output_video_fps):
-				logger.debug(wording.get('restoring_audio_succeed'), __name__.upper())
+				logger.error(wording.get('extracting_frames_failed'), __name__.upper())
+				return
+			# process frames
+			temp_frame_paths = get_temp_frame_paths(facefusion.globals.target_path)
+			if temp_frame_paths:
+				logger.info(wording.get('processing'), __name__.upper())
+				multi_process_chain(facefusion.globals.source_paths, temp_frame_paths)
+				save_face_cache()
+				for frame_processor_module in get_frame_processors_modules(facefusion.globals.frame_processors):
+					frame_processor_module.post_process()
+				if is_process_stopping():
+					return
+			else:
+				logger.error(wording.get('temp_frames_not_found'), __name__.upper())
+				return
+			# merge video
+			logger.info(wording.get('merging_video').format(resolution = facefusion.globals.output_video_resolution, fps = facefusion.globals.output_video_fps), __name__.upper())
+			if merge_video(facefusion.globals.target_path, facefusion.globals.output_video_resolution, facefusion.globals.output_video_fps):
+				logger.debug(wording.get('merging_video_succeed'), __name__.upper())
 			else:
 				if is_process_stopping():
 					return
-				logger.warn(wording.get('restoring_audio_skipped'), __name__.upper())
-				move_temp(facefusion.globals.target_path, normed_output_path)
-	# clear temp
-	logger.debug(wording.get('clearing_temp'), __name__.upper())
-	clear_temp(facefusion.globals.target_path)
-	# validate video
-	if is_video(normed_output_path):
-		seconds = '{:.2f}'.format((time() - start_time))
-		logger.info(wording.get('processing_video_succeed').format(seconds = seconds), __name__.upper())
-		conditional_log_statistics()
-	else:
-		logger.error(wording.get('processing_video_failed'), __name__.upper())
-	process_manager.end()
+				logger.error(wording.get('merging_video_failed'), __name__.upper())
+				return
+		# handle audio
+		if facefusion.globals.skip_audio:
+			logger.info(wording.get('skipping_audio'), __name__.upper())
+			move_temp(facefusion.globals.target_path, normed_output_path)
+		else:
+			if 'lip_syncer' in facefusion.globals.frame_processors:
+				source_audio_path = get_first(filter_audio_paths(facefusion.globals.source_paths))
+				if source_audio_path and replace_audio(facefusion.globals.target_path, source_audio_path, normed_output_path):
+					logger.debug(wording.get('restoring_audio_succeed'), __name__.upper())
+				else:
+					if is_process_stopping():
+						return
+					logger.warn(wording.get('restoring_audio_skipped'), __name__.upper())
+					move_temp(facefusion.globals.target_path, normed_output_path)
+			else:
+				if audio_future:
+					audio_future.result()
+				if restore_audio(facefusion.globals.target_path, normed_output_path, facefusion.globals.output_video_fps):
+					logger.debug(wording.get('restoring_audio_succeed'), __name__.upper())
+				else:
+					if is_process_stopping():
+						return
+					logger.warn(wording.get('restoring_audio_skipped'), __name__.upper())
+					move_temp(facefusion.globals.target_path, normed_output_path)
+		# clear temp
+		logger.debug(wording.get('clearing_temp'), __name__.upper())
+		clear_temp(facefusion.globals.target_path)
+		# validate video
+		if is_video(normed_output_path):
+			seconds = '{:.2f}'.format((time() - start_time))
+			logger.info(wording.get('processing_video_succeed').format(seconds = seconds), __name__.upper())
+			conditional_log_statistics()
+		else:
+			logger.error(wording.get('processing_video_failed'), __name__.upper())
+		process_manager.end()
+	finally:
+		if audio_future:
+			audio_future.cancel()
+		executor.shutdown(wait = True)
+
+
+def stream_frames(temp_video_resolution : str, temp_video_fps : Fps) -> bool:
+	if facefusion.globals.temp_chunk_duration:
+		return stream_chunks(temp_video_resolution, temp_video_fps)
+	return stream_frame_range(facefusion.globals.trim_frame_start, facefusion.globals.trim_frame_end, get_temp_file_path(facefusion.globals.target_path), temp_video_resolution, temp_video_fps)
+
+
+def stream_chunks(temp_video_resolution : str, temp_video_fps : Fps) -> bool:
+	trim_frame_start = facefusion.globals.trim_frame_start or 0
+	trim_frame_end = facefusion.globals.trim_frame_end or count_video_frame_total(facefusion.globals.target_path)
+	video_chunks = create_video_chunks(facefusion.globals.target_path, trim_frame_start, trim_frame_end, facefusion.globals.temp_chunk_duration)
+	chunk_manifest = load_chunk_manifest(facefusion.globals.target_path) or create_chunk_manifest(facefusion.globals.target_path)
+
+	for chunk_index, video_chunk in enumerate(video_chunks, 1):
+		if is_video_chunk_done(chunk_manifest, video_chunk):
+			logger.debug(wording.get('skipping_chunk').format(chunk_index = chunk_index, chunk_total = len(video_chunks)), __name__.upper())
+			continue
+		logger.info(wording.get('streaming_chunk').format(chunk_index = chunk_index, chunk_total = len(video_chunks)), __name__.upper())
+		chunk_frame_end = video_chunk.get('frame_end')
+		if chunk_index == len(video_chunks) and facefusion.globals.trim_frame_end is None:
+			chunk_frame_end = None
+		if not stream_frame_range(video_chunk.get('frame_start'), chunk_frame_end, video_chunk.get('chunk_path'), temp_video_resolution, temp_video_fps) or not process_manager.is_processing():
+			return False
+		chunk_manifest.get('video_chunks').append(video_chunk)
+		save_chunk_manifest(facefusion.globals.target_path, chunk_manifest)
+	return bool(video_chunks) and concat_video(facefusion.globals.target_path, [ video_chunk.get('chunk_path') for video_chunk in video_chunks ])
+
+
+def stream_frame_range(trim_frame_start : Optional[int], trim_frame_end : Optional[int], temp_file_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> bool:
+	video_fps = detect_video_fps(facefusion.globals.target_path)
+	temp_frame_start = round(((trim_frame_start or 0) - (facefusion.globals.trim_frame_start or 0)) * temp_video_fps / video_fps)
+	temp_frame_end = round(((trim_frame_end or count_video_frame_total(facefusion.globals.target_path)) - (facefusion.globals.trim_frame_start or 0)) * temp_video_fps / video_fps)
+	stream_queue_size = facefusion.globals.execution_thread_count * max(facefusion.globals.execution_queue_count, facefusion.globals.face_tracker_interval) * 2
+	extract_queue : StreamQueue = Queue(maxsize = stream_queue_size)
+	merge_queue : StreamQueue = Queue(maxsize = stream_queue_size)
+	stop_event = Event()
+	is_processed = True
+
+	with ThreadPoolExecutor(max_workers = 2) as executor:
+		extract_process = open_extract_stream(facefusion.globals.target_path, trim_frame_start, trim_frame_end, temp_video_resolution, temp_video_fps)
+		extract_future = executor.submit(extract_stream_frames, extract_process, unpack_resolution(temp_video_resolution), extract_queue, stop_event)
+		merge_future = executor.submit(merge_stream_frames, temp_file_path, merge_queue, stop_event)
+		try:
+			for output_vision_frame in multi_process_stream(facefusion.globals.source_paths, iterate_stream_queue(extract_queue, stop_event), temp_frame_start, temp_frame_end - temp_frame_start):
+				if not put_stream_queue(merge_queue, output_vision_frame, stop_event):
+					is_processed = False
+					break
+			put_stream_queue(merge_queue, None, stop_event)
+		finally:
+			stop_event.set()
+		is_extracted = extract_future.result()
+		is_merged = merge_future.result()
+	return is_extracted and is_processed and is_merged
+
+
+def extract_stream_frames(extract_process : Popen[bytes], temp_video_resolution : Resolution, extract_queue : StreamQueue, stop_event : Event) -> bool:
+	for temp_vision_frame in read_stream_frames(extract_process, temp_video_resolution):
+		if not put_stream_queue(extract_queue, temp_vision_frame, stop_event):
+			break
+	put_stream_queue(extract_queue, None, stop_event)
+	return close_stream(extract_process)
+
+
+def merge_stream_frames(temp_file_path : str, merge_queue : StreamQueue, stop_event : Event) -> bool:
+	merge_process = None
+	is_written = True
+
+	for output_vision_frame in iterate_stream_queue(merge_queue, stop_event):
+		if not merge_process:
+			output_height, output_width = output_vision_frame.shape[:2]
+			merge_process = open_merge_stream(facefusion.globals.target_path, temp_file_path, pack_resolution((output_width, output_height)), facefusion.globals.output_video_resolution, facefusion.globals.output_video_fps)
+			if not merge_process:
+				break
+		if not write_stream_frame(merge_process, output_vision_frame):
+			is_written = False
+			break
+	stop_event.set()
+	if merge_process:
+		return close_stream(merge_process) and is_written
+	return False
 
 
 def is_process_stopping() -> bool:
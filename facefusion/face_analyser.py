@@ -2,18 +2,18 @@ from typing import Any, Optional, List, Tuple
 from time import sleep
 import cv2
 import numpy
-import onnxruntime
 
 import facefusion.globals
 from facefusion import process_manager
 from facefusion.common_helper import get_first
 from facefusion.face_helper import estimate_matrix_by_face_landmark_5, warp_face_by_face_landmark_5, warp_face_by_translation, create_static_anchors, distance_to_face_landmark_5, distance_to_bounding_box, convert_face_landmark_68_to_5, apply_nms, categorize_age, categorize_gender
 from facefusion.face_store import get_static_faces, set_static_faces
-from facefusion.execution import apply_execution_provider_options
+from facefusion.tensor_helper import prepare_vision_frames
+from facefusion.inference_manager import get_inference_session, release_inference_session, run_inference
 from facefusion.download import conditional_download
 from facefusion.filesystem import resolve_relative_path, is_file
-from facefusion.thread_helper import thread_lock, thread_semaphore, conditional_thread_semaphore
-from facefusion.typing import VisionFrame, Face, FaceSet, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, ModelSet, BoundingBox, FaceLandmarkSet, FaceLandmark5, FaceLandmark68, Score, FaceScoreSet, Embedding
+from facefusion.thread_helper import thread_lock, inference_semaphore
+from facefusion.typing import VisionFrame, Face, FaceSet, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceAnalyserAttribute, ModelSet, BoundingBox, FaceLandmarkSet, FaceLandmark5, FaceLandmark68, Score, FaceScoreSet, Detection, Embedding
 from facefusion.vision import resize_frame_resolution, unpack_resolution
 
 FACE_ANALYSER = None
@@ -88,24 +88,24 @@ def get_face_analyser() -> Any:
 			sleep(0.5)
 		if FACE_ANALYSER is None:
 			if facefusion.globals.face_detector_model in [ 'many', 'retinaface' ]:
-				face_detectors['retinaface'] = onnxruntime.InferenceSession(MODELS.get('face_detector_retinaface').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+				face_detectors['retinaface'] = get_inference_session(MODELS.get('face_detector_retinaface').get('path'))
 			if facefusion.globals.face_detector_model in [ 'many', 'scrfd' ]:
-				face_detectors['scrfd'] = onnxruntime.InferenceSession(MODELS.get('face_detector_scrfd').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+				face_detectors['scrfd'] = get_inference_session(MODELS.get('face_detector_scrfd').get('path'))
 			if facefusion.globals.face_detector_model in [ 'many', 'yoloface' ]:
-				face_detectors['yoloface'] = onnxruntime.InferenceSession(MODELS.get('face_detector_yoloface').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+				face_detectors['yoloface'] = get_inference_session(MODELS.get('face_detector_yoloface').get('path'))
 			if facefusion.globals.face_detector_model in [ 'yunet' ]:
 				face_detectors['yunet'] = cv2.FaceDetectorYN.create(MODELS.get('face_detector_yunet').get('path'), '', (0, 0))
 			if facefusion.globals.face_recognizer_model == 'arcface_blendswap':
-				face_recognizer = onnxruntime.InferenceSession(MODELS.get('face_recognizer_arcface_blendswap').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+				face_recognizer = get_inference_session(MODELS.get('face_recognizer_arcface_blendswap').get('path'))
 			if facefusion.globals.face_recognizer_model == 'arcface_inswapper':
-				face_recognizer = onnxruntime.InferenceSession(MODELS.get('face_recognizer_arcface_inswapper').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+				face_recognizer = get_inference_session(MODELS.get('face_recognizer_arcface_inswapper').get('path'))
 			if facefusion.globals.face_recognizer_model == 'arcface_simswap':
-				face_recognizer = onnxruntime.InferenceSession(MODELS.get('face_recognizer_arcface_simswap').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+				face_recognizer = get_inference_session(MODELS.get('face_recognizer_arcface_simswap').get('path'))
 			if facefusion.globals.face_recognizer_model == 'arcface_uniface':
-				face_recognizer = onnxruntime.InferenceSession(MODELS.get('face_recognizer_arcface_uniface').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
-			face_landmarkers['68'] = onnxruntime.InferenceSession(MODELS.get('face_landmarker_68').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
-			face_landmarkers['68_5'] = onnxruntime.InferenceSession(MODELS.get('face_landmarker_68_5').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
-			gender_age = onnxruntime.InferenceSession(MODELS.get('gender_age').get('path'), providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+				face_recognizer = get_inference_session(MODELS.get('face_recognizer_arcface_uniface').get('path'))
+			face_landmarkers['68'] = get_inference_session(MODELS.get('face_landmarker_68').get('path'))
+			face_landmarkers['68_5'] = get_inference_session(MODELS.get('face_landmarker_68_5').get('path'))
+			gender_age = get_inference_session(MODELS.get('gender_age').get('path'))
 			FACE_ANALYSER =\
 			{
 				'face_detectors': face_detectors,
@@ -119,6 +119,13 @@ def get_face_analyser() -> Any:
 def clear_face_analyser() -> Any:
 	global FACE_ANALYSER
 
+	if FACE_ANALYSER:
+		for face_detector in FACE_ANALYSER.get('face_detectors').values():
+			release_inference_session(face_detector)
+		for face_landmarker in FACE_ANALYSER.get('face_landmarkers').values():
+			release_inference_session(face_landmarker)
+		release_inference_session(FACE_ANALYSER.get('face_recognizer'))
+		release_inference_session(FACE_ANALYSER.get('gender_age'))
 	FACE_ANALYSER = None
 
 
@@ -169,176 +176,162 @@ def pre_check() -> bool:
 	return all(is_file(model_path) for model_path in model_paths)
 
 
-def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[FaceLandmark5], List[Score]]:
+def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str) -> Detection:
+	return get_first(batch_detect_with_retinaface([ vision_frame ], face_detector_size))
+
+
+def batch_detect_with_retinaface(vision_frames : List[VisionFrame], face_detector_size : str) -> List[Detection]:
 	face_detector = get_face_analyser().get('face_detectors').get('retinaface')
-	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
-	temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
-	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
-	ratio_width = vision_frame.shape[1] / temp_vision_frame.shape[1]
-	feature_strides = [ 8, 16, 32 ]
-	feature_map_channel = 3
-	anchor_total = 2
-	bounding_box_list = []
-	face_landmark_5_list = []
-	score_list = []
+	return batch_detect_with_anchors('retinaface', face_detector, vision_frames, face_detector_size)
 
-	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	with thread_semaphore():
-		detections = face_detector.run(None,
-		{
-			face_detector.get_inputs()[0].name: detect_vision_frame
-		})
-	for index, feature_stride in enumerate(feature_strides):
-		keep_indices = numpy.where(detections[index] >= facefusion.globals.face_detector_score)[0]
-		if keep_indices.any():
-			stride_height = face_detector_height // feature_stride
-			stride_width = face_detector_width // feature_stride
-			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)
-			bounding_box_raw = detections[index + feature_map_channel] * feature_stride
-			face_landmark_5_raw = detections[index + feature_map_channel * 2] * feature_stride
-			for bounding_box in distance_to_bounding_box(anchors, bounding_box_raw)[keep_indices]:
-				bounding_box_list.append(numpy.array(
-				[
-					bounding_box[0] * ratio_width,
-					bounding_box[1] * ratio_height,
-					bounding_box[2] * ratio_width,
-					bounding_box[3] * ratio_height
-				]))
-			for face_landmark_5 in distance_to_face_landmark_5(anchors, face_landmark_5_raw)[keep_indices]:
-				face_landmark_5_list.append(face_landmark_5 * [ ratio_width, ratio_height ])
-			for score in detections[index][keep_indices]:
-				score_list.append(score[0])
-	return bounding_box_list, face_landmark_5_list, score_list
-
-
-def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[FaceLandmark5], List[Score]]:
+
+def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> Detection:
+	return get_first(batch_detect_with_scrfd([ vision_frame ], face_detector_size))
+
+
+def batch_detect_with_scrfd(vision_frames : List[VisionFrame], face_detector_size : str) -> List[Detection]:
 	face_detector = get_face_analyser().get('face_detectors').get('scrfd')
+	return batch_detect_with_anchors('scrfd', face_detector, vision_frames, face_detector_size)
+
+
+def batch_detect_with_anchors(face_detector_model : str, face_detector : Any, vision_frames : List[VisionFrame], face_detector_size : str) -> List[Detection]:
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
-	temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
-	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
-	ratio_width = vision_frame.shape[1] / temp_vision_frame.shape[1]
 	feature_strides = [ 8, 16, 32 ]
 	feature_map_channel = 3
 	anchor_total = 2
-	bounding_box_list = []
-	face_landmark_5_list = []
-	score_list = []
+	detect_vision_frames, detect_ratios = prepare_detect_frames(vision_frames, face_detector_size)
+	detections = forward_face_detector(face_detector_model, face_detector, detect_vision_frames)
+	frame_indices_list = []
+	bounding_boxes_list = []
+	face_landmarks_5_list = []
+	scores_list = []
 
-	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	with thread_semaphore():
-		detections = face_detector.run(None,
-		{
-			face_detector.get_inputs()[0].name: detect_vision_frame
-		})
 	for index, feature_stride in enumerate(feature_strides):
-		keep_indices = numpy.where(detections[index] >= facefusion.globals.face_detector_score)[0]
-		if keep_indices.any():
+		score_raw = detections[index].reshape(len(vision_frames), -1)
+		frame_indices, anchor_indices = numpy.nonzero(score_raw >= facefusion.globals.face_detector_score)
+		if frame_indices.size > 0:
 			stride_height = face_detector_height // feature_stride
 			stride_width = face_detector_width // feature_stride
-			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)
-			bounding_box_raw = detections[index + feature_map_channel] * feature_stride
-			face_landmark_5_raw = detections[index + feature_map_channel * 2] * feature_stride
-			for bounding_box in distance_to_bounding_box(anchors, bounding_box_raw)[keep_indices]:
-				bounding_box_list.append(numpy.array(
-				[
-					bounding_box[0] * ratio_width,
-					bounding_box[1] * ratio_height,
-					bounding_box[2] * ratio_width,
-					bounding_box[3] * ratio_height
-				]))
-			for face_landmark_5 in distance_to_face_landmark_5(anchors, face_landmark_5_raw)[keep_indices]:
-				face_landmark_5_list.append(face_landmark_5 * [ ratio_width, ratio_height ])
-			for score in detections[index][keep_indices]:
-				score_list.append(score[0])
-	return bounding_box_list, face_landmark_5_list, score_list
-
-
-def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[FaceLandmark5], List[Score]]:
-	face_detector = get_face_analyser().get('face_detectors').get('yoloface')
-	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
-	temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
-	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
-	ratio_width = vision_frame.shape[1] / temp_vision_frame.shape[1]
-	bounding_box_list = []
-	face_landmark_5_list = []
-	score_list = []
+			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)[anchor_indices]
+			bounding_box_raw = detections[index + feature_map_channel].reshape(len(vision_frames), -1, 4)[frame_indices, anchor_indices] * feature_stride
+			face_landmark_5_raw = detections[index + feature_map_channel * 2].reshape(len(vision_frames), -1, 10)[frame_indices, anchor_indices] * feature_stride
+			frame_indices_list.append(frame_indices)
+			bounding_boxes_list.append(distance_to_bounding_box(anchors, bounding_box_raw) * numpy.tile(detect_ratios[frame_indices], 2))
+			face_landmarks_5_list.append(distance_to_face_landmark_5(anchors, face_landmark_5_raw) * detect_ratios[frame_indices][:, numpy.newaxis])
+			scores_list.append(score_raw[frame_indices, anchor_indices])
+	return create_frame_detections(len(vision_frames), frame_indices_list, bounding_boxes_list, face_landmarks_5_list, scores_list)
 
-	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	with thread_semaphore():
-		detections = face_detector.run(None,
-		{
-			face_detector.get_inputs()[0].name: detect_vision_frame
-		})
-	detections = numpy.squeeze(detections).T
-	bounding_box_raw, score_raw, face_landmark_5_raw = numpy.split(detections, [ 4, 5 ], axis = 1)
-	keep_indices = numpy.where(score_raw > facefusion.globals.face_detector_score)[0]
-	if keep_indices.any():
-		bounding_box_raw, face_landmark_5_raw, score_raw = bounding_box_raw[keep_indices], face_landmark_5_raw[keep_indices], score_raw[keep_indices]
-		for bounding_box in bounding_box_raw:
-			bounding_box_list.append(numpy.array(
-			[
-				(bounding_box[0] - bounding_box[2] / 2) * ratio_width,
-				(bounding_box[1] - bounding_box[3] / 2) * ratio_height,
-				(bounding_box[0] + bounding_box[2] / 2) * ratio_width,
-				(bounding_box[1] + bounding_box[3] / 2) * ratio_height
-			]))
-		face_landmark_5_raw[:, 0::3] = (face_landmark_5_raw[:, 0::3]) * ratio_width
-		face_landmark_5_raw[:, 1::3] = (face_landmark_5_raw[:, 1::3]) * ratio_height
-		for face_landmark_5 in face_landmark_5_raw:
-			face_landmark_5_list.append(numpy.array(face_landmark_5.reshape(-1, 3)[:, :2]))
-		score_list = score_raw.ravel().tolist()
-	return bounding_box_list, face_landmark_5_list, score_list
-
-
-def detect_with_yunet(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[FaceLandmark5], List[Score]]:
+
+def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -> Detection:
+	return get_first(batch_detect_with_yoloface([ vision_frame ], face_detector_size))
+
+
+def batch_detect_with_yoloface(vision_frames : List[VisionFrame], face_detector_size : str) -> List[Detection]:
+	face_detector = get_face_analyser().get('face_detectors').get('yoloface')
+	detect_vision_frames, detect_ratios = prepare_detect_frames(vision_frames, face_detector_size)
+	detections = forward_face_detector('yoloface', face_detector, detect_vision_frames)
+	frame_indices_list = []
+	bounding_boxes_list = []
+	face_landmarks_5_list = []
+	scores_list = []
+
+	yoloface_detections = detections[0].transpose(0, 2, 1)
+	bounding_box_raw, score_raw, face_landmark_5_raw = numpy.split(yoloface_detections, [ 4, 5 ], axis = 2)
+	frame_indices, anchor_indices = numpy.nonzero(score_raw[:, :, 0] > facefusion.globals.face_detector_score)
+	if frame_indices.size > 0:
+		bounding_box_raw = bounding_box_raw[frame_indices, anchor_indices]
+		frame_indices_list.append(frame_indices)
+		bounding_boxes_list.append(numpy.column_stack(
+		[
+			bounding_box_raw[:, 0] - bounding_box_raw[:, 2] / 2,
+			bounding_box_raw[:, 1] - bounding_box_raw[:, 3] / 2,
+			bounding_box_raw[:, 0] + bounding_box_raw[:, 2] / 2,
+			bounding_box_raw[:, 1] + bounding_box_raw[:, 3] / 2
+		]) * numpy.tile(detect_ratios[frame_indices], 2))
+		face_landmarks_5_list.append(face_landmark_5_raw[frame_indices, anchor_indices].reshape(-1, 5, 3)[:, :, :2] * detect_ratios[frame_indices][:, numpy.newaxis])
+		scores_list.append(score_raw[frame_indices, anchor_indices, 0])
+	return create_frame_detections(len(vision_frames), frame_indices_list, bounding_boxes_list, face_landmarks_5_list, scores_list)
+
+
+def detect_with_yunet(vision_frame : VisionFrame, face_detector_size : str) -> Detection:
 	face_detector = get_face_analyser().get('face_detectors').get('yunet')
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
 	temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
 	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
 	ratio_width = vision_frame.shape[1] / temp_vision_frame.shape[1]
-	bounding_box_list = []
-	face_landmark_5_list = []
-	score_list = []
 
-	face_detector.setInputSize((temp_vision_frame.shape[1], temp_vision_frame.shape[0]))
-	face_detector.setScoreThreshold(facefusion.globals.face_detector_score)
-	with thread_semaphore():
+	with inference_semaphore('face_detector_yunet'):
+		face_detector.setInputSize((temp_vision_frame.shape[1], temp_vision_frame.shape[0]))
+		face_detector.setScoreThreshold(facefusion.globals.face_detector_score)
 		_, detections = face_detector.detect(temp_vision_frame)
 	if numpy.any(detections):
-		for detection in detections:
-			bounding_box_list.append(numpy.array(
-			[
-				detection[0] * ratio_width,
-				detection[1] * ratio_height,
-				(detection[0] + detection[2]) * ratio_width,
-				(detection[1] + detection[3]) * ratio_height
-			]))
-			face_landmark_5_list.append(detection[4:14].reshape((5, 2)) * [ ratio_width, ratio_height ])
-			score_list.append(detection[14])
-	return bounding_box_list, face_landmark_5_list, score_list
-
-
-def prepare_detect_frame(temp_vision_frame : VisionFrame, face_detector_size : str) -> VisionFrame:
+		bounding_boxes = numpy.column_stack(
+		[
+			detections[:, 0],
+			detections[:, 1],
+			detections[:, 0] + detections[:, 2],
+			detections[:, 1] + detections[:, 3]
+		]) * [ ratio_width, ratio_height, ratio_width, ratio_height ]
+		face_landmarks_5 = detections[:, 4:14].reshape(-1, 5, 2) * [ ratio_width, ratio_height ]
+		return bounding_boxes, face_landmarks_5, detections[:, 14]
+	return create_empty_detection()
+
+
+def prepare_detect_frames(vision_frames : List[VisionFrame], face_detector_size : str) -> Tuple[VisionFrame, numpy.ndarray[Any, Any]]:
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
-	detect_vision_frame = numpy.zeros((face_detector_height, face_detector_width, 3))
-	detect_vision_frame[:temp_vision_frame.shape[0], :temp_vision_frame.shape[1], :] = temp_vision_frame
-	detect_vision_frame = (detect_vision_frame - 127.5) / 128.0
-	detect_vision_frame = numpy.expand_dims(detect_vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
-	return detect_vision_frame
+	detect_vision_frames = numpy.zeros((len(vision_frames), face_detector_height, face_detector_width, 3), dtype = numpy.uint8)
+	detect_ratios = numpy.ones((len(vision_frames), 2))
+
+	for index, vision_frame in enumerate(vision_frames):
+		temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
+		detect_vision_frames[index, :temp_vision_frame.shape[0], :temp_vision_frame.shape[1]] = temp_vision_frame
+		detect_ratios[index] = vision_frame.shape[1] / temp_vision_frame.shape[1], vision_frame.shape[0] / temp_vision_frame.shape[0]
+	detect_vision_frames = prepare_vision_frames(detect_vision_frames, [ 0.5, 0.5, 0.5 ], [ 128 / 255, 128 / 255, 128 / 255 ], False)
+	return detect_vision_frames, detect_ratios
+
+
+def forward_face_detector(face_detector_model : str, face_detector : Any, detect_vision_frames : VisionFrame) -> List[numpy.ndarray[Any, Any]]:
+	detect_batch_size = face_detector.get_inputs()[0].shape[0]
+	if not isinstance(detect_batch_size, int):
+		detect_batch_size = len(detect_vision_frames)
+	detections_list = []
+
+	for index in range(0, len(detect_vision_frames), detect_batch_size):
+		detect_vision_frame_batch = detect_vision_frames[index:index + detect_batch_size]
+		with inference_semaphore('face_detector_' + face_detector_model):
+			detections = face_detector.run(None,
+			{
+				face_detector.get_inputs()[0].name: detect_vision_frame_batch
+			})
+		detections_list.append([ detection.reshape(len(detect_vision_frame_batch), -1, detection.shape[-1]) for detection in detections ])
+	return [ numpy.concatenate(detections) for detections in zip(*detections_list) ]
+
+
+def create_frame_detections(frame_total : int, frame_indices_list : List[numpy.ndarray[Any, Any]], bounding_boxes_list : List[numpy.ndarray[Any, Any]], face_landmarks_5_list : List[numpy.ndarray[Any, Any]], scores_list : List[numpy.ndarray[Any, Any]]) -> List[Detection]:
+	if frame_indices_list:
+		frame_indices = numpy.concatenate(frame_indices_list)
+		sort_indices = numpy.argsort(frame_indices, kind = 'stable')
+		frame_bounds = numpy.searchsorted(frame_indices[sort_indices], numpy.arange(1, frame_total))
+		bounding_boxes = numpy.split(numpy.concatenate(bounding_boxes_list)[sort_indices], frame_bounds)
+		face_landmarks_5 = numpy.split(numpy.concatenate(face_landmarks_5_list)[sort_indices], frame_bounds)
+		scores = numpy.split(numpy.concatenate(scores_list)[sort_indices], frame_bounds)
+		return list(zip(bounding_boxes, face_landmarks_5, scores))
+	return [ create_empty_detection() for _ in range(frame_total) ]
+
 
+def create_empty_detection() -> Detection:
+	return numpy.empty((0, 4)), numpy.empty((0, 5, 2)), numpy.empty(0)
 
-def create_faces(vision_frame : VisionFrame, bounding_box_list : List[BoundingBox], face_landmark_5_list : List[FaceLandmark5], score_list : List[Score]) -> List[Face]:
+
+def create_faces(vision_frame : VisionFrame, bounding_boxes : numpy.ndarray[Any, Any], face_landmarks_5 : numpy.ndarray[Any, Any], detector_scores : numpy.ndarray[Any, Any]) -> List[Face]:
 	faces = []
 	if facefusion.globals.face_detector_score > 0:
-		sort_indices = numpy.argsort(-numpy.array(score_list))
-		bounding_box_list = [ bounding_box_list[index] for index in sort_indices ]
-		face_landmark_5_list = [face_landmark_5_list[index] for index in sort_indices]
-		score_list = [ score_list[index] for index in sort_indices ]
 		iou_threshold = 0.1 if facefusion.globals.face_detector_model == 'many' else 0.4
-		keep_indices = apply_nms(bounding_box_list, iou_threshold)
+		keep_indices = apply_nms(bounding_boxes, detector_scores, iou_threshold)
 		for index in keep_indices:
-			bounding_box = bounding_box_list[index]
-			face_landmark_5_68 = face_landmark_5_list[index]
+			bounding_box = bounding_boxes[index]
+			face_landmark_5 = face_landmarks_5[index]
+			face_landmark_5_68 = face_landmark_5
 			face_landmark_68_5 = expand_face_landmark_68_from_5(face_landmark_5_68)
 			face_landmark_68 = face_landmark_68_5
 			face_landmark_68_score = 0.0
@@ -348,42 +341,52 @@ def create_faces(vision_frame : VisionFrame, bounding_box_list : List[BoundingBo
 					face_landmark_5_68 = convert_face_landmark_68_to_5(face_landmark_68)
 			landmarks : FaceLandmarkSet =\
 			{
-				'5': face_landmark_5_list[index],
+				'5': face_landmark_5,
 				'5/68': face_landmark_5_68,
 				'68': face_landmark_68,
 				'68/5': face_landmark_68_5
 			}
 			scores : FaceScoreSet = \
 			{
-				'detector': score_list[index],
+				'detector': float(detector_scores[index]),
 				'landmarker': face_landmark_68_score
 			}
-			embedding, normed_embedding = calc_embedding(vision_frame, landmarks.get('5/68'))
-			gender, age = detect_gender_age(vision_frame, bounding_box)
 			faces.append(Face(
 				bounding_box = bounding_box,
 				landmarks = landmarks,
 				scores = scores,
-				embedding = embedding,
-				normed_embedding = normed_embedding,
-				gender = gender,
-				age = age
+				embedding = None,
+				normed_embedding = None,
+				gender = None,
+				age = None
 			))
 	return faces
 
 
+def analyse_faces(vision_frame : VisionFrame, faces : List[Face], face_analyser_attributes : List[FaceAnalyserAttribute]) -> List[Face]:
+	return [ analyse_face(vision_frame, face, face_analyser_attributes) for face in faces ]
+
+
+def analyse_face(vision_frame : VisionFrame, face : Face, face_analyser_attributes : List[FaceAnalyserAttribute]) -> Face:
+	if 'embedding' in face_analyser_attributes and face.normed_embedding is None:
+		embedding, normed_embedding = calc_embedding(vision_frame, face.landmarks.get('5/68'))
+		face = face._replace(embedding = embedding, normed_embedding = normed_embedding)
+	if 'gender_age' in face_analyser_attributes and (face.gender is None or face.age is None):
+		gender, age = detect_gender_age(vision_frame, face.bounding_box)
+		face = face._replace(gender = gender, age = age)
+	return face
+
+
 def calc_embedding(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Embedding, Embedding]:
 	face_recognizer = get_face_analyser().get('face_recognizer')
 	crop_vision_frame, matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, 'arcface_112_v2', (112, 112))
-	crop_vision_frame = crop_vision_frame / 127.5 - 1
-	crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
-		embedding = face_recognizer.run(None,
+	crop_vision_frame = prepare_vision_frames(crop_vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], True)
+	with inference_semaphore('face_recognizer_' + facefusion.globals.face_recognizer_model):
+		embedding = run_inference(face_recognizer,
 		{
 			face_recognizer.get_inputs()[0].name: crop_vision_frame
 		})[0]
-	embedding = embedding.ravel()
+	embedding = embedding.ravel().copy()
 	normed_embedding = embedding / numpy.linalg.norm(embedding)
 	return embedding, normed_embedding
 
@@ -397,11 +400,11 @@ def detect_face_landmark_68(temp_vision_frame : VisionFrame, bounding_box : Boun
 	if numpy.mean(crop_vision_frame[:, :, 0]) < 30:
 		crop_vision_frame[:, :, 0] = cv2.createCLAHE(clipLimit = 2).apply(crop_vision_frame[:, :, 0])
 	crop_vision_frame = cv2.cvtColor(crop_vision_frame, cv2.COLOR_Lab2RGB)
-	crop_vision_frame = crop_vision_frame.transpose(2, 0, 1).astype(numpy.float32) / 255.0
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
-		face_landmark_68, face_heatmap = face_landmarker.run(None,
+	crop_vision_frame = prepare_vision_frames(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], False)
+	with inference_semaphore('face_landmarker_68'):
+		face_landmark_68, face_heatmap = run_inference(face_landmarker,
 		{
-			face_landmarker.get_inputs()[0].name: [ crop_vision_frame ]
+			face_landmarker.get_inputs()[0].name: crop_vision_frame
 		})
 	face_landmark_68 = face_landmark_68[:, :, :2][0] / 64
 	face_landmark_68 = face_landmark_68.reshape(1, -1, 2) * 256
@@ -416,7 +419,7 @@ def expand_face_landmark_68_from_5(face_landmark_5 : FaceLandmark5) -> FaceLandm
 	face_landmarker = get_face_analyser().get('face_landmarkers').get('68_5')
 	affine_matrix = estimate_matrix_by_face_landmark_5(face_landmark_5, 'ffhq_512', (1, 1))
 	face_landmark_5 = cv2.transform(face_landmark_5.reshape(1, -1, 2), affine_matrix).reshape(-1, 2)
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
+	with inference_semaphore('face_landmarker_68_5'):
 		face_landmark_68_5 = face_landmarker.run(None,
 		{
 			face_landmarker.get_inputs()[0].name: [ face_landmark_5 ]
@@ -431,10 +434,9 @@ def detect_gender_age(temp_vision_frame : VisionFrame, bounding_box : BoundingBo
 	scale = 64 / numpy.subtract(*bounding_box[::-1]).max()
 	translation = 48 - bounding_box.sum(axis = 0) * scale * 0.5
 	crop_vision_frame, affine_matrix = warp_face_by_translation(temp_vision_frame, translation, scale, (96, 96))
-	crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
-		prediction = gender_age.run(None,
+	crop_vision_frame = prepare_vision_frames(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1 / 255, 1 / 255, 1 / 255 ], True)
+	with inference_semaphore('gender_age'):
+		prediction = run_inference(gender_age,
 		{
 			gender_age.get_inputs()[0].name: crop_vision_frame
 		})[0][0]
@@ -443,8 +445,8 @@ def detect_gender_age(temp_vision_frame : VisionFrame, bounding_box : BoundingBo
 	return gender, age
 
 
-def get_one_face(vision_frame : VisionFrame, position : int = 0) -> Optional[Face]:
-	many_faces = get_many_faces(vision_frame)
+def get_one_face(vision_frame : VisionFrame, position : int = 0, face_analyser_attributes : Optional[List[FaceAnalyserAttribute]] = None) -> Optional[Face]:
+	many_faces = get_many_faces(vision_frame, face_analyser_attributes)
 	if many_faces:
 		try:
 			return many_faces[position]
@@ -460,7 +462,7 @@ def get_average_face(vision_frames : List[VisionFrame], position : int = 0) -> O
 	normed_embedding_list = []
 
 	for vision_frame in vision_frames:
-		face = get_one_face(vision_frame, position)
+		face = get_one_face(vision_frame, position, [ 'embedding' ])
 		if face:
 			faces.append(face)
 			embedding_list.append(face.embedding)
@@ -479,41 +481,22 @@ def get_average_face(vision_frames : List[VisionFrame], position : int = 0) -> O
 	return average_face
 
 
-def get_many_faces(vision_frame : VisionFrame) -> List[Face]:
+def get_many_faces(vision_frame : VisionFrame, face_analyser_attributes : Optional[List[FaceAnalyserAttribute]] = None) -> List[Face]:
 	faces = []
+	face_analyser_attributes = list(face_analyser_attributes or [])
 	try:
 		faces_cache = get_static_faces(vision_frame)
-		if faces_cache:
+		if faces_cache is not None:
 			faces = faces_cache
 		else:
-			bounding_box_list = []
-			face_landmark_5_list = []
-			score_list = []
-
-			if facefusion.globals.face_detector_model in [ 'many', 'retinaface']:
-				bounding_box_list_retinaface, face_landmark_5_list_retinaface, score_list_retinaface = detect_with_retinaface(vision_frame, facefusion.globals.face_detector_size)
-				bounding_box_list.extend(bounding_box_list_retinaface)
-				face_landmark_5_list.extend(face_landmark_5_list_retinaface)
-				score_list.extend(score_list_retinaface)
-			if facefusion.globals.face_detector_model in [ 'many', 'scrfd' ]:
-				bounding_box_list_scrfd, face_landmark_5_list_scrfd, score_list_scrfd = detect_with_scrfd(vision_frame, facefusion.globals.face_detector_size)
-				bounding_box_list.extend(bounding_box_list_scrfd)
-				face_landmark_5_list.extend(face_landmark_5_list_scrfd)
-				score_list.extend(score_list_scrfd)
-			if facefusion.globals.face_detector_model in [ 'many', 'yoloface' ]:
-				bounding_box_list_yoloface, face_landmark_5_list_yoloface, score_list_yoloface = detect_with_yoloface(vision_frame, facefusion.globals.face_detector_size)
-				bounding_box_list.extend(bounding_box_list_yoloface)
-				face_landmark_5_list.extend(face_landmark_5_list_yoloface)
-				score_list.extend(score_list_yoloface)
-			if facefusion.globals.face_detector_model in [ 'yunet' ]:
-				bounding_box_list_yunet, face_landmark_5_list_yunet, score_list_yunet = detect_with_yunet(vision_frame, facefusion.globals.face_detector_size)
-				bounding_box_list.extend(bounding_box_list_yunet)
-				face_landmark_5_list.extend(face_landmark_5_list_yunet)
-				score_list.extend(score_list_yunet)
-			if bounding_box_list and face_landmark_5_list and score_list:
-				faces = create_faces(vision_frame, bounding_box_list, face_landmark_5_list, score_list)
-			if faces:
-				set_static_faces(vision_frame, faces)
+			faces = get_first(batch_create_faces([ vision_frame ]))
+		if facefusion.globals.face_analyser_age or facefusion.globals.face_analyser_gender:
+			face_analyser_attributes.append('gender_age')
+		if face_analyser_attributes:
+			analysed_faces = analyse_faces(vision_frame, faces, face_analyser_attributes)
+			if any(analysed_face is not face for analysed_face, face in zip(analysed_faces, faces)):
+				set_static_faces(vision_frame, analysed_faces)
+			faces = analysed_faces
 		if facefusion.globals.face_analyser_order:
 			faces = sort_by_order(faces, facefusion.globals.face_analyser_order)
 		if facefusion.globals.face_analyser_age:
@@ -525,11 +508,57 @@ def get_many_faces(vision_frame : VisionFrame) -> List[Face]:
 	return faces
 
 
+def batch_get_many_faces(vision_frames : List[VisionFrame]) -> List[List[Face]]:
+	detect_vision_frames = [ vision_frame for vision_frame in vision_frames if get_static_faces(vision_frame) is None ]
+
+	detections : List[Detection] = []
+
+	if detect_vision_frames:
+		try:
+			detections = batch_detect_faces(detect_vision_frames)
+		except (AttributeError, ValueError):
+			pass
+	for vision_frame, detection in zip(detect_vision_frames, detections):
+		try:
+			create_static_faces(vision_frame, detection)
+		except (AttributeError, ValueError):
+			pass
+	return [ get_many_faces(vision_frame) for vision_frame in vision_frames ]
+
+
+def batch_create_faces(vision_frames : List[VisionFrame]) -> List[List[Face]]:
+	return [ create_static_faces(vision_frame, detection) for vision_frame, detection in zip(vision_frames, batch_detect_faces(vision_frames)) ]
+
+
+def create_static_faces(vision_frame : VisionFrame, detection : Detection) -> List[Face]:
+	bounding_boxes, face_landmarks_5, detector_scores = detection
+	faces = []
+
+	if detector_scores.size > 0:
+		faces = create_faces(vision_frame, bounding_boxes, face_landmarks_5, detector_scores)
+	set_static_faces(vision_frame, faces)
+	return faces
+
+
+def batch_detect_faces(vision_frames : List[VisionFrame]) -> List[Detection]:
+	detector_detections = [ [ create_empty_detection() for _ in vision_frames ] ]
+
+	if facefusion.globals.face_detector_model in [ 'many', 'retinaface' ]:
+		detector_detections.append(batch_detect_with_retinaface(vision_frames, facefusion.globals.face_detector_size))
+	if facefusion.globals.face_detector_model in [ 'many', 'scrfd' ]:
+		detector_detections.append(batch_detect_with_scrfd(vision_frames, facefusion.globals.face_detector_size))
+	if facefusion.globals.face_detector_model in [ 'many', 'yoloface' ]:
+		detector_detections.append(batch_detect_with_yoloface(vision_frames, facefusion.globals.face_detector_size))
+	if facefusion.globals.face_detector_model in [ 'yunet' ]:
+		detector_detections.append([ detect_with_yunet(vision_frame, facefusion.globals.face_detector_size) for vision_frame in vision_frames ])
+	return [ tuple(numpy.concatenate(detection) for detection in zip(*frame_detections)) for frame_detections in zip(*detector_detections) ] #type:ignore[return-value]
+
+
 def find_similar_faces(reference_faces : FaceSet, vision_frame : VisionFrame, face_distance : float) -> List[Face]:
 	similar_faces : List[Face] = []
-	many_faces = get_many_faces(vision_frame)
 
 	if reference_faces:
+		many_faces = get_many_faces(vision_frame, [ 'embedding' ])
 		for reference_set in reference_faces:
 			if not similar_faces:
 				for reference_face in reference_faces[reference_set]:
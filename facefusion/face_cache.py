@@ -0,0 +1,190 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import os
+from pathlib import Path
+import numpy
+
+import facefusion.globals
+from facefusion.filesystem import is_file
+from facefusion.thread_helper import thread_lock
+from facefusion.typing import Face, FaceCache, FaceLandmarkSet, FaceScoreSet, Fps
+
+FACE_CACHE : FaceCache =\
+{
+	'path': None,
+	'records': None,
+	'faces': {}
+}
+FACE_RECORD_DTYPE = numpy.dtype(
+[
+	('frame_number', numpy.int32),
+	('has_face', numpy.bool_),
+	('bounding_box', numpy.float32, (4,)),
+	('face_landmark_5', numpy.float32, (5, 2)),
+	('face_landmark_5_68', numpy.float32, (5, 2)),
+	('face_landmark_68', numpy.float32, (68, 2)),
+	('face_landmark_68_5', numpy.float32, (68, 2)),
+	('face_detector_score', numpy.float32),
+	('face_landmarker_score', numpy.float32),
+	('has_embedding', numpy.bool_),
+	('embedding', numpy.float32, (512,)),
+	('normed_embedding', numpy.float32, (512,)),
+	('gender', numpy.int16),
+	('age', numpy.int16)
+])
+
+
+def create_face_cache_path(target_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> Optional[str]:
+	if facefusion.globals.face_cache_path and is_file(target_path):
+		face_cache_key =\
+		[
+			os.path.abspath(target_path),
+			os.path.getsize(target_path),
+			os.path.getmtime(target_path),
+			facefusion.globals.trim_frame_start,
+			facefusion.globals.trim_frame_end,
+			temp_video_resolution,
+			temp_video_fps,
+			facefusion.globals.face_detector_model,
+			facefusion.globals.face_detector_size,
+			facefusion.globals.face_detector_score,
+			facefusion.globals.face_landmarker_score,
+			facefusion.globals.face_tracker_interval
+		]
+		face_cache_hash = hashlib.sha1(str(face_cache_key).encode('utf-8')).hexdigest()
+		return os.path.join(facefusion.globals.face_cache_path, face_cache_hash + '.npy')
+	return None
+
+
+def load_face_cache(target_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> None:
+	open_face_cache(create_face_cache_path(target_path, temp_video_resolution, temp_video_fps))
+
+
+def open_face_cache(face_cache_path : Optional[str]) -> None:
+	clear_face_cache()
+
+	if face_cache_path:
+		FACE_CACHE['path'] = face_cache_path
+		if is_file(face_cache_path):
+			try:
+				FACE_CACHE['records'] = numpy.load(face_cache_path, mmap_mode = 'r')
+			except (OSError, ValueError):
+				FACE_CACHE['records'] = None
+
+
+def save_face_cache() -> bool:
+	face_cache_path = FACE_CACHE.get('path')
+	face_records = FACE_CACHE.get('records')
+	faces_by_frame = dict(FACE_CACHE.get('faces'))
+
+	if face_cache_path and faces_by_frame:
+		face_records_list = [ create_face_records(frame_number, faces) for frame_number, faces in faces_by_frame.items() ]
+		if face_records is not None:
+			face_records_list.append(face_records[numpy.isin(face_records['frame_number'], list(faces_by_frame.keys()), invert = True)])
+		face_records = numpy.concatenate(face_records_list)
+		face_records = face_records[numpy.argsort(face_records['frame_number'], kind = 'stable')]
+		Path(facefusion.globals.face_cache_path).mkdir(parents = True, exist_ok = True)
+		temp_face_cache_path = face_cache_path + '.tmp'
+		with open(temp_face_cache_path, 'wb') as face_cache_file:
+			numpy.save(face_cache_file, face_records)
+		FACE_CACHE['records'] = None
+		os.replace(temp_face_cache_path, face_cache_path)
+		return True
+	return False
+
+
+def clear_face_cache() -> None:
+	global FACE_CACHE
+
+	FACE_CACHE =\
+	{
+		'path': None,
+		'records': None,
+		'faces': {}
+	}
+
+
+def get_cached_faces(frame_number : int) -> Optional[List[Face]]:
+	face_records = FACE_CACHE.get('records')
+
+	if face_records is not None:
+		start_index, end_index = numpy.searchsorted(face_records['frame_number'], [ frame_number, frame_number + 1 ])
+		if end_index > start_index:
+			return [ create_face(face_record) for face_record in face_records[start_index:end_index] if face_record['has_face'] ]
+	return None
+
+
+def set_cached_faces(frame_number : int, faces : List[Face]) -> None:
+	if FACE_CACHE.get('path'):
+		with thread_lock():
+			FACE_CACHE['faces'][frame_number] = faces
+
+
+def get_face_cache_path() -> Optional[str]:
+	return FACE_CACHE.get('path')
+
+
+def pop_cached_faces() -> Dict[int, List[Face]]:
+	with thread_lock():
+		faces_by_frame = FACE_CACHE.get('faces')
+		FACE_CACHE['faces'] = {}
+	return faces_by_frame
+
+
+def create_face_records(frame_number : int, faces : List[Face]) -> numpy.ndarray[Any, Any]:
+	face_records = numpy.zeros(max(len(faces), 1), dtype = FACE_RECORD_DTYPE)
+	face_records['frame_number'] = frame_number
+	face_records['gender'] = -1
+	face_records['age'] = -1
+
+	for face_record, face in zip(face_records, faces):
+		face_record['has_face'] = True
+		face_record['bounding_box'] = face.bounding_box
+		face_record['face_landmark_5'] = face.landmarks.get('5')
+		face_record['face_landmark_5_68'] = face.landmarks.get('5/68')
+		face_record['face_landmark_68'] = face.landmarks.get('68')
+		face_record['face_landmark_68_5'] = face.landmarks.get('68/5')
+		face_record['face_detector_score'] = face.scores.get('detector')
+		face_record['face_landmarker_score'] = face.scores.get('landmarker')
+		if face.normed_embedding is not None:
+			face_record['has_embedding'] = True
+			face_record['embedding'] = face.embedding
+			face_record['normed_embedding'] = face.normed_embedding
+		if face.gender is not None and face.age is not None:
+			face_record['gender'] = face.gender
+			face_record['age'] = face.age
+	return face_records
+
+
+def create_face(face_record : numpy.void) -> Face:
+	landmarks : FaceLandmarkSet =\
+	{
+		'5': numpy.array(face_record['face_landmark_5']),
+		'5/68': numpy.array(face_record['face_landmark_5_68']),
+		'68': numpy.array(face_record['face_landmark_68']),
+		'68/5': numpy.array(face_record['face_landmark_68_5'])
+	}
+	scores : FaceScoreSet =\
+	{
+		'detector': float(face_record['face_detector_score']),
+		'landmarker': float(face_record['face_landmarker_score'])
+	}
+	embedding = None
+	normed_embedding = None
+	gender = None
+	age = None
+	if face_record['has_embedding']:
+		embedding = numpy.array(face_record['embedding'])
+		normed_embedding = numpy.array(face_record['normed_embedding'])
+	if face_record['gender'] > -1 and face_record['age'] > -1:
+		gender = int(face_record['gender'])
+		age = int(face_record['age'])
+	return Face(
+		bounding_box = numpy.array(face_record['bounding_box']),
+		landmarks = landmarks,
+		scores = scores,
+		embedding = embedding,
+		normed_embedding = normed_embedding,
+		gender = gender,
+		age = age
+	)
@@ -1,4 +1,4 @@
-from typing import Any, Tuple, List
+from typing import Any, Tuple, Optional
 from cv2.typing import Size
 from functools import lru_cache
 import cv2
@@ -73,18 +73,37 @@ def warp_face_by_translation(temp_vision_frame : VisionFrame, translation : Tran
 	return crop_vision_frame, affine_matrix
 
 
-def paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
+def paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_mask : Mask, affine_matrix : Matrix, paste_vision_frame : Optional[VisionFrame] = None) -> VisionFrame:
 	inverse_matrix = cv2.invertAffineTransform(affine_matrix)
-	temp_size = temp_vision_frame.shape[:2][::-1]
-	inverse_mask = cv2.warpAffine(crop_mask, inverse_matrix, temp_size).clip(0, 1)
-	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, inverse_matrix, temp_size, borderMode = cv2.BORDER_REPLICATE)
-	paste_vision_frame = temp_vision_frame.copy()
-	paste_vision_frame[:, :, 0] = inverse_mask * inverse_vision_frame[:, :, 0] + (1 - inverse_mask) * temp_vision_frame[:, :, 0]
-	paste_vision_frame[:, :, 1] = inverse_mask * inverse_vision_frame[:, :, 1] + (1 - inverse_mask) * temp_vision_frame[:, :, 1]
-	paste_vision_frame[:, :, 2] = inverse_mask * inverse_vision_frame[:, :, 2] + (1 - inverse_mask) * temp_vision_frame[:, :, 2]
+	if paste_vision_frame is None:
+		paste_vision_frame = temp_vision_frame.copy()
+	elif paste_vision_frame is not temp_vision_frame:
+		numpy.copyto(paste_vision_frame, temp_vision_frame)
+	paste_bounding_box = calc_paste_bounding_box(crop_vision_frame.shape[:2][::-1], inverse_matrix, temp_vision_frame.shape[:2][::-1])
+	if paste_bounding_box is None:
+		return paste_vision_frame
+	x1, y1, x2, y2 = paste_bounding_box
+	paste_matrix = inverse_matrix.copy()
+	numpy.subtract(paste_matrix[:, 2], [ x1, y1 ], out = paste_matrix[:, 2])
+	paste_size = (x2 - x1, y2 - y1)
+	inverse_mask = cv2.warpAffine(crop_mask.astype(numpy.float32), paste_matrix, paste_size).clip(0, 1)[:, :, numpy.newaxis]
+	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, paste_matrix, paste_size, borderMode = cv2.BORDER_REPLICATE)
+	temp_region_frame = temp_vision_frame[y1:y2, x1:x2]
+	paste_vision_frame[y1:y2, x1:x2] = temp_region_frame + inverse_mask * (inverse_vision_frame - temp_region_frame.astype(numpy.float32))
 	return paste_vision_frame
 
 
+def calc_paste_bounding_box(crop_size : Size, inverse_matrix : Matrix, temp_size : Size) -> Optional[Tuple[int, int, int, int]]:
+	crop_width, crop_height = crop_size
+	crop_points = numpy.array([ [ 0, 0 ], [ crop_width, 0 ], [ crop_width, crop_height ], [ 0, crop_height ] ], numpy.float32)
+	paste_points = cv2.transform(crop_points.reshape(1, -1, 2), inverse_matrix).reshape(-1, 2)
+	x1, y1 = numpy.maximum(numpy.floor(paste_points.min(axis = 0)).astype(int) - 1, 0)
+	x2, y2 = numpy.minimum(numpy.ceil(paste_points.max(axis = 0)).astype(int) + 1, temp_size)
+	if x2 > x1 and y2 > y1:
+		return int(x1), int(y1), int(x2), int(y2)
+	return None
+
+
 @lru_cache(maxsize = None)
 def create_static_anchors(feature_stride : int, anchor_total : int, stride_height : int, stride_width : int) -> numpy.ndarray[Any, Any]:
 	y, x = numpy.mgrid[:stride_height, :stride_width][::-1]
@@ -129,28 +148,10 @@ def convert_face_landmark_68_to_5(face_landmark_68 : FaceLandmark68) -> FaceLand
 	return face_landmark_5
 
 
-def apply_nms(bounding_box_list : List[BoundingBox], iou_threshold : float) -> List[int]:
-	keep_indices = []
-	dimension_list = numpy.reshape(bounding_box_list, (-1, 4))
-	x1 = dimension_list[:, 0]
-	y1 = dimension_list[:, 1]
-	x2 = dimension_list[:, 2]
-	y2 = dimension_list[:, 3]
-	areas = (x2 - x1 + 1) * (y2 - y1 + 1)
-	indices = numpy.arange(len(bounding_box_list))
-	while indices.size > 0:
-		index = indices[0]
-		remain_indices = indices[1:]
-		keep_indices.append(index)
-		xx1 = numpy.maximum(x1[index], x1[remain_indices])
-		yy1 = numpy.maximum(y1[index], y1[remain_indices])
-		xx2 = numpy.minimum(x2[index], x2[remain_indices])
-		yy2 = numpy.minimum(y2[index], y2[remain_indices])
-		width = numpy.maximum(0, xx2 - xx1 + 1)
-		height = numpy.maximum(0, yy2 - yy1 + 1)
-		iou = width * height / (areas[index] + areas[remain_indices] - width * height)
-		indices = indices[numpy.where(iou <= iou_threshold)[0] + 1]
-	return keep_indices
+def apply_nms(bounding_boxes : numpy.ndarray[Any, Any], scores : numpy.ndarray[Any, Any], iou_threshold : float) -> numpy.ndarray[Any, Any]:
+	nms_bounding_boxes = numpy.column_stack([ bounding_boxes[:, :2], bounding_boxes[:, 2:] - bounding_boxes[:, :2] + 1 ])
+	keep_indices = cv2.dnn.NMSBoxes(nms_bounding_boxes.tolist(), scores.tolist(), 0, iou_threshold)
+	return numpy.array(keep_indices, dtype = numpy.int64).reshape(-1)
 
 
 def categorize_age(age : int) -> FaceAnalyserAge:
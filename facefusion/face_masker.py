@@ -4,13 +4,13 @@ from functools import lru_cache
 from time import sleep
 import cv2
 import numpy
-import onnxruntime
 
 import facefusion.globals
 from facefusion import process_manager
-from facefusion.thread_helper import thread_lock, conditional_thread_semaphore
+from facefusion.thread_helper import thread_lock, inference_semaphore
+from facefusion.tensor_helper import prepare_vision_frames
 from facefusion.typing import FaceLandmark68, VisionFrame, Mask, Padding, FaceMaskRegion, ModelSet
-from facefusion.execution import apply_execution_provider_options
+from facefusion.inference_manager import get_inference_session, release_inference_session, run_inference
 from facefusion.filesystem import resolve_relative_path, is_file
 from facefusion.download import conditional_download
 
@@ -52,7 +52,7 @@ def get_face_occluder() -> Any:
 			sleep(0.5)
 		if FACE_OCCLUDER is None:
 			model_path = MODELS.get('face_occluder').get('path')
-			FACE_OCCLUDER = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			FACE_OCCLUDER = get_inference_session(model_path)
 	return FACE_OCCLUDER
 
 
@@ -64,19 +64,21 @@ def get_face_parser() -> Any:
 			sleep(0.5)
 		if FACE_PARSER is None:
 			model_path = MODELS.get('face_parser').get('path')
-			FACE_PARSER = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			FACE_PARSER = get_inference_session(model_path)
 	return FACE_PARSER
 
 
 def clear_face_occluder() -> None:
 	global FACE_OCCLUDER
 
+	release_inference_session(FACE_OCCLUDER)
 	FACE_OCCLUDER = None
 
 
 def clear_face_parser() -> None:
 	global FACE_PARSER
 
+	release_inference_session(FACE_PARSER)
 	FACE_PARSER = None
 
 
@@ -117,10 +119,9 @@ def create_static_box_mask(crop_size : Size, face_mask_blur : float, face_mask_p
 def create_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
 	face_occluder = get_face_occluder()
 	prepare_vision_frame = cv2.resize(crop_vision_frame, face_occluder.get_inputs()[0].shape[1:3][::-1])
-	prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0).astype(numpy.float32) / 255
-	prepare_vision_frame = prepare_vision_frame.transpose(0, 1, 2, 3)
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
-		occlusion_mask : Mask = face_occluder.run(None,
+	prepare_vision_frame = numpy.multiply(prepare_vision_frame[numpy.newaxis], numpy.float32(1 / 255), dtype = numpy.float32)
+	with inference_semaphore('face_occluder'):
+		occlusion_mask : Mask = run_inference(face_occluder,
 		{
 			face_occluder.get_inputs()[0].name: prepare_vision_frame
 		})[0][0]
@@ -132,11 +133,10 @@ def create_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
 
 def create_region_mask(crop_vision_frame : VisionFrame, face_mask_regions : List[FaceMaskRegion]) -> Mask:
 	face_parser = get_face_parser()
-	prepare_vision_frame = cv2.flip(cv2.resize(crop_vision_frame, (512, 512)), 1)
-	prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0).astype(numpy.float32)[:, :, ::-1] / 127.5 - 1
-	prepare_vision_frame = prepare_vision_frame.transpose(0, 3, 1, 2)
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
-		region_mask : Mask = face_parser.run(None,
+	prepare_vision_frame = cv2.resize(crop_vision_frame, (512, 512))
+	prepare_vision_frame = prepare_vision_frames(prepare_vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], False)
+	with inference_semaphore('face_parser'):
+		region_mask : Mask = run_inference(face_parser,
 		{
 			face_parser.get_inputs()[0].name: prepare_vision_frame
 		})[0][0]
@@ -2,34 +2,97 @@ from typing import Optional, List
 import hashlib
 import numpy
 
-from facefusion.typing import VisionFrame, Face, FaceStore, FaceSet
+import facefusion.globals
+from facefusion.thread_helper import thread_lock
+from facefusion.typing import VisionFrame, Face, FaceStore, FaceStoreMetrics, FaceSet
 
+FRAME_HASH_STRIDE = 16
 FACE_STORE: FaceStore =\
 {
 	'static_faces': {},
+	'static_faces_frames': {},
+	'static_faces_memory': {},
+	'static_faces_metrics':
+	{
+		'hits': 0,
+		'misses': 0,
+		'evictions': 0,
+		'memory': 0
+	},
 	'reference_faces': {}
 }
 
 
 def get_static_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
 	frame_hash = create_frame_hash(vision_frame)
-	if frame_hash in FACE_STORE['static_faces']:
-		return FACE_STORE['static_faces'][frame_hash]
+	with thread_lock():
+		if frame_hash in FACE_STORE['static_faces'] and numpy.array_equal(FACE_STORE['static_faces_frames'].get(frame_hash), vision_frame):
+			FACE_STORE['static_faces_metrics']['hits'] += 1
+			FACE_STORE['static_faces'][frame_hash] = FACE_STORE['static_faces'].pop(frame_hash)
+			return list(FACE_STORE['static_faces'][frame_hash])
+		FACE_STORE['static_faces_metrics']['misses'] += 1
 	return None
 
 
 def set_static_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
 	frame_hash = create_frame_hash(vision_frame)
 	if frame_hash:
-		FACE_STORE['static_faces'][frame_hash] = faces
+		faces = list(faces)
+		faces_memory = vision_frame.nbytes + calc_faces_memory(faces)
+		with thread_lock():
+			FACE_STORE['static_faces'].pop(frame_hash, None)
+			FACE_STORE['static_faces_metrics']['memory'] -= FACE_STORE['static_faces_memory'].pop(frame_hash, 0)
+			FACE_STORE['static_faces'][frame_hash] = faces
+			FACE_STORE['static_faces_frames'][frame_hash] = vision_frame.copy()
+			FACE_STORE['static_faces_memory'][frame_hash] = faces_memory
+			FACE_STORE['static_faces_metrics']['memory'] += faces_memory
+			evict_static_faces()
+
+
+def evict_static_faces() -> None:
+	if facefusion.globals.face_store_memory_limit:
+		face_store_memory_limit = facefusion.globals.face_store_memory_limit * 1024 * 1024
+		while len(FACE_STORE['static_faces']) > 1 and FACE_STORE['static_faces_metrics']['memory'] > face_store_memory_limit:
+			frame_hash = next(iter(FACE_STORE['static_faces']))
+			del FACE_STORE['static_faces'][frame_hash]
+			del FACE_STORE['static_faces_frames'][frame_hash]
+			FACE_STORE['static_faces_metrics']['memory'] -= FACE_STORE['static_faces_memory'].pop(frame_hash)
+			FACE_STORE['static_faces_metrics']['evictions'] += 1
+
+
+def get_static_faces_metrics() -> FaceStoreMetrics:
+	return FACE_STORE['static_faces_metrics']
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'] = {}
+	with thread_lock():
+		FACE_STORE['static_faces'] = {}
+		FACE_STORE['static_faces_frames'] = {}
+		FACE_STORE['static_faces_memory'] = {}
+		FACE_STORE['static_faces_metrics'] =\
+		{
+			'hits': 0,
+			'misses': 0,
+			'evictions': 0,
+			'memory': 0
+		}
 
 
 def create_frame_hash(vision_frame : VisionFrame) -> Optional[str]:
-	return hashlib.sha1(vision_frame.tobytes()).hexdigest() if numpy.any(vision_frame) else None
+	if numpy.any(vision_frame):
+		frame_hash = hashlib.sha1(str(vision_frame.shape).encode())
+		frame_hash.update(numpy.ascontiguousarray(vision_frame[::FRAME_HASH_STRIDE, ::FRAME_HASH_STRIDE]).data)
+		return frame_hash.hexdigest()
+	return None
+
+
+def calc_faces_memory(faces : List[Face]) -> int:
+	faces_memory = 0
+	for face in faces:
+		faces_memory += face.bounding_box.nbytes + sum(face_landmark.nbytes for face_landmark in face.landmarks.values())
+		if face.normed_embedding is not None:
+			faces_memory += face.embedding.nbytes + face.normed_embedding.nbytes
+	return faces_memory
 
 
 def get_reference_faces() -> Optional[FaceSet]:
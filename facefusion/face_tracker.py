@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy
+
+import facefusion.globals
+from facefusion.common_helper import get_first
+from facefusion.face_analyser import analyse_faces, batch_create_faces
+from facefusion.face_store import get_static_faces, set_static_faces
+from facefusion.thread_helper import thread_lock
+from facefusion.typing import VisionFrame, Face, FaceAnalyserAttribute, FaceLandmarkSet, FaceTrackerState, Matrix
+
+FACE_TRACKER_STATES : Dict[Tuple[Optional[str], int], FaceTrackerState] = {}
+
+
+def clear_face_tracker() -> None:
+	global FACE_TRACKER_STATES
+
+	FACE_TRACKER_STATES = {}
+
+
+def track_faces(frame_number : int, vision_frame : VisionFrame) -> List[Face]:
+	with thread_lock():
+		face_tracker_state = FACE_TRACKER_STATES.pop((facefusion.globals.target_path, frame_number - 1), None)
+	track_vision_frame = cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY)
+	faces = get_static_faces(vision_frame)
+	detect_frame_number = frame_number
+
+	if faces is None and face_tracker_state and frame_number - face_tracker_state.get('detect_frame_number') < facefusion.globals.face_tracker_interval:
+		if not detect_scene_cut(face_tracker_state.get('vision_frame'), track_vision_frame):
+			faces = propagate_faces(face_tracker_state.get('vision_frame'), track_vision_frame, face_tracker_state.get('faces'))
+		if faces is not None:
+			set_static_faces(vision_frame, faces)
+			detect_frame_number = face_tracker_state.get('detect_frame_number')
+	if faces is None:
+		faces = get_first(batch_create_faces([ vision_frame ]))
+	if detect_frame_number == frame_number:
+		faces = analyse_key_faces(vision_frame, faces)
+	with thread_lock():
+		FACE_TRACKER_STATES[(facefusion.globals.target_path, frame_number)] =\
+		{
+			'frame_number': frame_number,
+			'detect_frame_number': detect_frame_number,
+			'vision_frame': track_vision_frame,
+			'faces': faces
+		}
+	return faces
+
+
+def analyse_key_faces(vision_frame : VisionFrame, faces : List[Face]) -> List[Face]:
+	face_analyser_attributes : List[FaceAnalyserAttribute] = []
+
+	if facefusion.globals.face_selector_mode == 'reference':
+		face_analyser_attributes.append('embedding')
+	if facefusion.globals.face_analyser_age or facefusion.globals.face_analyser_gender:
+		face_analyser_attributes.append('gender_age')
+	if face_analyser_attributes:
+		analysed_faces = analyse_faces(vision_frame, faces, face_analyser_attributes)
+		if any(analysed_face is not face for analysed_face, face in zip(analysed_faces, faces)):
+			set_static_faces(vision_frame, analysed_faces)
+		return analysed_faces
+	return faces
+
+
+def detect_scene_cut(previous_vision_frame : VisionFrame, vision_frame : VisionFrame) -> bool:
+	previous_histogram = cv2.calcHist([ previous_vision_frame ], [ 0 ], None, [ 32 ], [ 0, 256 ])
+	histogram = cv2.calcHist([ vision_frame ], [ 0 ], None, [ 32 ], [ 0, 256 ])
+	return cv2.compareHist(previous_histogram, histogram, cv2.HISTCMP_CORREL) < 0.6
+
+
+def propagate_faces(previous_vision_frame : VisionFrame, vision_frame : VisionFrame, faces : List[Face]) -> Optional[List[Face]]:
+	propagated_faces = []
+
+	for face in faces:
+		previous_points = face.landmarks.get('5').reshape(-1, 1, 2).astype(numpy.float32)
+		points, status, _ = cv2.calcOpticalFlowPyrLK(previous_vision_frame, vision_frame, previous_points, None, winSize = (21, 21), maxLevel = 3)
+		if points is None or not numpy.all(status):
+			return None
+		affine_matrix, _ = cv2.estimateAffinePartial2D(previous_points, points)
+		if affine_matrix is None:
+			return None
+		propagated_faces.append(transform_face(face, affine_matrix))
+	return propagated_faces
+
+
+def transform_face(face : Face, affine_matrix : Matrix) -> Face:
+	bounding_box_points = cv2.transform(face.bounding_box.reshape(-1, 1, 2).astype(numpy.float32), affine_matrix).reshape(-1, 2)
+	landmarks : FaceLandmarkSet =\
+	{
+		'5': cv2.transform(face.landmarks.get('5').reshape(-1, 1, 2), affine_matrix).reshape(-1, 2),
+		'5/68': cv2.transform(face.landmarks.get('5/68').reshape(-1, 1, 2), affine_matrix).reshape(-1, 2),
+		'68': cv2.transform(face.landmarks.get('68').reshape(-1, 1, 2), affine_matrix).reshape(-1, 2),
+		'68/5': cv2.transform(face.landmarks.get('68/5').reshape(-1, 1, 2), affine_matrix).reshape(-1, 2)
+	}
+	return face._replace(
+		bounding_box = numpy.concatenate([ bounding_box_points.min(axis = 0), bounding_box_points.max(axis = 0) ]),
+		landmarks = landmarks
+	)
@@ -1,13 +1,37 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Iterator, cast
+from io import BufferedReader
 import os
 import subprocess
+from functools import lru_cache
 import filetype
+import numpy
 
+import facefusion.choices
 import facefusion.globals
-from facefusion import logger, process_manager
-from facefusion.typing import OutputVideoPreset, Fps, AudioBuffer
-from facefusion.filesystem import get_temp_frames_pattern, get_temp_file_path
-from facefusion.vision import restrict_video_fps
+from facefusion import logger, process_manager, wording
+from facefusion.typing import OutputVideoEncoder, OutputVideoPreset, TempFrameHwaccel, Fps, AudioBuffer, Resolution, VisionFrame
+from facefusion.filesystem import get_temp_frames_pattern, get_temp_file_path, get_temp_audio_path, get_temp_directory_path, is_file
+from facefusion.vision import restrict_video_fps, detect_video_fps, get_video_metadata
+
+TEMP_FRAME_HWACCELS : Dict[str, TempFrameHwaccel] =\
+{
+	'CUDAExecutionProvider': 'cuda',
+	'TensorrtExecutionProvider': 'cuda',
+	'ROCMExecutionProvider': 'vaapi',
+	'OpenVINOExecutionProvider': 'qsv',
+	'DmlExecutionProvider': 'd3d11va',
+	'CoreMLExecutionProvider': 'videotoolbox'
+}
+OUTPUT_VIDEO_ENCODER_FALLBACKS : Dict[OutputVideoEncoder, OutputVideoEncoder] =\
+{
+	'libx264': 'libx264',
+	'libx265': 'libx265',
+	'libvpx-vp9': 'libvpx-vp9',
+	'h264_nvenc': 'libx264',
+	'hevc_nvenc': 'libx265',
+	'h264_amf': 'libx264',
+	'hevc_amf': 'libx265'
+}
 
 
 def run_ffmpeg(args : List[str]) -> bool:
@@ -22,6 +46,9 @@ def run_ffmpeg(args : List[str]) -> bool:
 			return process.wait(timeout = 0.5) == 0
 		except subprocess.TimeoutExpired:
 			continue
+	if process.poll() is None:
+		process.terminate()
+		process.wait()
 	return process.returncode == 0
 
 
@@ -31,6 +58,76 @@ def open_ffmpeg(args : List[str]) -> subprocess.Popen[bytes]:
 	return subprocess.Popen(commands, stdin = subprocess.PIPE, stdout = subprocess.PIPE)
 
 
+def probe_ffmpeg(args : List[str]) -> Optional[str]:
+	commands = [ 'ffmpeg', '-hide_banner', '-loglevel', 'error' ]
+	commands.extend(args)
+	try:
+		process = subprocess.run(commands, stdout = subprocess.PIPE, stderr = subprocess.PIPE, timeout = 10)
+	except (OSError, subprocess.TimeoutExpired):
+		return None
+	if process.returncode == 0:
+		return process.stdout.decode()
+	return None
+
+
+@lru_cache(maxsize = None)
+def get_available_hwaccels() -> List[TempFrameHwaccel]:
+	output = probe_ffmpeg([ '-hwaccels' ])
+	available_hwaccels = []
+
+	if output:
+		for hwaccel in output.splitlines()[1:]:
+			hwaccel = hwaccel.strip()
+			if hwaccel in facefusion.choices.temp_frame_hwaccels[2:] and probe_ffmpeg([ '-init_hw_device', hwaccel, '-f', 'lavfi', '-i', 'nullsrc=size=64x64', '-frames:v', '1', '-f', 'null', '-' ]) is not None:
+				available_hwaccels.append(hwaccel)
+	return available_hwaccels
+
+
+@lru_cache(maxsize = None)
+def get_available_encoders() -> List[OutputVideoEncoder]:
+	output = probe_ffmpeg([ '-encoders' ])
+	available_encoders = []
+
+	if output:
+		for line in output.splitlines():
+			encoder_parts = line.split()
+			if len(encoder_parts) > 1 and encoder_parts[1] in facefusion.choices.output_video_encoders:
+				encoder = encoder_parts[1]
+				if OUTPUT_VIDEO_ENCODER_FALLBACKS.get(encoder) == encoder or probe_ffmpeg([ '-f', 'lavfi', '-i', 'color=size=256x256', '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-' ]) is not None:
+					available_encoders.append(encoder)
+	return available_encoders
+
+
+def resolve_temp_frame_hwaccel() -> Optional[TempFrameHwaccel]:
+	temp_frame_hwaccel = facefusion.globals.temp_frame_hwaccel
+
+	if temp_frame_hwaccel == 'auto':
+		for execution_provider in facefusion.globals.execution_providers:
+			if TEMP_FRAME_HWACCELS.get(execution_provider) in get_available_hwaccels():
+				return TEMP_FRAME_HWACCELS.get(execution_provider)
+		return None
+	if temp_frame_hwaccel in get_available_hwaccels():
+		return temp_frame_hwaccel
+	if temp_frame_hwaccel and temp_frame_hwaccel != 'none':
+		logger.warn(wording.get('hwaccel_not_available').format(hwaccel = temp_frame_hwaccel), __name__.upper())
+	return None
+
+
+def resolve_output_video_encoder() -> Optional[OutputVideoEncoder]:
+	output_video_encoder = facefusion.globals.output_video_encoder
+	available_encoders = get_available_encoders()
+
+	if available_encoders and output_video_encoder not in available_encoders:
+		fallback_encoder = OUTPUT_VIDEO_ENCODER_FALLBACKS.get(output_video_encoder)
+		if fallback_encoder == output_video_encoder or fallback_encoder not in available_encoders:
+			logger.error(wording.get('encoder_not_supported').format(encoder = output_video_encoder), __name__.upper())
+			return None
+		logger.warn(wording.get('encoder_not_available').format(encoder = output_video_encoder, fallback_encoder = fallback_encoder), __name__.upper())
+		output_video_encoder = fallback_encoder
+	logger.debug(wording.get('encoding_with_encoder').format(encoder = output_video_encoder), __name__.upper())
+	return output_video_encoder
+
+
 def log_debug(process : subprocess.Popen[bytes]) -> None:
 	_, stderr = process.communicate()
 	errors = stderr.decode().split(os.linesep)
@@ -41,43 +138,141 @@ def log_debug(process : subprocess.Popen[bytes]) -> None:
 
 
 def extract_frames(target_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> bool:
-	trim_frame_start = facefusion.globals.trim_frame_start
-	trim_frame_end = facefusion.globals.trim_frame_end
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
-	commands = [ '-i', target_path, '-s', str(temp_video_resolution), '-q:v', '0' ]
-
-	if trim_frame_start is not None and trim_frame_end is not None:
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	elif trim_frame_start is not None:
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps) ])
-	elif trim_frame_end is not None:
-		commands.extend([ '-vf', 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	else:
-		commands.extend([ '-vf', 'fps=' + str(temp_video_fps) ])
+	commands = create_decoder_commands()
+	commands.extend([ '-i', target_path, '-s', str(temp_video_resolution), '-q:v', '0' ])
+	commands.extend(create_frame_filter_commands(facefusion.globals.trim_frame_start, facefusion.globals.trim_frame_end, temp_video_fps))
 	commands.extend([ '-vsync', '0', temp_frames_pattern ])
 	return run_ffmpeg(commands)
 
 
+def open_extract_stream(target_path : str, trim_frame_start : Optional[int], trim_frame_end : Optional[int], temp_video_resolution : str, temp_video_fps : Fps) -> subprocess.Popen[bytes]:
+	commands = create_decoder_commands()
+	if trim_frame_start:
+		commands.extend([ '-ss', str((trim_frame_start - 0.5) / detect_video_fps(target_path)) ])
+		if trim_frame_end is not None:
+			trim_frame_end -= trim_frame_start
+		trim_frame_start = None
+	commands.extend([ '-i', target_path, '-s', str(temp_video_resolution) ])
+	commands.extend(create_frame_filter_commands(trim_frame_start, trim_frame_end, temp_video_fps))
+	commands.extend([ '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-' ])
+	process = open_ffmpeg(commands)
+	process.stdin.close()
+	return process
+
+
+def open_sample_stream(target_path : str, frame_start : int, frame_end : int, frame_step : int, sample_resolution : Resolution) -> subprocess.Popen[bytes]:
+	sample_width, sample_height = sample_resolution
+	commands = create_decoder_commands()
+	commands.extend([ '-i', target_path, '-vf', 'select=between(n\\,' + str(frame_start) + '\\,' + str(frame_end - 1) + ')*not(mod(n\\,' + str(frame_step) + ')),scale=' + str(sample_width) + ':' + str(sample_height) + ':flags=bilinear' ])
+	commands.extend([ '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-' ])
+	process = open_ffmpeg(commands)
+	process.stdin.close()
+	return process
+
+
+def create_decoder_commands() -> List[str]:
+	temp_frame_hwaccel = resolve_temp_frame_hwaccel()
+
+	if temp_frame_hwaccel:
+		logger.debug(wording.get('decoding_with_hwaccel').format(hwaccel = temp_frame_hwaccel), __name__.upper())
+		return [ '-hwaccel', temp_frame_hwaccel ]
+	logger.debug(wording.get('decoding_with_software'), __name__.upper())
+	return []
+
+
+def create_frame_filter_commands(trim_frame_start : Optional[int], trim_frame_end : Optional[int], temp_video_fps : Fps) -> List[str]:
+	if trim_frame_start is not None and trim_frame_end is not None:
+		return [ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ]
+	if trim_frame_start is not None:
+		return [ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps) ]
+	if trim_frame_end is not None:
+		return [ '-vf', 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ]
+	return [ '-vf', 'fps=' + str(temp_video_fps) ]
+
+
 def merge_video(target_path : str, output_video_resolution : str, output_video_fps : Fps) -> bool:
 	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
 	temp_file_path = get_temp_file_path(target_path)
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
-	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern, '-s', str(output_video_resolution), '-c:v', facefusion.globals.output_video_encoder ]
+	output_video_encoder = resolve_output_video_encoder()
+	if not output_video_encoder:
+		return False
+	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern, '-s', str(output_video_resolution), '-c:v', output_video_encoder ]
+	commands.extend(create_encoder_commands(output_video_encoder))
+	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
+	return run_ffmpeg(commands)
+
+
+def open_merge_stream(target_path : str, temp_file_path : str, temp_video_resolution : str, output_video_resolution : str, output_video_fps : Fps) -> Optional[subprocess.Popen[bytes]]:
+	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
+	output_video_encoder = resolve_output_video_encoder()
+	if not output_video_encoder:
+		return None
+	commands = [ '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', str(temp_video_resolution), '-r', str(temp_video_fps), '-i', '-', '-s', str(output_video_resolution), '-c:v', output_video_encoder ]
+	commands.extend(create_encoder_commands(output_video_encoder))
+	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
+	return open_ffmpeg(commands)
+
+
+def concat_video(target_path : str, chunk_paths : List[str]) -> bool:
+	temp_file_path = get_temp_file_path(target_path)
+	concat_list_path = os.path.join(get_temp_directory_path(target_path), 'chunks.txt')
 
-	if facefusion.globals.output_video_encoder in [ 'libx264', 'libx265' ]:
+	with open(concat_list_path, 'w') as concat_list_file:
+		for chunk_path in chunk_paths:
+			concat_list_file.write('file \'' + chunk_path.replace('\'', '\'\\\'\'') + '\'\n')
+	commands = [ '-f', 'concat', '-safe', '0', '-i', concat_list_path, '-c', 'copy', '-y', temp_file_path ]
+	return run_ffmpeg(commands)
+
+
+def create_encoder_commands(output_video_encoder : OutputVideoEncoder) -> List[str]:
+	commands = []
+
+	if output_video_encoder in [ 'libx264', 'libx265' ]:
 		output_video_compression = round(51 - (facefusion.globals.output_video_quality * 0.51))
 		commands.extend([ '-crf', str(output_video_compression), '-preset', facefusion.globals.output_video_preset ])
-	if facefusion.globals.output_video_encoder in [ 'libvpx-vp9' ]:
+	if output_video_encoder in [ 'libvpx-vp9' ]:
 		output_video_compression = round(63 - (facefusion.globals.output_video_quality * 0.63))
 		commands.extend([ '-crf', str(output_video_compression) ])
-	if facefusion.globals.output_video_encoder in [ 'h264_nvenc', 'hevc_nvenc' ]:
+	if output_video_encoder in [ 'h264_nvenc', 'hevc_nvenc' ]:
 		output_video_compression = round(51 - (facefusion.globals.output_video_quality * 0.51))
 		commands.extend([ '-cq', str(output_video_compression), '-preset', map_nvenc_preset(facefusion.globals.output_video_preset) ])
-	if facefusion.globals.output_video_encoder in [ 'h264_amf', 'hevc_amf' ]:
+	if output_video_encoder in [ 'h264_amf', 'hevc_amf' ]:
 		output_video_compression = round(51 - (facefusion.globals.output_video_quality * 0.51))
 		commands.extend([ '-qp_i', str(output_video_compression), '-qp_p', str(output_video_compression), '-quality', map_amf_preset(facefusion.globals.output_video_preset) ])
-	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
-	return run_ffmpeg(commands)
+	return commands
+
+
+def read_stream_frames(process : subprocess.Popen[bytes], resolution : Resolution) -> Iterator[VisionFrame]:
+	width, height = resolution
+	stream_reader = cast(BufferedReader, process.stdout)
+
+	while True:
+		vision_frame = numpy.empty((height, width, 3), dtype = numpy.uint8)
+		if stream_reader.readinto(vision_frame.data.cast('B')) < vision_frame.nbytes:
+			break
+		yield vision_frame
+
+
+def write_stream_frame(process : subprocess.Popen[bytes], vision_frame : VisionFrame) -> bool:
+	vision_frame = numpy.ascontiguousarray(vision_frame, dtype = numpy.uint8)
+	try:
+		process.stdin.write(vision_frame.data.cast('B'))
+	except OSError:
+		return False
+	return True
+
+
+def close_stream(process : subprocess.Popen[bytes]) -> bool:
+	if process.stdin and not process.stdin.closed:
+		try:
+			process.stdin.close()
+		except OSError:
+			pass
+	if process.stdout:
+		process.stdout.close()
+	return process.wait() == 0
 
 
 def copy_image(target_path : str, temp_image_resolution : str) -> bool:
@@ -104,20 +299,50 @@ def read_audio_buffer(target_path : str, sample_rate : int, channel_total : int)
 	return None
 
 
+def extract_audio(target_path : str, output_video_fps : Fps) -> bool:
+	temp_audio_path = get_temp_audio_path(target_path)
+	video_metadata = get_video_metadata(target_path)
+	commands = create_trim_commands(output_video_fps)
+
+	if video_metadata and video_metadata.get('has_audio') is False:
+		return False
+	commands.extend([ '-i', target_path, '-vn', '-c:a', 'copy', '-map', '0:a:0', '-y', temp_audio_path ])
+	if run_ffmpeg(commands):
+		return True
+	if is_file(temp_audio_path):
+		os.remove(temp_audio_path)
+	return False
+
+
 def restore_audio(target_path : str, output_path : str, output_video_fps : Fps) -> bool:
-	trim_frame_start = facefusion.globals.trim_frame_start
-	trim_frame_end = facefusion.globals.trim_frame_end
 	temp_file_path = get_temp_file_path(target_path)
+	temp_audio_path = get_temp_audio_path(target_path)
+	video_metadata = get_video_metadata(target_path)
 	commands = [ '-i', temp_file_path ]
 
+	if video_metadata and video_metadata.get('has_audio') is False:
+		return False
+	if is_file(temp_audio_path):
+		commands.extend([ '-i', temp_audio_path ])
+	else:
+		commands.extend(create_trim_commands(output_video_fps))
+		commands.extend([ '-i', target_path ])
+	commands.extend([ '-c', 'copy', '-map', '0:v:0', '-map', '1:a:0', '-shortest', '-y', output_path ])
+	return run_ffmpeg(commands)
+
+
+def create_trim_commands(output_video_fps : Fps) -> List[str]:
+	trim_frame_start = facefusion.globals.trim_frame_start
+	trim_frame_end = facefusion.globals.trim_frame_end
+	commands = []
+
 	if trim_frame_start is not None:
 		start_time = trim_frame_start / output_video_fps
 		commands.extend([ '-ss', str(start_time) ])
 	if trim_frame_end is not None:
 		end_time = trim_frame_end / output_video_fps
 		commands.extend([ '-to', str(end_time) ])
-	commands.extend([ '-i', target_path, '-c', 'copy', '-map', '0:v:0', '-map', '1:a:0', '-shortest', '-y', output_path ])
-	return run_ffmpeg(commands)
+	return commands
 
 
 def replace_audio(target_path : str, audio_path : str, output_path : str) -> bool:
@@ -29,6 +29,11 @@ def get_temp_file_path(target_path : str) -> str:
 	return os.path.join(temp_directory_path, 'temp' + target_extension)
 
 
+def get_temp_audio_path(target_path : str) -> str:
+	temp_directory_path = get_temp_directory_path(target_path)
+	return os.path.join(temp_directory_path, 'temp.mka')
+
+
 def get_temp_directory_path(target_path : str) -> str:
 	target_name, _ = os.path.splitext(os.path.basename(target_path))
 	temp_directory_path = os.path.join(tempfile.gettempdir(), 'facefusion')
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from facefusion.typing import LogLevel, VideoMemoryStrategy, FaceSelectorMode, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceMaskType, FaceMaskRegion, OutputVideoEncoder, OutputVideoPreset, FaceDetectorModel, FaceRecognizerModel, TempFrameFormat, Padding
+from facefusion.typing import LogLevel, ExecutionBackend, ExecutionGraphOptimization, ExecutionMode, VideoMemoryStrategy, FaceSelectorMode, FaceAnalyserOrder, FaceAnalyserAge, FaceAnalyserGender, FaceMaskType, FaceMaskRegion, OutputVideoEncoder, OutputVideoPreset, FaceDetectorModel, FaceRecognizerModel, TempFrameMode, TempFrameFormat, TempFrameHwaccel, Padding
 
 # general
 config_path : Optional[str] = None
@@ -15,11 +15,22 @@ log_level : Optional[LogLevel] = None
 # execution
 execution_device_id : Optional[str] = None
 execution_providers : List[str] = []
+execution_backend : Optional[ExecutionBackend] = None
 execution_thread_count : Optional[int] = None
 execution_queue_count : Optional[int] = None
+execution_concurrency : Optional[int] = None
+execution_intra_op_thread_count : Optional[int] = None
+execution_inter_op_thread_count : Optional[int] = None
+execution_graph_optimization : Optional[ExecutionGraphOptimization] = None
+execution_mode : Optional[ExecutionMode] = None
+execution_cache_path : Optional[str] = None
 # memory
 video_memory_strategy : Optional[VideoMemoryStrategy] = None
 system_memory_limit : Optional[int] = None
+face_store_memory_limit : Optional[int] = None
+inference_memory_limit : Optional[int] = None
+skip_memory_pattern : Optional[bool] = None
+skip_memory_arena : Optional[bool] = None
 # face analyser
 face_analyser_order : Optional[FaceAnalyserOrder] = None
 face_analyser_age : Optional[FaceAnalyserAge] = None
@@ -28,6 +39,8 @@ face_detector_model : Optional[FaceDetectorModel] = None
 face_detector_size : Optional[str] = None
 face_detector_score : Optional[float] = None
 face_landmarker_score : Optional[float] = None
+face_tracker_interval : Optional[int] = None
+face_cache_path : Optional[str] = None
 face_recognizer_model : Optional[FaceRecognizerModel] = None
 # face selector
 face_selector_mode : Optional[FaceSelectorMode] = None
@@ -42,7 +55,10 @@ face_mask_regions : Optional[List[FaceMaskRegion]] = None
 # frame extraction
 trim_frame_start : Optional[int] = None
 trim_frame_end : Optional[int] = None
+temp_frame_mode : Optional[TempFrameMode] = None
 temp_frame_format : Optional[TempFrameFormat] = None
+temp_frame_hwaccel : Optional[TempFrameHwaccel] = None
+temp_chunk_duration : Optional[int] = None
 keep_temp : Optional[bool] = None
 # output creation
 output_image_quality : Optional[int] = None
@@ -0,0 +1,220 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import os
+import threading
+import weakref
+from pathlib import Path
+from time import perf_counter
+import numpy
+import onnxruntime
+
+import facefusion.globals
+from facefusion.execution import apply_execution_provider_options
+from facefusion.filesystem import is_file
+from facefusion.typing import InferencePool, InferenceMetrics, InferenceBinding, ExecutionGraphOptimization
+
+INFERENCE_LOCK : threading.Lock = threading.Lock()
+INFERENCE_POOL : InferencePool = {}
+INFERENCE_LOAD_LOCKS : Dict[str, threading.Lock] = {}
+INFERENCE_BINDINGS : threading.local = threading.local()
+INFERENCE_METRICS : InferenceMetrics =\
+{
+	'loads': 0,
+	'hits': 0,
+	'evictions': 0,
+	'load_seconds': 0.0,
+	'memory': 0
+}
+EXECUTION_GRAPH_OPTIMIZATIONS : Dict[ExecutionGraphOptimization, onnxruntime.GraphOptimizationLevel] =\
+{
+	'disable': onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+	'basic': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+	'extended': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+	'all': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+}
+MODEL_CACHE_EXECUTION_PROVIDERS = [ 'CPUExecutionProvider', 'CUDAExecutionProvider', 'ROCMExecutionProvider' ]
+TENSOR_TYPES : Dict[str, Any] =\
+{
+	'tensor(float)': numpy.float32,
+	'tensor(float16)': numpy.float16,
+	'tensor(double)': numpy.float64,
+	'tensor(int64)': numpy.int64,
+	'tensor(int32)': numpy.int32,
+	'tensor(uint8)': numpy.uint8,
+	'tensor(bool)': numpy.bool_
+}
+
+
+def get_inference_session(model_path : str) -> Any:
+	inference_key = create_inference_key(model_path)
+
+	with INFERENCE_LOCK:
+		inference_load_lock = INFERENCE_LOAD_LOCKS.setdefault(inference_key, threading.Lock())
+	with inference_load_lock:
+		with INFERENCE_LOCK:
+			if inference_key in INFERENCE_POOL:
+				inference_entry = INFERENCE_POOL.pop(inference_key)
+				inference_entry['references'] += 1
+				INFERENCE_POOL[inference_key] = inference_entry
+				INFERENCE_METRICS['hits'] += 1
+				evict_inference_sessions()
+				return inference_entry.get('session')
+		start_time = perf_counter()
+		inference_session = create_inference_session(model_path)
+		with INFERENCE_LOCK:
+			inference_entry =\
+			{
+				'session': inference_session,
+				'memory': os.path.getsize(model_path),
+				'references': 1
+			}
+			INFERENCE_POOL[inference_key] = inference_entry
+			INFERENCE_METRICS['loads'] += 1
+			INFERENCE_METRICS['load_seconds'] += perf_counter() - start_time
+			INFERENCE_METRICS['memory'] += inference_entry.get('memory')
+			evict_inference_sessions()
+	return inference_session
+
+
+def create_inference_session(model_path : str) -> Any:
+	execution_providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers)
+	model_cache_path = create_model_cache_path(model_path)
+
+	if model_cache_path and is_file(model_cache_path):
+		try:
+			return onnxruntime.InferenceSession(model_cache_path, sess_options = create_session_options(True), providers = execution_providers)
+		except Exception:
+			os.remove(model_cache_path)
+	session_options = create_session_options(False)
+	if model_cache_path:
+		Path(facefusion.globals.execution_cache_path).mkdir(parents = True, exist_ok = True)
+		session_options.optimized_model_filepath = model_cache_path + '.' + str(os.getpid()) + '.tmp'
+	inference_session = onnxruntime.InferenceSession(model_path, sess_options = session_options, providers = execution_providers)
+	if model_cache_path and is_file(session_options.optimized_model_filepath):
+		os.replace(session_options.optimized_model_filepath, model_cache_path)
+	return inference_session
+
+
+def create_session_options(is_optimized : bool) -> onnxruntime.SessionOptions:
+	session_options = onnxruntime.SessionOptions()
+	session_options.intra_op_num_threads = resolve_intra_op_thread_count()
+	session_options.inter_op_num_threads = facefusion.globals.execution_inter_op_thread_count or 0
+	session_options.graph_optimization_level = EXECUTION_GRAPH_OPTIMIZATIONS.get(facefusion.globals.execution_graph_optimization or 'all')
+	session_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+	session_options.enable_mem_pattern = not facefusion.globals.skip_memory_pattern
+	session_options.enable_cpu_mem_arena = not facefusion.globals.skip_memory_arena
+	if is_optimized:
+		session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+	if facefusion.globals.execution_mode == 'parallel':
+		session_options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+	if 'DmlExecutionProvider' in facefusion.globals.execution_providers:
+		session_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+		session_options.enable_mem_pattern = False
+	return session_options
+
+
+def resolve_intra_op_thread_count() -> int:
+	if facefusion.globals.execution_intra_op_thread_count:
+		return facefusion.globals.execution_intra_op_thread_count
+	return max((os.cpu_count() or 1) // (facefusion.globals.execution_thread_count or 1), 1)
+
+
+def create_model_cache_path(model_path : str) -> Optional[str]:
+	if facefusion.globals.execution_cache_path and is_file(model_path) and all(execution_provider in MODEL_CACHE_EXECUTION_PROVIDERS for execution_provider in facefusion.globals.execution_providers):
+		model_cache_key =\
+		[
+			os.path.abspath(model_path),
+			os.path.getsize(model_path),
+			os.path.getmtime(model_path),
+			onnxruntime.__version__,
+			facefusion.globals.execution_providers,
+			facefusion.globals.execution_graph_optimization
+		]
+		model_cache_hash = hashlib.sha1(str(model_cache_key).encode('utf-8')).hexdigest()
+		return os.path.join(facefusion.globals.execution_cache_path, model_cache_hash + '.onnx')
+	return None
+
+
+def run_inference(inference_session : Any, inference_inputs : Dict[str, Any]) -> List[numpy.ndarray[Any, Any]]:
+	inference_binding = get_inference_binding(inference_session)
+	io_binding = inference_binding.get('io_binding')
+	output_buffers = inference_binding.get('output_buffers')
+
+	for input_name, input_value in inference_inputs.items():
+		io_binding.bind_cpu_input(input_name, numpy.ascontiguousarray(input_value))
+	for session_output, output_buffer in zip(inference_session.get_outputs(), output_buffers):
+		if output_buffer is None:
+			io_binding.bind_output(session_output.name, 'cpu')
+	inference_session.run_with_iobinding(io_binding)
+	return [ output_value.numpy() if output_buffer is None else output_buffer for output_value, output_buffer in zip(io_binding.get_outputs(), output_buffers) ]
+
+
+def get_inference_binding(inference_session : Any) -> InferenceBinding:
+	if not hasattr(INFERENCE_BINDINGS, 'bindings'):
+		INFERENCE_BINDINGS.bindings = weakref.WeakKeyDictionary()
+	if inference_session not in INFERENCE_BINDINGS.bindings:
+		INFERENCE_BINDINGS.bindings[inference_session] = create_inference_binding(inference_session)
+	return INFERENCE_BINDINGS.bindings.get(inference_session)
+
+
+def create_inference_binding(inference_session : Any) -> InferenceBinding:
+	io_binding = inference_session.io_binding()
+	output_buffers = []
+
+	for session_output in inference_session.get_outputs():
+		output_buffer = None
+		if all(isinstance(output_size, int) and output_size > 0 for output_size in session_output.shape) and session_output.type in TENSOR_TYPES:
+			output_buffer = numpy.empty(session_output.shape, dtype = TENSOR_TYPES.get(session_output.type))
+			io_binding.bind_output(session_output.name, 'cpu', 0, output_buffer.dtype, output_buffer.shape, output_buffer.ctypes.data)
+		else:
+			io_binding.bind_output(session_output.name, 'cpu')
+		output_buffers.append(output_buffer)
+	inference_binding : InferenceBinding =\
+	{
+		'io_binding': io_binding,
+		'output_buffers': output_buffers
+	}
+	return inference_binding
+
+
+def release_inference_session(inference_session : Any) -> None:
+	with INFERENCE_LOCK:
+		for inference_entry in INFERENCE_POOL.values():
+			if inference_entry.get('session') is inference_session:
+				inference_entry['references'] = max(inference_entry.get('references') - 1, 0)
+				break
+		evict_inference_sessions()
+
+
+def evict_inference_sessions() -> None:
+	if facefusion.globals.video_memory_strategy == 'strict' or facefusion.globals.inference_memory_limit:
+		inference_memory_limit = facefusion.globals.inference_memory_limit * 1024 * 1024
+		for inference_key in list(INFERENCE_POOL.keys()):
+			if INFERENCE_METRICS['memory'] <= inference_memory_limit:
+				break
+			if INFERENCE_POOL[inference_key].get('references') == 0:
+				INFERENCE_METRICS['memory'] -= INFERENCE_POOL.pop(inference_key).get('memory')
+				INFERENCE_METRICS['evictions'] += 1
+
+
+def get_inference_metrics() -> InferenceMetrics:
+	return INFERENCE_METRICS
+
+
+def clear_inference_pool() -> None:
+	global INFERENCE_POOL, INFERENCE_METRICS
+
+	with INFERENCE_LOCK:
+		INFERENCE_POOL = {}
+		INFERENCE_METRICS =\
+		{
+			'loads': 0,
+			'hits': 0,
+			'evictions': 0,
+			'load_seconds': 0.0,
+			'memory': 0
+		}
+
+
+def create_inference_key(model_path : str) -> str:
+	return os.path.abspath(model_path) + '|' + str(facefusion.globals.execution_device_id) + '|' + ','.join(facefusion.globals.execution_providers or [])
@@ -0,0 +1,92 @@
+from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event
+from threading import Thread
+from time import sleep
+import numpy
+
+import facefusion.globals
+from facefusion import process_manager
+from facefusion.face_analyser import get_average_face
+from facefusion.face_store import get_reference_faces, append_reference_face
+from facefusion.face_cache import get_face_cache_path, open_face_cache
+from facefusion.filesystem import filter_image_paths
+from facefusion.processors.frame import globals as frame_processors_globals
+from facefusion.typing import ProcessPoolState, VisionFrame, Face
+from facefusion.vision import read_static_images
+
+PROCESS_POOL_SOURCE_FACE : Optional[Face] = None
+
+
+def create_process_pool() -> ProcessPoolExecutor:
+	spawn_context = get_context('spawn')
+	stop_event = spawn_context.Event()
+	Thread(target = forward_process_stop, args = (stop_event,), daemon = True).start()
+	return ProcessPoolExecutor(max_workers = facefusion.globals.execution_thread_count, mp_context = spawn_context, initializer = init_process_pool, initargs = (create_process_pool_state(), stop_event))
+
+
+def forward_process_stop(stop_event : Event) -> None:
+	while process_manager.is_processing():
+		sleep(0.5)
+	stop_event.set()
+
+
+def listen_process_stop(stop_event : Event) -> None:
+	stop_event.wait()
+	process_manager.stop()
+
+
+def create_process_pool_state() -> ProcessPoolState:
+	process_pool_state : ProcessPoolState =\
+	{
+		'globals': { key: getattr(facefusion.globals, key) for key in facefusion.globals.__annotations__ },
+		'frame_processors_globals': { key: getattr(frame_processors_globals, key) for key in frame_processors_globals.__annotations__ },
+		'reference_faces': get_reference_faces(),
+		'face_cache_path': get_face_cache_path()
+	}
+	return process_pool_state
+
+
+def init_process_pool(process_pool_state : ProcessPoolState, stop_event : Event) -> None:
+	global PROCESS_POOL_SOURCE_FACE
+
+	for key, value in process_pool_state.get('globals').items():
+		setattr(facefusion.globals, key, value)
+	for key, value in process_pool_state.get('frame_processors_globals').items():
+		setattr(frame_processors_globals, key, value)
+	reference_faces = process_pool_state.get('reference_faces')
+	if reference_faces:
+		for reference_set in reference_faces:
+			for reference_face in reference_faces[reference_set]:
+				append_reference_face(reference_set, reference_face)
+	open_face_cache(process_pool_state.get('face_cache_path'))
+	PROCESS_POOL_SOURCE_FACE = get_average_face(read_static_images(filter_image_paths(facefusion.globals.source_paths)))
+	process_manager.start()
+	Thread(target = listen_process_stop, args = (stop_event,), daemon = True).start()
+
+
+def get_process_pool_source_face() -> Optional[Face]:
+	return PROCESS_POOL_SOURCE_FACE
+
+
+def create_shared_frames(vision_frames : List[VisionFrame]) -> SharedMemory:
+	frame_shape = vision_frames[0].shape
+	shared_memory = SharedMemory(create = True, size = len(vision_frames) * int(numpy.prod(frame_shape)))
+	shared_vision_frames : VisionFrame = numpy.ndarray((len(vision_frames),) + frame_shape, dtype = numpy.uint8, buffer = shared_memory.buf)
+	shared_vision_frames[:] = vision_frames
+	del shared_vision_frames
+	return shared_memory
+
+
+def read_shared_frames(shared_memory : SharedMemory, frame_shape : Tuple[int, ...], frame_total : int) -> List[VisionFrame]:
+	shared_vision_frames : VisionFrame = numpy.ndarray((frame_total,) + frame_shape, dtype = numpy.uint8, buffer = shared_memory.buf)
+	vision_frames = list(shared_vision_frames.copy())
+	del shared_vision_frames
+	return vision_frames
+
+
+def release_shared_memory(shared_memory : SharedMemory) -> None:
+	shared_memory.close()
+	shared_memory.unlink()
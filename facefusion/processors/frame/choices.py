@@ -12,5 +12,11 @@ frame_enhancer_models : List[FrameEnhancerModel] = [ 'clear_reality_x4', 'lsdir_
 lip_syncer_models : List[LipSyncerModel] = [ 'wav2lip_gan' ]
 
 face_enhancer_blend_range : List[int] = create_int_range(0, 100, 1)
+face_swapper_batch_size_range : List[int] = create_int_range(1, 32, 1)
+face_swapper_batch_timeout_range : List[int] = create_int_range(0, 100, 1)
 frame_colorizer_blend_range : List[int] = create_int_range(0, 100, 1)
 frame_enhancer_blend_range : List[int] = create_int_range(0, 100, 1)
+frame_enhancer_batch_size_range : List[int] = create_int_range(1, 32, 1)
+frame_enhancer_tile_overlap_range : List[int] = create_int_range(0, 32, 1)
+frame_enhancer_thread_count_range : List[int] = create_int_range(1, 16, 1)
+frame_enhancer_memory_limit_range : List[int] = create_int_range(0, 8192, 1)
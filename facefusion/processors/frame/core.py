@@ -1,16 +1,30 @@
 import os
 import sys
 import importlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue
+import math
+from time import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed
+from multiprocessing.shared_memory import SharedMemory
 from types import ModuleType
-from typing import Any, List
+from typing import Any, Dict, List, Deque, Iterator, Optional, Tuple
+import numpy
 from tqdm import tqdm
 
 import facefusion.globals
-from facefusion.typing import ProcessFrames, QueuePayload
+from facefusion.typing import ProcessFrames, FrameWorkerStatistics, QueuePayload, UpdateProgress, VisionFrame, AudioFrame, Face, FaceSet
 from facefusion.execution import encode_execution_providers
-from facefusion import logger, wording
+from facefusion.face_analyser import get_average_face, batch_get_many_faces
+from facefusion.face_store import get_reference_faces, get_static_faces, set_static_faces
+from facefusion.face_tracker import track_faces, clear_face_tracker
+from facefusion.face_cache import get_cached_faces, set_cached_faces, pop_cached_faces
+from facefusion.audio import get_voice_frame, read_static_voice, create_empty_audio_frame
+from facefusion.filesystem import filter_audio_paths, filter_image_paths
+from facefusion.vision import read_image, read_static_images, write_image, restrict_video_fps
+from facefusion.process_pool import create_process_pool, get_process_pool_source_face, create_shared_frames, read_shared_frames, release_shared_memory
+from facefusion.common_helper import get_first
+from facefusion.thread_helper import thread_lock
+from facefusion import logger, process_manager, wording
 
 FRAME_PROCESSORS_MODULES : List[ModuleType] = []
 FRAME_PROCESSORS_METHODS =\
@@ -76,30 +90,261 @@ def multi_process_frames(source_paths : List[str], temp_frame_paths : List[str],
 			'execution_thread_count': facefusion.globals.execution_thread_count,
 			'execution_queue_count': facefusion.globals.execution_queue_count
 		})
+		queue_payload_deques = create_queue_payload_deques(queue_payloads, facefusion.globals.execution_thread_count)
+		start_time = time()
 		with ThreadPoolExecutor(max_workers = facefusion.globals.execution_thread_count) as executor:
-			futures = []
-			queue : Queue[QueuePayload] = create_queue(queue_payloads)
-			queue_per_future = max(len(queue_payloads) // facefusion.globals.execution_thread_count * facefusion.globals.execution_queue_count, 1)
-			while not queue.empty():
-				future = executor.submit(process_frames, source_paths, pick_queue(queue, queue_per_future), progress.update)
-				futures.append(future)
+			futures = [ executor.submit(run_frame_worker, worker_index, source_paths, queue_payload_deques, process_frames, progress.update) for worker_index in range(len(queue_payload_deques)) ]
 			for future_done in as_completed(futures):
 				future_done.result()
+		conditional_log_frame_workers([ future.result() for future in futures ], time() - start_time)
 
 
-def create_queue(queue_payloads : List[QueuePayload]) -> Queue[QueuePayload]:
-	queue : Queue[QueuePayload] = Queue()
-	for queue_payload in queue_payloads:
-		queue.put(queue_payload)
-	return queue
+def run_frame_worker(worker_index : int, source_paths : List[str], queue_payload_deques : List[Deque[QueuePayload]], process_frames : ProcessFrames, update_progress : UpdateProgress) -> FrameWorkerStatistics:
+	frame_worker_statistics : FrameWorkerStatistics =\
+	{
+		'frame_total': 0,
+		'steal_total': 0,
+		'busy_seconds': 0.0
+	}
 
+	while process_manager.is_processing():
+		queue_payloads, is_stolen = pick_queue_payloads(worker_index, queue_payload_deques, max(facefusion.globals.execution_queue_count, facefusion.globals.face_tracker_interval))
+		if not queue_payloads:
+			break
+		start_time = time()
+		process_frames(source_paths, queue_payloads, update_progress)
+		frame_worker_statistics['frame_total'] += len(queue_payloads)
+		frame_worker_statistics['steal_total'] += int(is_stolen)
+		frame_worker_statistics['busy_seconds'] += time() - start_time
+	return frame_worker_statistics
 
-def pick_queue(queue : Queue[QueuePayload], queue_per_future : int) -> List[QueuePayload]:
-	queues = []
-	for _ in range(queue_per_future):
-		if not queue.empty():
-			queues.append(queue.get())
-	return queues
+
+def pick_queue_payloads(worker_index : int, queue_payload_deques : List[Deque[QueuePayload]], queue_count : int) -> Tuple[List[QueuePayload], bool]:
+	is_stolen = False
+
+	with thread_lock():
+		queue_payload_deque = queue_payload_deques[worker_index]
+		if not queue_payload_deque:
+			steal_payload_deque = max(queue_payload_deques, key = len)
+			for _ in range((len(steal_payload_deque) + 1) // 2):
+				queue_payload_deque.appendleft(steal_payload_deque.pop())
+			is_stolen = len(queue_payload_deque) > 0
+		queue_payloads = [ queue_payload_deque.popleft() for _ in range(min(queue_count, len(queue_payload_deque))) ]
+	return queue_payloads, is_stolen
+
+
+def create_queue_payload_deques(queue_payloads : List[QueuePayload], worker_total : int) -> List[Deque[QueuePayload]]:
+	worker_total = max(min(worker_total, len(queue_payloads)), 1)
+	queue_per_worker = max(math.ceil(len(queue_payloads) / worker_total), 1)
+	return [ deque(queue_payloads[index:index + queue_per_worker]) for index in range(0, worker_total * queue_per_worker, queue_per_worker) ]
+
+
+def conditional_log_frame_workers(frame_workers_statistics : List[FrameWorkerStatistics], total_seconds : float) -> None:
+	if facefusion.globals.log_level == 'debug':
+		for worker_index, frame_worker_statistics in enumerate(frame_workers_statistics):
+			utilization = round(frame_worker_statistics.get('busy_seconds') / max(total_seconds, 0.001) * 100)
+			logger.debug(wording.get('frame_worker_statistics').format(worker_index = worker_index, frame_total = frame_worker_statistics.get('frame_total'), steal_total = frame_worker_statistics.get('steal_total'), utilization = utilization), __name__.upper())
+
+
+def multi_process_chain(source_paths : List[str], temp_frame_paths : List[str]) -> None:
+	if 'lip_syncer' in facefusion.globals.frame_processors:
+		temp_video_fps = restrict_video_fps(facefusion.globals.target_path, facefusion.globals.output_video_fps)
+		for source_audio_path in filter_audio_paths(source_paths):
+			read_static_voice(source_audio_path, temp_video_fps)
+	clear_face_tracker()
+	if facefusion.globals.execution_backend == 'process':
+		multi_process_pool(source_paths, temp_frame_paths)
+	else:
+		multi_process_frames(source_paths, temp_frame_paths, process_chain_frames)
+
+
+def multi_process_pool(source_paths : List[str], temp_frame_paths : List[str]) -> None:
+	queue_payloads = create_queue_payloads(temp_frame_paths)
+	queue_per_future = max(facefusion.globals.execution_queue_count, facefusion.globals.face_tracker_interval)
+	with tqdm(total = len(queue_payloads), desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = facefusion.globals.log_level in [ 'warn', 'error' ]) as progress:
+		progress.set_postfix(
+		{
+			'execution_providers': encode_execution_providers(facefusion.globals.execution_providers),
+			'execution_thread_count': facefusion.globals.execution_thread_count,
+			'execution_queue_count': facefusion.globals.execution_queue_count
+		})
+		with create_process_pool() as executor:
+			futures = [ executor.submit(process_pool_frames, source_paths, queue_payloads[index:index + queue_per_future]) for index in range(0, len(queue_payloads), queue_per_future) ]
+			for future_done in as_completed(futures):
+				if not process_manager.is_processing():
+					for future in futures:
+						future.cancel()
+					break
+				frame_count, faces_by_frame = future_done.result()
+				for frame_number, faces in faces_by_frame.items():
+					set_cached_faces(frame_number, faces)
+				progress.update(frame_count)
+
+
+def process_pool_frames(source_paths : List[str], queue_payloads : List[QueuePayload]) -> Tuple[int, Dict[int, List[Face]]]:
+	frame_counts : List[int] = []
+	process_chain_frames(source_paths, queue_payloads, frame_counts.append)
+	return sum(frame_counts), pop_cached_faces()
+
+
+def process_chain_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
+	source_frames = read_static_images(filter_image_paths(source_paths))
+	source_face = get_average_face(source_frames)
+	source_audio_path = get_first(filter_audio_paths(source_paths))
+	temp_video_fps = restrict_video_fps(facefusion.globals.target_path, facefusion.globals.output_video_fps) if 'lip_syncer' in facefusion.globals.frame_processors else None
+
+	for index in range(0, len(queue_payloads), facefusion.globals.execution_queue_count):
+		batch_queue_payloads = queue_payloads[index:index + facefusion.globals.execution_queue_count]
+		target_vision_frames = [ read_image(queue_payload['frame_path']) for queue_payload in batch_queue_payloads ]
+		conditional_analyse_frames([ queue_payload['frame_number'] for queue_payload in batch_queue_payloads ], target_vision_frames)
+
+		for queue_payload, target_vision_frame in zip(process_manager.manage(batch_queue_payloads), target_vision_frames):
+			frame_number = queue_payload['frame_number']
+			target_vision_path = queue_payload['frame_path']
+			source_audio_frame = None
+			if 'lip_syncer' in facefusion.globals.frame_processors:
+				source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
+			output_vision_frame = process_chain_frame(source_face, reference_faces, source_audio_frame, target_vision_frame)
+			write_image(target_vision_path, output_vision_frame)
+			update_progress(1)
+
+
+def multi_process_stream(source_paths : List[str], vision_frames : Iterator[VisionFrame], frame_start : int, frame_total : int) -> Iterator[VisionFrame]:
+	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
+	source_frames = read_static_images(filter_image_paths(source_paths))
+	source_face = get_average_face(source_frames)
+	source_audio_path = get_first(filter_audio_paths(source_paths))
+	temp_video_fps = restrict_video_fps(facefusion.globals.target_path, facefusion.globals.output_video_fps)
+	frames_per_future = max(facefusion.globals.execution_queue_count, facefusion.globals.face_tracker_interval)
+	clear_face_tracker()
+
+	with tqdm(total = frame_total, desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = facefusion.globals.log_level in [ 'warn', 'error' ]) as progress:
+		progress.set_postfix(
+		{
+			'execution_providers': encode_execution_providers(facefusion.globals.execution_providers),
+			'execution_thread_count': facefusion.globals.execution_thread_count,
+			'execution_queue_count': facefusion.globals.execution_queue_count
+		})
+		with create_executor() as executor:
+			futures : Deque[Tuple[Future[Any], Optional[SharedMemory]]] = deque()
+			frame_numbers : List[int] = []
+			source_audio_frames : List[Optional[AudioFrame]] = []
+			target_vision_frames : List[VisionFrame] = []
+
+			for frame_number, vision_frame in enumerate(vision_frames, frame_start):
+				if not process_manager.is_processing():
+					break
+				source_audio_frame = None
+				if 'lip_syncer' in facefusion.globals.frame_processors:
+					source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
+				frame_numbers.append(frame_number)
+				source_audio_frames.append(source_audio_frame)
+				target_vision_frames.append(vision_frame)
+				if len(target_vision_frames) == frames_per_future:
+					futures.append(submit_chain_batch(executor, source_paths, source_face, reference_faces, frame_numbers, source_audio_frames, target_vision_frames))
+					frame_numbers = []
+					source_audio_frames = []
+					target_vision_frames = []
+				while len(futures) > facefusion.globals.execution_thread_count:
+					for output_vision_frame in resolve_chain_batch(*futures.popleft()):
+						yield output_vision_frame
+						progress.update()
+			if target_vision_frames and process_manager.is_processing():
+				futures.append(submit_chain_batch(executor, source_paths, source_face, reference_faces, frame_numbers, source_audio_frames, target_vision_frames))
+			while futures and process_manager.is_processing():
+				for output_vision_frame in resolve_chain_batch(*futures.popleft()):
+					yield output_vision_frame
+					progress.update()
+			for future, shared_memory in futures:
+				if not future.cancel():
+					resolve_chain_batch(future, shared_memory)
+				elif shared_memory:
+					release_shared_memory(shared_memory)
+
+
+def create_executor() -> Executor:
+	if facefusion.globals.execution_backend == 'process':
+		return create_process_pool()
+	return ThreadPoolExecutor(max_workers = facefusion.globals.execution_thread_count)
+
+
+def submit_chain_batch(executor : Executor, source_paths : List[str], source_face : Face, reference_faces : FaceSet, frame_numbers : List[int], source_audio_frames : List[Optional[AudioFrame]], target_vision_frames : List[VisionFrame]) -> Tuple[Future[Any], Optional[SharedMemory]]:
+	if isinstance(executor, ProcessPoolExecutor):
+		shared_memory = create_shared_frames(target_vision_frames)
+		return executor.submit(process_pool_batch, source_paths, frame_numbers, source_audio_frames, shared_memory.name, get_first(target_vision_frames).shape), shared_memory
+	return executor.submit(process_chain_batch, source_face, reference_faces, frame_numbers, source_audio_frames, target_vision_frames), None
+
+
+def resolve_chain_batch(future : Future[Any], shared_memory : Optional[SharedMemory]) -> List[VisionFrame]:
+	if shared_memory:
+		try:
+			output_shared_memory_name, output_frame_shape, output_frame_total, faces_by_frame = future.result()
+		finally:
+			release_shared_memory(shared_memory)
+		for frame_number, faces in faces_by_frame.items():
+			set_cached_faces(frame_number, faces)
+		output_shared_memory = SharedMemory(name = output_shared_memory_name)
+		output_vision_frames = read_shared_frames(output_shared_memory, output_frame_shape, output_frame_total)
+		release_shared_memory(output_shared_memory)
+		return output_vision_frames
+	return future.result()
+
+
+def process_pool_batch(source_paths : List[str], frame_numbers : List[int], source_audio_frames : List[Optional[AudioFrame]], shared_memory_name : str, frame_shape : Tuple[int, ...]) -> Tuple[str, Tuple[int, ...], int, Dict[int, List[Face]]]:
+	shared_memory = SharedMemory(name = shared_memory_name)
+	target_vision_frames = read_shared_frames(shared_memory, frame_shape, len(frame_numbers))
+	shared_memory.close()
+	reference_faces = get_reference_faces() if 'reference' in facefusion.globals.face_selector_mode else None
+	source_face = get_process_pool_source_face()
+	output_vision_frames = process_chain_batch(source_face, reference_faces, frame_numbers, source_audio_frames, target_vision_frames)
+	output_shared_memory = create_shared_frames(output_vision_frames)
+	output_shared_memory.close()
+	return output_shared_memory.name, get_first(output_vision_frames).shape, len(output_vision_frames), pop_cached_faces()
+
+
+def process_chain_batch(source_face : Face, reference_faces : FaceSet, frame_numbers : List[int], source_audio_frames : List[Optional[AudioFrame]], target_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
+	conditional_analyse_frames(frame_numbers, target_vision_frames)
+	return [ process_chain_frame(source_face, reference_faces, source_audio_frame, target_vision_frame) for source_audio_frame, target_vision_frame in zip(source_audio_frames, target_vision_frames) ]
+
+
+def process_chain_frame(source_face : Face, reference_faces : FaceSet, source_audio_frame : Optional[AudioFrame], target_vision_frame : VisionFrame) -> VisionFrame:
+	if not numpy.any(source_audio_frame):
+		source_audio_frame = create_empty_audio_frame()
+
+	frame_processors_modules = get_frame_processors_modules(facefusion.globals.frame_processors)
+
+	for frame_processor_module in frame_processors_modules:
+		output_vision_frame = frame_processor_module.process_frame(
+		{
+			'reference_faces': reference_faces,
+			'source_face': source_face,
+			'source_audio_frame': source_audio_frame,
+			'target_vision_frame': target_vision_frame
+		})
+		if frame_processor_module is not frame_processors_modules[-1] and output_vision_frame.shape == target_vision_frame.shape:
+			target_faces = get_static_faces(target_vision_frame)
+			if target_faces is not None:
+				set_static_faces(output_vision_frame, target_faces)
+		target_vision_frame = output_vision_frame
+	return target_vision_frame
+
+
+def conditional_analyse_frames(frame_numbers : List[int], vision_frames : List[VisionFrame]) -> None:
+	if get_first(facefusion.globals.frame_processors) in [ 'face_debugger', 'face_enhancer', 'face_swapper', 'lip_syncer' ]:
+		for frame_number, vision_frame in zip(frame_numbers, vision_frames):
+			cached_faces = get_cached_faces(frame_number)
+			if cached_faces is not None:
+				set_static_faces(vision_frame, cached_faces)
+		if facefusion.globals.face_tracker_interval > 1:
+			for frame_number, vision_frame in zip(frame_numbers, vision_frames):
+				track_faces(frame_number, vision_frame)
+		elif len(vision_frames) > 1:
+			batch_get_many_faces(vision_frames)
+		for frame_number, vision_frame in zip(frame_numbers, vision_frames):
+			static_faces = get_static_faces(vision_frame)
+			if static_faces is not None:
+				set_cached_faces(frame_number, static_faces)
 
 
 def create_queue_payloads(temp_frame_paths : List[str]) -> List[QueuePayload]:
@@ -6,9 +6,15 @@ face_debugger_items : Optional[List[FaceDebuggerItem]] = None
 face_enhancer_model : Optional[FaceEnhancerModel] = None
 face_enhancer_blend : Optional[int] = None
 face_swapper_model : Optional[FaceSwapperModel] = None
+face_swapper_batch_size : Optional[int] = None
+face_swapper_batch_timeout : Optional[int] = None
 frame_colorizer_model : Optional[FrameColorizerModel] = None
 frame_colorizer_blend : Optional[int] = None
 frame_colorizer_size : Optional[str] = None
 frame_enhancer_model : Optional[FrameEnhancerModel] = None
 frame_enhancer_blend : Optional[int] = None
+frame_enhancer_batch_size : Optional[int] = None
+frame_enhancer_tile_overlap : Optional[int] = None
+frame_enhancer_thread_count : Optional[int] = None
+frame_enhancer_memory_limit : Optional[int] = None
 lip_syncer_model : Optional[LipSyncerModel] = None
@@ -6,12 +6,12 @@ import numpy
 import facefusion.globals
 import facefusion.processors.frame.core as frame_processors
 from facefusion import config, process_manager, wording
-from facefusion.face_analyser import get_one_face, get_many_faces, find_similar_faces, clear_face_analyser
+from facefusion.face_analyser import get_one_face, get_many_faces, find_similar_faces, analyse_faces, clear_face_analyser
 from facefusion.face_masker import create_static_box_mask, create_occlusion_mask, create_region_mask, clear_face_occluder, clear_face_parser
 from facefusion.face_helper import warp_face_by_face_landmark_5, categorize_age, categorize_gender
 from facefusion.face_store import get_reference_faces
 from facefusion.content_analyser import clear_content_analyser
-from facefusion.typing import Face, VisionFrame, UpdateProgress, ProcessMode, QueuePayload
+from facefusion.typing import Face, FaceAnalyserAttribute, VisionFrame, UpdateProgress, ProcessMode, QueuePayload
 from facefusion.vision import read_image, read_static_image, write_image
 from facefusion.processors.frame.typings import FaceDebuggerInputs
 from facefusion.processors.frame import globals as frame_processors_globals, choices as frame_processors_choices
@@ -137,6 +137,12 @@ def debug_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFra
 	return temp_vision_frame
 
 
+def get_face_analyser_attributes() -> List[FaceAnalyserAttribute]:
+	if 'age' in frame_processors_globals.face_debugger_items or 'gender' in frame_processors_globals.face_debugger_items:
+		return [ 'gender_age' ]
+	return []
+
+
 def get_reference_frame(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
 	pass
 
@@ -144,18 +150,19 @@ def get_reference_frame(source_face : Face, target_face : Face, temp_vision_fram
 def process_frame(inputs : FaceDebuggerInputs) -> VisionFrame:
 	reference_faces = inputs.get('reference_faces')
 	target_vision_frame = inputs.get('target_vision_frame')
+	face_analyser_attributes = get_face_analyser_attributes()
 
 	if facefusion.globals.face_selector_mode == 'many':
-		many_faces = get_many_faces(target_vision_frame)
+		many_faces = get_many_faces(target_vision_frame, face_analyser_attributes)
 		if many_faces:
 			for target_face in many_faces:
 				target_vision_frame = debug_face(target_face, target_vision_frame)
 	if facefusion.globals.face_selector_mode == 'one':
-		target_face = get_one_face(target_vision_frame)
+		target_face = get_one_face(target_vision_frame, 0, face_analyser_attributes)
 		if target_face:
 			target_vision_frame = debug_face(target_face, target_vision_frame)
 	if facefusion.globals.face_selector_mode == 'reference':
-		similar_faces = find_similar_faces(reference_faces, target_vision_frame, facefusion.globals.reference_face_distance)
+		similar_faces = analyse_faces(target_vision_frame, find_similar_faces(reference_faces, target_vision_frame, facefusion.globals.reference_face_distance), face_analyser_attributes)
 		if similar_faces:
 			for similar_face in similar_faces:
 				target_vision_frame = debug_face(similar_face, target_vision_frame)
@@ -3,7 +3,6 @@ from argparse import ArgumentParser
 from time import sleep
 import cv2
 import numpy
-import onnxruntime
 
 import facefusion.globals
 import facefusion.processors.frame.core as frame_processors
@@ -11,11 +10,12 @@ from facefusion import config, process_manager, logger, wording
 from facefusion.face_analyser import get_many_faces, clear_face_analyser, find_similar_faces, get_one_face
 from facefusion.face_masker import create_static_box_mask, create_occlusion_mask, clear_face_occluder
 from facefusion.face_helper import warp_face_by_face_landmark_5, paste_back
-from facefusion.execution import apply_execution_provider_options
+from facefusion.inference_manager import get_inference_session, release_inference_session, run_inference
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.face_store import get_reference_faces
+from facefusion.tensor_helper import prepare_vision_frames, normalize_vision_tensor
 from facefusion.normalizer import normalize_output_path
-from facefusion.thread_helper import thread_lock, thread_semaphore
+from facefusion.thread_helper import thread_lock, inference_semaphore
 from facefusion.typing import Face, VisionFrame, UpdateProgress, ProcessMode, ModelSet, OptionsWithModel, QueuePayload
 from facefusion.common_helper import create_metavar
 from facefusion.filesystem import is_file, is_image, is_video, resolve_relative_path
@@ -104,13 +104,14 @@ def get_frame_processor() -> Any:
 			sleep(0.5)
 		if FRAME_PROCESSOR is None:
 			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			FRAME_PROCESSOR = get_inference_session(model_path)
 	return FRAME_PROCESSOR
 
 
 def clear_frame_processor() -> None:
 	global FRAME_PROCESSOR
 
+	release_inference_session(FRAME_PROCESSOR)
 	FRAME_PROCESSOR = None
 
 
@@ -219,24 +220,18 @@ def apply_enhance(crop_vision_frame : VisionFrame) -> VisionFrame:
 		if frame_processor_input.name == 'weight':
 			weight = numpy.array([ 1 ]).astype(numpy.double)
 			frame_processor_inputs[frame_processor_input.name] = weight
-	with thread_semaphore():
-		crop_vision_frame = frame_processor.run(None, frame_processor_inputs)[0][0]
+	with inference_semaphore('face_enhancer_' + frame_processors_globals.face_enhancer_model):
+		crop_vision_frame = run_inference(frame_processor, frame_processor_inputs)[0][0]
 	return crop_vision_frame
 
 
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
-	crop_vision_frame = crop_vision_frame[:, :, ::-1] / 255.0
-	crop_vision_frame = (crop_vision_frame - 0.5) / 0.5
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
+	crop_vision_frame = prepare_vision_frames(crop_vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], True)
 	return crop_vision_frame
 
 
 def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
-	crop_vision_frame = numpy.clip(crop_vision_frame, -1, 1)
-	crop_vision_frame = (crop_vision_frame + 1) / 2
-	crop_vision_frame = crop_vision_frame.transpose(1, 2, 0)
-	crop_vision_frame = (crop_vision_frame * 255.0).round()
-	crop_vision_frame = crop_vision_frame.astype(numpy.uint8)[:, :, ::-1]
+	crop_vision_frame = normalize_vision_tensor(crop_vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], True)
 	return crop_vision_frame
 
 
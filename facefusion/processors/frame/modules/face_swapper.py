@@ -1,22 +1,28 @@
-from typing import Any, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from argparse import ArgumentParser
+from functools import lru_cache
 from time import sleep
+import cv2
 import numpy
 import onnx
-import onnxruntime
+from cv2.typing import Size
 from onnx import numpy_helper
 
 import facefusion.globals
 import facefusion.processors.frame.core as frame_processors
 from facefusion import config, process_manager, logger, wording
-from facefusion.execution import has_execution_provider, apply_execution_provider_options
+from facefusion.batch_manager import run_batch
+from facefusion.execution import has_execution_provider
+from facefusion.inference_manager import get_inference_session, release_inference_session, run_inference
 from facefusion.face_analyser import get_one_face, get_average_face, get_many_faces, find_similar_faces, clear_face_analyser
 from facefusion.face_masker import create_static_box_mask, create_occlusion_mask, create_region_mask, clear_face_occluder, clear_face_parser
-from facefusion.face_helper import warp_face_by_face_landmark_5, paste_back
+from facefusion.face_helper import estimate_matrix_by_face_landmark_5, warp_face_by_face_landmark_5, paste_back, calc_paste_bounding_box
 from facefusion.face_store import get_reference_faces
+from facefusion.tensor_helper import prepare_vision_frames, normalize_vision_tensor
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.normalizer import normalize_output_path
-from facefusion.thread_helper import thread_lock, conditional_thread_semaphore
+from facefusion.common_helper import create_metavar
+from facefusion.thread_helper import thread_lock, inference_semaphore
 from facefusion.typing import Face, Embedding, VisionFrame, UpdateProgress, ProcessMode, ModelSet, OptionsWithModel, QueuePayload
 from facefusion.filesystem import is_file, is_image, has_image, is_video, filter_image_paths, resolve_relative_path
 from facefusion.download import conditional_download, is_download_done
@@ -102,13 +108,14 @@ def get_frame_processor() -> Any:
 			sleep(0.5)
 		if FRAME_PROCESSOR is None:
 			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			FRAME_PROCESSOR = get_inference_session(model_path)
 	return FRAME_PROCESSOR
 
 
 def clear_frame_processor() -> None:
 	global FRAME_PROCESSOR
 
+	release_inference_session(FRAME_PROCESSOR)
 	FRAME_PROCESSOR = None
 
 
@@ -154,11 +161,15 @@ def register_args(program : ArgumentParser) -> None:
 	else:
 		face_swapper_model_fallback = 'inswapper_128_fp16'
 	program.add_argument('--face-swapper-model', help = wording.get('help.face_swapper_model'), default = config.get_str_value('frame_processors.face_swapper_model', face_swapper_model_fallback), choices = frame_processors_choices.face_swapper_models)
+	program.add_argument('--face-swapper-batch-size', help = wording.get('help.face_swapper_batch_size'), type = int, default = config.get_int_value('frame_processors.face_swapper_batch_size', '4'), choices = frame_processors_choices.face_swapper_batch_size_range, metavar = create_metavar(frame_processors_choices.face_swapper_batch_size_range))
+	program.add_argument('--face-swapper-batch-timeout', help = wording.get('help.face_swapper_batch_timeout'), type = int, default = config.get_int_value('frame_processors.face_swapper_batch_timeout', '0'), choices = frame_processors_choices.face_swapper_batch_timeout_range, metavar = create_metavar(frame_processors_choices.face_swapper_batch_timeout_range))
 
 
 def apply_args(program : ArgumentParser) -> None:
 	args = program.parse_args()
 	frame_processors_globals.face_swapper_model = args.face_swapper_model
+	frame_processors_globals.face_swapper_batch_size = args.face_swapper_batch_size
+	frame_processors_globals.face_swapper_batch_timeout = args.face_swapper_batch_timeout
 	if args.face_swapper_model == 'blendswap_256':
 		facefusion.globals.face_recognizer_model = 'arcface_blendswap'
 	if args.face_swapper_model == 'inswapper_128' or args.face_swapper_model == 'inswapper_128_fp16':
@@ -226,32 +237,80 @@ def post_process() -> None:
 
 
 def swap_face(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+	return swap_faces(source_face, [ target_face ], temp_vision_frame)
+
+
+def swap_faces(source_face : Face, target_faces : List[Face], temp_vision_frame : VisionFrame) -> VisionFrame:
+	paste_vision_frame = temp_vision_frame.copy()
+
+	for target_face_group in create_target_face_groups(target_faces, paste_vision_frame.shape[:2][::-1]):
+		swap_face_group(source_face, target_face_group, paste_vision_frame)
+	return paste_vision_frame
+
+
+def swap_face_group(source_face : Face, target_faces : List[Face], paste_vision_frame : VisionFrame) -> VisionFrame:
 	model_template = get_options('model').get('template')
 	model_size = get_options('model').get('size')
-	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmarks.get('5/68'), model_template, model_size)
-	crop_mask_list = []
-
-	if 'box' in facefusion.globals.face_mask_types:
-		box_mask = create_static_box_mask(crop_vision_frame.shape[:2][::-1], facefusion.globals.face_mask_blur, facefusion.globals.face_mask_padding)
-		crop_mask_list.append(box_mask)
-	if 'occlusion' in facefusion.globals.face_mask_types:
-		occlusion_mask = create_occlusion_mask(crop_vision_frame)
-		crop_mask_list.append(occlusion_mask)
-	crop_vision_frame = prepare_crop_frame(crop_vision_frame)
-	crop_vision_frame = apply_swap(source_face, crop_vision_frame)
-	crop_vision_frame = normalize_crop_frame(crop_vision_frame)
-	if 'region' in facefusion.globals.face_mask_types:
-		region_mask = create_region_mask(crop_vision_frame, facefusion.globals.face_mask_regions)
-		crop_mask_list.append(region_mask)
-	crop_mask = numpy.minimum.reduce(crop_mask_list).clip(0, 1)
-	temp_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	return temp_vision_frame
-
-
-def apply_swap(source_face : Face, crop_vision_frame : VisionFrame) -> VisionFrame:
+	crop_vision_frames = []
+	affine_matrices = []
+	crop_masks_list = []
+
+	for target_face in target_faces:
+		crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(paste_vision_frame, target_face.landmarks.get('5/68'), model_template, model_size)
+		crop_mask_list = []
+
+		if 'box' in facefusion.globals.face_mask_types:
+			box_mask = create_static_box_mask(crop_vision_frame.shape[:2][::-1], facefusion.globals.face_mask_blur, facefusion.globals.face_mask_padding)
+			crop_mask_list.append(box_mask)
+		if 'occlusion' in facefusion.globals.face_mask_types:
+			occlusion_mask = create_occlusion_mask(crop_vision_frame)
+			crop_mask_list.append(occlusion_mask)
+		crop_vision_frames.append(prepare_crop_frame(crop_vision_frame))
+		affine_matrices.append(affine_matrix)
+		crop_masks_list.append(crop_mask_list)
+	crop_vision_frames = apply_swap(source_face, crop_vision_frames)
+
+	for crop_vision_frame, affine_matrix, crop_mask_list in zip(crop_vision_frames, affine_matrices, crop_masks_list):
+		crop_vision_frame = normalize_crop_frame(crop_vision_frame)
+		if 'region' in facefusion.globals.face_mask_types:
+			region_mask = create_region_mask(crop_vision_frame, facefusion.globals.face_mask_regions)
+			crop_mask_list.append(region_mask)
+		crop_mask = numpy.minimum.reduce(crop_mask_list).clip(0, 1)
+		paste_back(paste_vision_frame, crop_vision_frame, crop_mask, affine_matrix, paste_vision_frame)
+	return paste_vision_frame
+
+
+def create_target_face_groups(target_faces : List[Face], temp_size : Size) -> List[List[Face]]:
+	model_template = get_options('model').get('template')
+	model_size = get_options('model').get('size')
+	target_face_groups : List[List[Face]] = []
+	paste_bounding_boxes : List[Tuple[int, int, int, int]] = []
+
+	for target_face in target_faces:
+		affine_matrix = estimate_matrix_by_face_landmark_5(target_face.landmarks.get('5/68'), model_template, model_size)
+		paste_bounding_box = calc_paste_bounding_box(model_size, cv2.invertAffineTransform(affine_matrix), temp_size)
+		if not target_face_groups or any(is_bounding_box_overlap(paste_bounding_box, other_paste_bounding_box) for other_paste_bounding_box in paste_bounding_boxes):
+			target_face_groups.append([])
+			paste_bounding_boxes = []
+		target_face_groups[-1].append(target_face)
+		if paste_bounding_box:
+			paste_bounding_boxes.append(paste_bounding_box)
+	return target_face_groups
+
+
+def is_bounding_box_overlap(paste_bounding_box : Optional[Tuple[int, int, int, int]], other_paste_bounding_box : Tuple[int, int, int, int]) -> bool:
+	if paste_bounding_box:
+		x1, y1, x2, y2 = paste_bounding_box
+		other_x1, other_y1, other_x2, other_y2 = other_paste_bounding_box
+		return x1 < other_x2 and other_x1 < x2 and y1 < other_y2 and other_y1 < y2
+	return False
+
+
+def apply_swap(source_face : Face, crop_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
 	frame_processor = get_frame_processor()
 	model_type = get_options('model').get('type')
 	frame_processor_inputs = {}
+	swap_inputs = []
 
 	for frame_processor_input in frame_processor.get_inputs():
 		if frame_processor_input.name == 'source':
@@ -259,11 +318,39 @@ def apply_swap(source_face : Face, crop_vision_frame : VisionFrame) -> VisionFra
 				frame_processor_inputs[frame_processor_input.name] = prepare_source_frame(source_face)
 			else:
 				frame_processor_inputs[frame_processor_input.name] = prepare_source_embedding(source_face)
-		if frame_processor_input.name == 'target':
-			frame_processor_inputs[frame_processor_input.name] = crop_vision_frame
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
-		crop_vision_frame = frame_processor.run(None, frame_processor_inputs)[0][0]
-	return crop_vision_frame
+	for crop_vision_frame in crop_vision_frames:
+		swap_inputs.append(dict(frame_processor_inputs, target = crop_vision_frame))
+	if resolve_batch_size() > 1:
+		return run_batch(NAME, swap_inputs, forward_swap, frame_processors_globals.face_swapper_batch_size, frame_processors_globals.face_swapper_batch_timeout / 1000)
+	return forward_swap(swap_inputs)
+
+
+def forward_swap(swap_inputs : List[Dict[str, Any]]) -> List[VisionFrame]:
+	frame_processor = get_frame_processor()
+	batch_size = resolve_batch_size()
+	crop_vision_frames : List[VisionFrame] = []
+
+	for index in range(0, len(swap_inputs), batch_size):
+		frame_processor_inputs = {}
+		for frame_processor_input in frame_processor.get_inputs():
+			frame_processor_inputs[frame_processor_input.name] = numpy.concatenate([ swap_input.get(frame_processor_input.name) for swap_input in swap_inputs[index:index + batch_size] ])
+		with inference_semaphore(frame_processors_globals.face_swapper_model):
+			crop_vision_frames.extend(run_inference(frame_processor, frame_processor_inputs)[0].copy())
+	return crop_vision_frames
+
+
+def resolve_batch_size() -> int:
+	return detect_batch_size(get_options('model').get('path'), frame_processors_globals.face_swapper_batch_size or 1)
+
+
+@lru_cache(maxsize = None)
+def detect_batch_size(model_path : str, face_swapper_batch_size : int) -> int:
+	frame_processor = get_frame_processor()
+
+	if face_swapper_batch_size > 1 and any(isinstance(frame_processor_input.shape[0], int) for frame_processor_input in frame_processor.get_inputs()):
+		logger.debug(wording.get('batch_size_not_supported').format(model = frame_processors_globals.face_swapper_model), NAME)
+		return 1
+	return face_swapper_batch_size
 
 
 def prepare_source_frame(source_face : Face) -> VisionFrame:
@@ -273,9 +360,7 @@ def prepare_source_frame(source_face : Face) -> VisionFrame:
 		source_vision_frame, _ = warp_face_by_face_landmark_5(source_vision_frame, source_face.landmarks.get('5/68'), 'arcface_112_v2', (112, 112))
 	if model_type == 'uniface':
 		source_vision_frame, _ = warp_face_by_face_landmark_5(source_vision_frame, source_face.landmarks.get('5/68'), 'ffhq_512', (256, 256))
-	source_vision_frame = source_vision_frame[:, :, ::-1] / 255.0
-	source_vision_frame = source_vision_frame.transpose(2, 0, 1)
-	source_vision_frame = numpy.expand_dims(source_vision_frame, axis = 0).astype(numpy.float32)
+	source_vision_frame = prepare_vision_frames(source_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], True)
 	return source_vision_frame
 
 
@@ -293,17 +378,12 @@ def prepare_source_embedding(source_face : Face) -> Embedding:
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	model_mean = get_options('model').get('mean')
 	model_standard_deviation = get_options('model').get('standard_deviation')
-	crop_vision_frame = crop_vision_frame[:, :, ::-1] / 255.0
-	crop_vision_frame = (crop_vision_frame - model_mean) / model_standard_deviation
-	crop_vision_frame = crop_vision_frame.transpose(2, 0, 1)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0).astype(numpy.float32)
+	crop_vision_frame = prepare_vision_frames(crop_vision_frame, model_mean, model_standard_deviation, True)
 	return crop_vision_frame
 
 
 def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
-	crop_vision_frame = crop_vision_frame.transpose(1, 2, 0)
-	crop_vision_frame = (crop_vision_frame * 255.0).round()
-	crop_vision_frame = crop_vision_frame[:, :, ::-1]
+	crop_vision_frame = normalize_vision_tensor(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], True)
 	return crop_vision_frame
 
 
@@ -319,8 +399,7 @@ def process_frame(inputs : FaceSwapperInputs) -> VisionFrame:
 	if facefusion.globals.face_selector_mode == 'many':
 		many_faces = get_many_faces(target_vision_frame)
 		if many_faces:
-			for target_face in many_faces:
-				target_vision_frame = swap_face(source_face, target_face, target_vision_frame)
+			target_vision_frame = swap_faces(source_face, many_faces, target_vision_frame)
 	if facefusion.globals.face_selector_mode == 'one':
 		target_face = get_one_face(target_vision_frame)
 		if target_face:
@@ -328,8 +407,7 @@ def process_frame(inputs : FaceSwapperInputs) -> VisionFrame:
 	if facefusion.globals.face_selector_mode == 'reference':
 		similar_faces = find_similar_faces(reference_faces, target_vision_frame, facefusion.globals.reference_face_distance)
 		if similar_faces:
-			for similar_face in similar_faces:
-				target_vision_frame = swap_face(source_face, similar_face, target_vision_frame)
+			target_vision_frame = swap_faces(source_face, similar_faces, target_vision_frame)
 	return target_vision_frame
 
 
@@ -3,16 +3,15 @@ from argparse import ArgumentParser
 from time import sleep
 import cv2
 import numpy
-import onnxruntime
 
 import facefusion.globals
 import facefusion.processors.frame.core as frame_processors
 from facefusion import config, process_manager, logger, wording
 from facefusion.face_analyser import clear_face_analyser
 from facefusion.content_analyser import clear_content_analyser
-from facefusion.execution import apply_execution_provider_options
+from facefusion.inference_manager import get_inference_session, release_inference_session
 from facefusion.normalizer import normalize_output_path
-from facefusion.thread_helper import thread_lock, thread_semaphore
+from facefusion.thread_helper import thread_lock, inference_semaphore
 from facefusion.typing import Face, VisionFrame, UpdateProgress, ProcessMode, ModelSet, OptionsWithModel, QueuePayload
 from facefusion.common_helper import create_metavar
 from facefusion.filesystem import is_file, resolve_relative_path, is_image, is_video
@@ -68,13 +67,14 @@ def get_frame_processor() -> Any:
 			sleep(0.5)
 		if FRAME_PROCESSOR is None:
 			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			FRAME_PROCESSOR = get_inference_session(model_path)
 	return FRAME_PROCESSOR
 
 
 def clear_frame_processor() -> None:
 	global FRAME_PROCESSOR
 
+	release_inference_session(FRAME_PROCESSOR)
 	FRAME_PROCESSOR = None
 
 
@@ -155,7 +155,7 @@ def post_process() -> None:
 def colorize_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	frame_processor = get_frame_processor()
 	prepare_vision_frame = prepare_temp_frame(temp_vision_frame)
-	with thread_semaphore():
+	with inference_semaphore(frame_processors_globals.frame_colorizer_model):
 		color_vision_frame = frame_processor.run(None,
 		{
 			frame_processor.get_inputs()[0].name: prepare_vision_frame
@@ -171,7 +171,7 @@ def prepare_temp_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_BGR2GRAY)
 	temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_GRAY2RGB)
 	if model_type == 'ddcolor':
-		temp_vision_frame = (temp_vision_frame / 255.0).astype(numpy.float32)
+		temp_vision_frame = numpy.multiply(temp_vision_frame, numpy.float32(1 / 255), dtype = numpy.float32)
 		temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_RGB2LAB)[:, :, :1]
 		temp_vision_frame = numpy.concatenate((temp_vision_frame, numpy.zeros_like(temp_vision_frame), numpy.zeros_like(temp_vision_frame)), axis = -1)
 		temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_LAB2RGB)
@@ -186,11 +186,11 @@ def merge_color_frame(temp_vision_frame : VisionFrame, color_vision_frame : Visi
 	color_vision_frame = color_vision_frame.transpose(1, 2, 0)
 	color_vision_frame = cv2.resize(color_vision_frame, (temp_vision_frame.shape[1], temp_vision_frame.shape[0]))
 	if model_type == 'ddcolor':
-		temp_vision_frame = (temp_vision_frame / 255.0).astype(numpy.float32)
+		temp_vision_frame = numpy.multiply(temp_vision_frame, numpy.float32(1 / 255), dtype = numpy.float32)
 		temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_BGR2LAB)[:, :, :1]
 		color_vision_frame = numpy.concatenate((temp_vision_frame, color_vision_frame), axis = -1)
 		color_vision_frame = cv2.cvtColor(color_vision_frame, cv2.COLOR_LAB2BGR)
-		color_vision_frame = (color_vision_frame * 255.0).round().astype(numpy.uint8)
+		color_vision_frame = numpy.rint(numpy.multiply(color_vision_frame, numpy.float32(255), dtype = numpy.float32)).astype(numpy.uint8)
 	if model_type == 'deoldify':
 		temp_blue_channel, _, _ = cv2.split(temp_vision_frame)
 		color_vision_frame = cv2.cvtColor(color_vision_frame, cv2.COLOR_BGR2RGB).astype(numpy.uint8)
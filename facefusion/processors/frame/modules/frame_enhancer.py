@@ -1,23 +1,26 @@
 from typing import Any, List, Literal, Optional
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
+import sys
 import cv2
+from cv2.typing import Size
 import numpy
-import onnxruntime
 
 import facefusion.globals
 import facefusion.processors.frame.core as frame_processors
 from facefusion import config, process_manager, logger, wording
 from facefusion.face_analyser import clear_face_analyser
 from facefusion.content_analyser import clear_content_analyser
-from facefusion.execution import apply_execution_provider_options
+from facefusion.inference_manager import get_inference_session, release_inference_session
 from facefusion.normalizer import normalize_output_path
-from facefusion.thread_helper import thread_lock, conditional_thread_semaphore
-from facefusion.typing import Face, VisionFrame, UpdateProgress, ProcessMode, ModelSet, OptionsWithModel, QueuePayload
+from facefusion.tensor_helper import prepare_vision_frames, normalize_vision_tensor
+from facefusion.thread_helper import thread_lock, inference_semaphore
+from facefusion.typing import Face, VisionFrame, VisionTensor, UpdateProgress, ProcessMode, ModelSet, OptionsWithModel, QueuePayload
 from facefusion.common_helper import create_metavar
 from facefusion.filesystem import is_file, resolve_relative_path, is_image, is_video
 from facefusion.download import conditional_download, is_download_done
-from facefusion.vision import read_image, read_static_image, write_image, merge_tile_frames, create_tile_frames
+from facefusion.vision import read_image, read_static_image, write_image, create_tile_frames, paste_tile_frame
 from facefusion.processors.frame.typings import FrameEnhancerInputs
 from facefusion.processors.frame import globals as frame_processors_globals
 from facefusion.processors.frame import choices as frame_processors_choices
@@ -108,13 +111,14 @@ def get_frame_processor() -> Any:
 			sleep(0.5)
 		if FRAME_PROCESSOR is None:
 			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			FRAME_PROCESSOR = get_inference_session(model_path)
 	return FRAME_PROCESSOR
 
 
 def clear_frame_processor() -> None:
 	global FRAME_PROCESSOR
 
+	release_inference_session(FRAME_PROCESSOR)
 	FRAME_PROCESSOR = None
 
 
@@ -138,12 +142,20 @@ def set_options(key : Literal['model'], value : Any) -> None:
 def register_args(program : ArgumentParser) -> None:
 	program.add_argument('--frame-enhancer-model', help = wording.get('help.frame_enhancer_model'), default = config.get_str_value('frame_processors.frame_enhancer_model', 'span_kendata_x4'), choices = frame_processors_choices.frame_enhancer_models)
 	program.add_argument('--frame-enhancer-blend', help = wording.get('help.frame_enhancer_blend'), type = int, default = config.get_int_value('frame_processors.frame_enhancer_blend', '80'), choices = frame_processors_choices.frame_enhancer_blend_range, metavar = create_metavar(frame_processors_choices.frame_enhancer_blend_range))
+	program.add_argument('--frame-enhancer-batch-size', help = wording.get('help.frame_enhancer_batch_size'), type = int, default = config.get_int_value('frame_processors.frame_enhancer_batch_size', '4'), choices = frame_processors_choices.frame_enhancer_batch_size_range, metavar = create_metavar(frame_processors_choices.frame_enhancer_batch_size_range))
+	program.add_argument('--frame-enhancer-tile-overlap', help = wording.get('help.frame_enhancer_tile_overlap'), type = int, default = config.get_int_value('frame_processors.frame_enhancer_tile_overlap'), choices = frame_processors_choices.frame_enhancer_tile_overlap_range, metavar = create_metavar(frame_processors_choices.frame_enhancer_tile_overlap_range))
+	program.add_argument('--frame-enhancer-thread-count', help = wording.get('help.frame_enhancer_thread_count'), type = int, default = config.get_int_value('frame_processors.frame_enhancer_thread_count', '1'), choices = frame_processors_choices.frame_enhancer_thread_count_range, metavar = create_metavar(frame_processors_choices.frame_enhancer_thread_count_range))
+	program.add_argument('--frame-enhancer-memory-limit', help = wording.get('help.frame_enhancer_memory_limit'), type = int, default = config.get_int_value('frame_processors.frame_enhancer_memory_limit', '512'), choices = frame_processors_choices.frame_enhancer_memory_limit_range, metavar = create_metavar(frame_processors_choices.frame_enhancer_memory_limit_range))
 
 
 def apply_args(program : ArgumentParser) -> None:
 	args = program.parse_args()
 	frame_processors_globals.frame_enhancer_model = args.frame_enhancer_model
 	frame_processors_globals.frame_enhancer_blend = args.frame_enhancer_blend
+	frame_processors_globals.frame_enhancer_batch_size = args.frame_enhancer_batch_size
+	frame_processors_globals.frame_enhancer_tile_overlap = args.frame_enhancer_tile_overlap
+	frame_processors_globals.frame_enhancer_thread_count = args.frame_enhancer_thread_count
+	frame_processors_globals.frame_enhancer_memory_limit = args.frame_enhancer_memory_limit
 
 
 def pre_check() -> bool:
@@ -191,42 +203,93 @@ def post_process() -> None:
 
 
 def enhance_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
-	frame_processor = get_frame_processor()
-	size = get_options('model').get('size')
+	size = resolve_tile_size()
 	scale = get_options('model').get('scale')
+	batch_size = resolve_batch_size()
 	temp_height, temp_width = temp_vision_frame.shape[:2]
-	tile_vision_frames, pad_width, pad_height = create_tile_frames(temp_vision_frame, size)
+	tile_vision_frames, pad_width, _ = create_tile_frames(temp_vision_frame, size)
+	tile_width = size[0] - 2 * size[2]
+	tiles_per_row = (pad_width - 2 * size[2]) // tile_width
+	row_total = len(tile_vision_frames) // tiles_per_row
+	rows_per_step = resolve_rows_per_step(size, scale, tiles_per_row, temp_width)
+	enhance_vision_frame = numpy.empty((temp_height * scale, temp_width * scale, 3), dtype = numpy.uint8)
+
+	with ThreadPoolExecutor(max_workers = frame_processors_globals.frame_enhancer_thread_count or 1) as executor:
+		for row_index in range(0, row_total, rows_per_step):
+			tile_indices = list(range(row_index * tiles_per_row, min(row_index + rows_per_step, row_total) * tiles_per_row))
+			futures = []
+
+			for index in range(0, len(tile_indices), batch_size):
+				futures.append(executor.submit(enhance_tile_frames, tile_vision_frames, tile_indices[index:index + batch_size], tiles_per_row, size, scale, enhance_vision_frame))
+			for future in futures:
+				future.result()
+			top = max((row_index * tile_width - size[1]) * scale, 0)
+			bottom = min((min(row_index + rows_per_step, row_total) * tile_width - size[1]) * scale, enhance_vision_frame.shape[0])
+			if bottom > top:
+				blend_frame(temp_vision_frame, enhance_vision_frame, top, bottom)
+	return enhance_vision_frame
+
+
+def enhance_tile_frames(tile_vision_frames : List[VisionFrame], tile_indices : List[int], tiles_per_row : int, size : Size, scale : int, enhance_vision_frame : VisionFrame) -> None:
+	frame_processor = get_frame_processor()
+
+	with inference_semaphore(frame_processors_globals.frame_enhancer_model):
+		tile_vision_tensor = frame_processor.run(None,
+		{
+			frame_processor.get_inputs()[0].name : prepare_tile_frames([ tile_vision_frames[tile_index] for tile_index in tile_indices ])
+		})[0]
+	for tile_index, tile_vision_frame in zip(tile_indices, normalize_tile_frames(tile_vision_tensor)):
+		paste_tile_frame(enhance_vision_frame, tile_vision_frame, tile_index, tiles_per_row, (size[0] * scale, size[1] * scale, size[2] * scale))
+
+
+def resolve_tile_size() -> Size:
+	size = get_options('model').get('size')
+	if frame_processors_globals.frame_enhancer_tile_overlap is not None:
+		return size[0], size[1], frame_processors_globals.frame_enhancer_tile_overlap
+	return size
+
+
+def resolve_rows_per_step(size : Size, scale : int, tiles_per_row : int, temp_width : int) -> int:
+	if frame_processors_globals.frame_enhancer_memory_limit:
+		frame_enhancer_memory_limit = frame_processors_globals.frame_enhancer_memory_limit * 1024 * 1024
+		tile_memory = size[0] * size[0] * 3 * 4 + size[0] * size[0] * scale * scale * 3 * 5
+		blend_memory = (size[0] - 2 * size[2]) * scale * temp_width * scale * 3 * 2
+		return max(frame_enhancer_memory_limit // (tiles_per_row * tile_memory + blend_memory), 1)
+	return sys.maxsize
+
+
+def resolve_batch_size() -> int:
+	frame_processor = get_frame_processor()
+
+	for frame_processor_input in frame_processor.get_inputs():
+		if isinstance(frame_processor_input.shape[0], int):
+			return 1
+	return frame_processors_globals.frame_enhancer_batch_size or 1
 
-	for index, tile_vision_frame in enumerate(tile_vision_frames):
-		with conditional_thread_semaphore(facefusion.globals.execution_providers):
-			tile_vision_frame = frame_processor.run(None,
-			{
-				frame_processor.get_inputs()[0].name : prepare_tile_frame(tile_vision_frame)
-			})[0]
-		tile_vision_frames[index] = normalize_tile_frame(tile_vision_frame)
-	merge_vision_frame = merge_tile_frames(tile_vision_frames, temp_width * scale, temp_height * scale, pad_width * scale, pad_height * scale, (size[0] * scale, size[1] * scale, size[2] * scale))
-	temp_vision_frame = blend_frame(temp_vision_frame, merge_vision_frame)
-	return temp_vision_frame
 
+def prepare_tile_frames(vision_tile_frames : List[VisionFrame]) -> VisionTensor:
+	tile_height, tile_width = vision_tile_frames[0].shape[:2]
+	vision_tile_tensor = numpy.empty((len(vision_tile_frames), 3, tile_height, tile_width), dtype = numpy.float32)
 
-def prepare_tile_frame(vision_tile_frame : VisionFrame) -> VisionFrame:
-	vision_tile_frame = numpy.expand_dims(vision_tile_frame[:, :, ::-1], axis = 0)
-	vision_tile_frame = vision_tile_frame.transpose(0, 3, 1, 2)
-	vision_tile_frame = vision_tile_frame.astype(numpy.float32) / 255
-	return vision_tile_frame
+	for index, vision_tile_frame in enumerate(vision_tile_frames):
+		prepare_vision_frames(vision_tile_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], True, vision_tile_tensor[index:index + 1])
+	return vision_tile_tensor
 
 
-def normalize_tile_frame(vision_tile_frame : VisionFrame) -> VisionFrame:
-	vision_tile_frame = vision_tile_frame.transpose(0, 2, 3, 1).squeeze(0) * 255
-	vision_tile_frame = vision_tile_frame.clip(0, 255).astype(numpy.uint8)[:, :, ::-1]
-	return vision_tile_frame
+def normalize_tile_frames(vision_tile_tensor : VisionTensor) -> List[VisionFrame]:
+	return [ normalize_vision_tensor(vision_tile_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], True) for vision_tile_frame in vision_tile_tensor ]
 
 
-def blend_frame(temp_vision_frame : VisionFrame, merge_vision_frame : VisionFrame) -> VisionFrame:
+def blend_frame(temp_vision_frame : VisionFrame, enhance_vision_frame : VisionFrame, top : int, bottom : int) -> None:
 	frame_enhancer_blend = 1 - (frame_processors_globals.frame_enhancer_blend / 100)
-	temp_vision_frame = cv2.resize(temp_vision_frame, (merge_vision_frame.shape[1], merge_vision_frame.shape[0]))
-	temp_vision_frame = cv2.addWeighted(temp_vision_frame, frame_enhancer_blend, merge_vision_frame, 1 - frame_enhancer_blend, 0)
-	return temp_vision_frame
+	scale = enhance_vision_frame.shape[0] // temp_vision_frame.shape[0]
+
+	if frame_enhancer_blend > 0:
+		temp_top = max(top // scale - 1, 0)
+		temp_bottom = min(bottom // scale + 1, temp_vision_frame.shape[0])
+		blend_vision_frame = cv2.resize(temp_vision_frame[temp_top:temp_bottom], (enhance_vision_frame.shape[1], (temp_bottom - temp_top) * scale))
+		blend_vision_frame = blend_vision_frame[top - temp_top * scale:bottom - temp_top * scale]
+		cv2.addWeighted(blend_vision_frame, frame_enhancer_blend, enhance_vision_frame[top:bottom], 1 - frame_enhancer_blend, 0, dst = enhance_vision_frame[top:bottom])
 
 
 def get_reference_frame(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
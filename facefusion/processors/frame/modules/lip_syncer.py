@@ -3,19 +3,19 @@ from argparse import ArgumentParser
 from time import sleep
 import cv2
 import numpy
-import onnxruntime
 
 import facefusion.globals
 import facefusion.processors.frame.core as frame_processors
 from facefusion import config, process_manager, logger, wording
-from facefusion.execution import apply_execution_provider_options
+from facefusion.inference_manager import get_inference_session, release_inference_session
 from facefusion.face_analyser import get_one_face, get_many_faces, find_similar_faces, clear_face_analyser
 from facefusion.face_masker import create_static_box_mask, create_occlusion_mask, create_mouth_mask, clear_face_occluder, clear_face_parser
 from facefusion.face_helper import warp_face_by_face_landmark_5, warp_face_by_bounding_box, paste_back, create_bounding_box_from_face_landmark_68
 from facefusion.face_store import get_reference_faces
+from facefusion.tensor_helper import prepare_vision_frames, normalize_vision_tensor
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.normalizer import normalize_output_path
-from facefusion.thread_helper import thread_lock, conditional_thread_semaphore
+from facefusion.thread_helper import thread_lock, inference_semaphore
 from facefusion.typing import Face, VisionFrame, UpdateProgress, ProcessMode, ModelSet, OptionsWithModel, AudioFrame, QueuePayload
 from facefusion.filesystem import is_file, has_audio, resolve_relative_path
 from facefusion.download import conditional_download, is_download_done
@@ -49,13 +49,14 @@ def get_frame_processor() -> Any:
 			sleep(0.5)
 		if FRAME_PROCESSOR is None:
 			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			FRAME_PROCESSOR = get_inference_session(model_path)
 	return FRAME_PROCESSOR
 
 
 def clear_frame_processor() -> None:
 	global FRAME_PROCESSOR
 
+	release_inference_session(FRAME_PROCESSOR)
 	FRAME_PROCESSOR = None
 
 
@@ -154,7 +155,7 @@ def sync_lip(target_face : Face, temp_audio_frame : AudioFrame, temp_vision_fram
 		crop_mask_list.append(occlusion_mask)
 	close_vision_frame, close_matrix = warp_face_by_bounding_box(crop_vision_frame, bounding_box, (96, 96))
 	close_vision_frame = prepare_crop_frame(close_vision_frame)
-	with conditional_thread_semaphore(facefusion.globals.execution_providers):
+	with inference_semaphore(frame_processors_globals.lip_syncer_model):
 		close_vision_frame = frame_processor.run(None,
 		{
 			'source': temp_audio_frame,
@@ -176,18 +177,15 @@ def prepare_audio_frame(temp_audio_frame : AudioFrame) -> AudioFrame:
 
 
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
-	prepare_vision_frame = crop_vision_frame.copy()
-	prepare_vision_frame[:, 48:] = 0
-	crop_vision_frame = numpy.concatenate((prepare_vision_frame, crop_vision_frame), axis = 3)
-	crop_vision_frame = crop_vision_frame.transpose(0, 3, 1, 2).astype('float32') / 255.0
-	return crop_vision_frame
+	crop_vision_tensor = numpy.empty((1, 6) + crop_vision_frame.shape[:2], dtype = numpy.float32)
+	prepare_vision_frames(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], False, crop_vision_tensor[:, 3:])
+	crop_vision_tensor[:, :3] = crop_vision_tensor[:, 3:]
+	crop_vision_tensor[:, :3, 48:] = 0
+	return crop_vision_tensor
 
 
 def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
-	crop_vision_frame = crop_vision_frame[0].transpose(1, 2, 0)
-	crop_vision_frame = crop_vision_frame.clip(0, 1) * 255
-	crop_vision_frame = crop_vision_frame.astype(numpy.uint8)
+	crop_vision_frame = normalize_vision_tensor(crop_vision_frame[0], [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], False)
 	return crop_vision_frame
 
 
@@ -2,12 +2,13 @@ from typing import Any, Dict
 import numpy
 
 import facefusion.globals
-from facefusion.face_store import FACE_STORE
-from facefusion.typing import FaceSet
+from facefusion.face_store import FACE_STORE, get_static_faces_metrics
+from facefusion.inference_manager import get_inference_metrics
+from facefusion.typing import FaceSet, FaceStoreMetrics, InferenceMetrics
 from facefusion import logger
 
 
-def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
+def create_statistics(static_faces : FaceSet, static_faces_metrics : FaceStoreMetrics, inference_metrics : InferenceMetrics) -> Dict[str, Any]:
 	face_detector_score_list = []
 	face_landmarker_score_list = []
 	statistics =\
@@ -20,11 +21,21 @@ def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
 		'average_face_landmarker_score': 0,
 		'total_face_landmark_5_fallbacks': 0,
 		'total_frames_with_faces': 0,
-		'total_faces': 0
+		'total_faces': 0,
+		'face_store_hits': static_faces_metrics.get('hits'),
+		'face_store_misses': static_faces_metrics.get('misses'),
+		'face_store_evictions': static_faces_metrics.get('evictions'),
+		'face_store_memory': static_faces_metrics.get('memory'),
+		'inference_loads': inference_metrics.get('loads'),
+		'inference_hits': inference_metrics.get('hits'),
+		'inference_evictions': inference_metrics.get('evictions'),
+		'inference_load_seconds': round(inference_metrics.get('load_seconds'), 2),
+		'inference_memory': inference_metrics.get('memory')
 	}
 
 	for faces in static_faces.values():
-		statistics['total_frames_with_faces'] = statistics.get('total_frames_with_faces') + 1
+		if faces:
+			statistics['total_frames_with_faces'] = statistics.get('total_frames_with_faces') + 1
 		for face in faces:
 			statistics['total_faces'] = statistics.get('total_faces') + 1
 			face_detector_score_list.append(face.scores.get('detector'))
@@ -45,7 +56,7 @@ def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
 
 def conditional_log_statistics() -> None:
 	if facefusion.globals.log_level == 'debug':
-		statistics = create_statistics(FACE_STORE.get('static_faces'))
+		statistics = create_statistics(FACE_STORE.get('static_faces'), get_static_faces_metrics(), get_inference_metrics())
 
 		for name, value in statistics.items():
 			logger.debug(str(name) + ': ' + str(value), __name__.upper())
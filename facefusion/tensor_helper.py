@@ -0,0 +1,33 @@
+from typing import List, Optional
+import numpy
+
+from facefusion.typing import VisionFrame, VisionTensor
+
+
+def prepare_vision_frames(vision_frames : VisionFrame, vision_mean : List[float], vision_standard_deviation : List[float], is_rgb : bool, vision_tensor : Optional[VisionTensor] = None) -> VisionTensor:
+	if vision_frames.ndim == 3:
+		vision_frames = vision_frames[numpy.newaxis]
+	frame_total, frame_height, frame_width, channel_total = vision_frames.shape
+	if vision_tensor is None:
+		vision_tensor = numpy.empty((frame_total, channel_total, frame_height, frame_width), dtype = numpy.float32)
+
+	for channel_index in range(channel_total):
+		frame_channel_index = channel_total - 1 - channel_index if is_rgb else channel_index
+		vision_scale = numpy.float32(1 / (255 * vision_standard_deviation[channel_index]))
+		vision_offset = numpy.float32(-vision_mean[channel_index] / vision_standard_deviation[channel_index])
+		numpy.multiply(vision_frames[:, :, :, frame_channel_index], vision_scale, out = vision_tensor[:, channel_index], dtype = numpy.float32)
+		vision_tensor[:, channel_index] += vision_offset
+	return vision_tensor
+
+
+def normalize_vision_tensor(vision_tensor : VisionTensor, vision_mean : List[float], vision_standard_deviation : List[float], is_rgb : bool) -> VisionFrame:
+	vision_scale = numpy.array(vision_standard_deviation, dtype = numpy.float32) * 255
+	vision_offset = numpy.array(vision_mean, dtype = numpy.float32) * 255
+	vision_frame = vision_tensor.transpose(1, 2, 0) * vision_scale
+	vision_frame += vision_offset
+	numpy.clip(vision_frame, 0, 255, out = vision_frame)
+	numpy.rint(vision_frame, out = vision_frame)
+	vision_frame = vision_frame.astype(numpy.uint8)
+	if is_rgb:
+		return vision_frame[:, :, ::-1]
+	return vision_frame
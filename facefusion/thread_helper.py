@@ -1,21 +1,88 @@
-from typing import List, Union, ContextManager
+from typing import Dict, Iterator, Optional, Union, ContextManager
+import os
 import threading
 from contextlib import nullcontext
+from queue import Empty, Full
+
+import facefusion.globals
+from facefusion.execution import detect_static_execution_devices
+from facefusion.inference_manager import resolve_intra_op_thread_count
+from facefusion.typing import StreamQueue, VisionFrame
 
 THREAD_LOCK : threading.Lock = threading.Lock()
-THREAD_SEMAPHORE : threading.Semaphore = threading.Semaphore()
+THREAD_SEMAPHORES : Dict[str, threading.Semaphore] = {}
 NULL_CONTEXT : ContextManager[None] = nullcontext()
+SERIAL_MODEL_NAMES = [ 'face_detector_yunet' ]
+SERIAL_EXECUTION_PROVIDERS = [ 'DmlExecutionProvider' ]
+TUNED_MODEL_PREFIXES = ( 'face_detector_', 'face_enhancer_', 'voice_extractor' )
+VIDEO_MEMORY_EXECUTION_PROVIDERS = [ 'CUDAExecutionProvider', 'TensorrtExecutionProvider' ]
+VIDEO_MEMORY_PER_INFERENCE = 2048
+STREAM_QUEUE_TIMEOUT = 0.1
 
 
 def thread_lock() -> threading.Lock:
 	return THREAD_LOCK
 
 
-def thread_semaphore() -> threading.Semaphore:
-	return THREAD_SEMAPHORE
-
+def inference_semaphore(model_name : str) -> Union[threading.Semaphore, ContextManager[None]]:
+	inference_concurrency = resolve_inference_concurrency(model_name)
 
-def conditional_thread_semaphore(execution_providers : List[str]) -> Union[threading.Semaphore, ContextManager[None]]:
-	if 'DmlExecutionProvider' in execution_providers:
-		return THREAD_SEMAPHORE
+	if inference_concurrency > 0:
+		semaphore_key = '|'.join([ model_name, ','.join(facefusion.globals.execution_providers), str(inference_concurrency) ])
+		with THREAD_LOCK:
+			return THREAD_SEMAPHORES.setdefault(semaphore_key, threading.Semaphore(inference_concurrency))
 	return NULL_CONTEXT
+
+
+def resolve_inference_concurrency(model_name : str) -> int:
+	if model_name in SERIAL_MODEL_NAMES:
+		return 1
+	if any(execution_provider in SERIAL_EXECUTION_PROVIDERS for execution_provider in facefusion.globals.execution_providers):
+		return 1
+	if facefusion.globals.execution_concurrency:
+		return facefusion.globals.execution_concurrency
+	if model_name.startswith(TUNED_MODEL_PREFIXES):
+		return tune_inference_concurrency()
+	return 0
+
+
+def tune_inference_concurrency() -> int:
+	if any(execution_provider in VIDEO_MEMORY_EXECUTION_PROVIDERS for execution_provider in facefusion.globals.execution_providers):
+		return min(detect_video_memory_concurrency(), facefusion.globals.execution_thread_count)
+	if facefusion.globals.execution_providers == [ 'CPUExecutionProvider' ]:
+		return min(max((os.cpu_count() or 1) // resolve_intra_op_thread_count(), 1), facefusion.globals.execution_thread_count)
+	return 1
+
+
+def detect_video_memory_concurrency() -> int:
+	execution_devices = detect_static_execution_devices()
+	execution_device_id = int(facefusion.globals.execution_device_id) if str(facefusion.globals.execution_device_id).isdigit() else 0
+
+	if execution_device_id < len(execution_devices):
+		video_memory = execution_devices[execution_device_id].get('video_memory').get('free')
+		if video_memory.get('unit') == 'MiB':
+			return max(int(video_memory.get('value')) // VIDEO_MEMORY_PER_INFERENCE, 1)
+	return 1
+
+
+def put_stream_queue(stream_queue : StreamQueue, vision_frame : Optional[VisionFrame], stop_event : threading.Event) -> bool:
+	while not stop_event.is_set():
+		try:
+			stream_queue.put(vision_frame, timeout = STREAM_QUEUE_TIMEOUT)
+			return True
+		except Full:
+			continue
+	return False
+
+
+def iterate_stream_queue(stream_queue : StreamQueue, stop_event : threading.Event) -> Iterator[VisionFrame]:
+	while True:
+		try:
+			vision_frame = stream_queue.get(timeout = STREAM_QUEUE_TIMEOUT)
+		except Empty:
+			if stop_event.is_set():
+				break
+			continue
+		if vision_frame is None:
+			break
+		yield vision_frame
@@ -1,5 +1,7 @@
-from typing import Any, Literal, Callable, List, Tuple, Dict, TypedDict
+from typing import Any, Literal, Callable, List, Tuple, Dict, TypedDict, Optional
 from collections import namedtuple
+from queue import Queue
+from threading import Condition, Lock
 import numpy
 
 BoundingBox = numpy.ndarray[Any, Any]
@@ -18,6 +20,7 @@ FaceScoreSet = TypedDict('FaceScoreSet',
 	'detector' : Score,
 	'landmarker' : Score
 })
+Detection = Tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any], numpy.ndarray[Any, Any]]
 Embedding = numpy.ndarray[Any, Any]
 Face = namedtuple('Face',
 [
@@ -30,14 +33,58 @@ Face = namedtuple('Face',
 	'age'
 ])
 FaceSet = Dict[str, List[Face]]
+FaceStoreMetrics = TypedDict('FaceStoreMetrics',
+{
+	'hits' : int,
+	'misses' : int,
+	'evictions' : int,
+	'memory' : int
+})
 FaceStore = TypedDict('FaceStore',
 {
 	'static_faces' : FaceSet,
+	'static_faces_frames' : Dict[str, numpy.ndarray[Any, Any]],
+	'static_faces_memory' : Dict[str, int],
+	'static_faces_metrics' : FaceStoreMetrics,
 	'reference_faces': FaceSet
 })
+InferenceSessionEntry = TypedDict('InferenceSessionEntry',
+{
+	'session' : Any,
+	'memory' : int,
+	'references' : int
+})
+InferencePool = Dict[str, InferenceSessionEntry]
+InferenceBinding = TypedDict('InferenceBinding',
+{
+	'io_binding' : Any,
+	'output_buffers' : List[Optional[numpy.ndarray[Any, Any]]]
+})
+InferenceMetrics = TypedDict('InferenceMetrics',
+{
+	'loads' : int,
+	'hits' : int,
+	'evictions' : int,
+	'load_seconds' : float,
+	'memory' : int
+})
+FaceCache = TypedDict('FaceCache',
+{
+	'path' : Optional[str],
+	'records' : Optional[numpy.ndarray[Any, Any]],
+	'faces' : Dict[int, List[Face]]
+})
+FaceTrackerState = TypedDict('FaceTrackerState',
+{
+	'frame_number' : int,
+	'detect_frame_number' : int,
+	'vision_frame' : numpy.ndarray[Any, Any],
+	'faces' : List[Face]
+})
 
 VisionFrame = numpy.ndarray[Any, Any]
 Mask = numpy.ndarray[Any, Any]
+VisionTensor = numpy.ndarray[Any, Any]
 Matrix = numpy.ndarray[Any, Any]
 Translation = numpy.ndarray[Any, Any]
 
@@ -51,6 +98,35 @@ MelFilterBank = numpy.ndarray[Any, Any]
 Fps = float
 Padding = Tuple[int, int, int, int]
 Resolution = Tuple[int, int]
+VideoMetadata = TypedDict('VideoMetadata',
+{
+	'fps' : Fps,
+	'resolution' : Resolution,
+	'frame_total' : int,
+	'codec' : Optional[str],
+	'has_audio' : Optional[bool]
+})
+VideoReader = TypedDict('VideoReader',
+{
+	'video_path' : str,
+	'video_capture' : Any,
+	'video_key' : Tuple[float, int],
+	'frame_total' : int,
+	'frame_position' : int,
+	'keyframe_numbers' : Optional[List[int]],
+	'lock' : Lock
+})
+VideoChunk = TypedDict('VideoChunk',
+{
+	'frame_start' : int,
+	'frame_end' : int,
+	'chunk_path' : str
+})
+ChunkManifest = TypedDict('ChunkManifest',
+{
+	'chunk_key' : str,
+	'video_chunks' : List[VideoChunk]
+})
 
 ProcessState = Literal['checking', 'processing', 'stopping', 'pending']
 QueuePayload = TypedDict('QueuePayload',
@@ -58,8 +134,35 @@ QueuePayload = TypedDict('QueuePayload',
 	'frame_number' : int,
 	'frame_path' : str
 })
+StreamQueue = Queue[Optional[VisionFrame]]
 UpdateProgress = Callable[[int], None]
 ProcessFrames = Callable[[List[str], List[QueuePayload], UpdateProgress], None]
+FrameWorkerStatistics = TypedDict('FrameWorkerStatistics',
+{
+	'frame_total' : int,
+	'steal_total' : int,
+	'busy_seconds' : float
+})
+BatchRequest = TypedDict('BatchRequest',
+{
+	'inputs' : List[Any],
+	'outputs' : Optional[List[Any]],
+	'exception' : Optional[Exception]
+})
+BatchState = TypedDict('BatchState',
+{
+	'condition' : Condition,
+	'requests' : List[BatchRequest],
+	'is_busy' : bool
+})
+ProcessBatch = Callable[[List[Any]], List[Any]]
+ProcessPoolState = TypedDict('ProcessPoolState',
+{
+	'globals' : Dict[str, Any],
+	'frame_processors_globals' : Dict[str, Any],
+	'reference_faces' : Optional[FaceSet],
+	'face_cache_path' : Optional[str]
+})
 
 WarpTemplate = Literal['arcface_112_v1', 'arcface_112_v2', 'arcface_128_v2', 'ffhq_512']
 WarpTemplateSet = Dict[WarpTemplate, numpy.ndarray[Any, Any]]
@@ -67,16 +170,22 @@ ProcessMode = Literal['output', 'preview', 'stream']
 
 LogLevel = Literal['error', 'warn', 'info', 'debug']
 VideoMemoryStrategy = Literal['strict', 'moderate', 'tolerant']
+ExecutionBackend = Literal['thread', 'process']
+ExecutionGraphOptimization = Literal['disable', 'basic', 'extended', 'all']
+ExecutionMode = Literal['sequential', 'parallel']
 FaceSelectorMode = Literal['many', 'one', 'reference']
 FaceAnalyserOrder = Literal['left-right', 'right-left', 'top-bottom', 'bottom-top', 'small-large', 'large-small', 'best-worst', 'worst-best']
 FaceAnalyserAge = Literal['child', 'teen', 'adult', 'senior']
 FaceAnalyserGender = Literal['female', 'male']
+FaceAnalyserAttribute = Literal['embedding', 'gender_age']
 FaceDetectorModel = Literal['many', 'retinaface', 'scrfd', 'yoloface', 'yunet']
 FaceDetectorTweak = Literal['low-luminance', 'high-luminance']
 FaceRecognizerModel = Literal['arcface_blendswap', 'arcface_inswapper', 'arcface_simswap', 'arcface_uniface']
 FaceMaskType = Literal['box', 'occlusion', 'region']
 FaceMaskRegion = Literal['skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip']
+TempFrameMode = Literal['file', 'stream']
 TempFrameFormat = Literal['jpg', 'png', 'bmp']
+TempFrameHwaccel = Literal['auto', 'none', 'cuda', 'vaapi', 'qsv', 'd3d11va', 'dxva2', 'videotoolbox']
 OutputVideoEncoder = Literal['libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf']
 OutputVideoPreset = Literal['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow']
 
@@ -1,14 +1,23 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from functools import lru_cache
+from bisect import bisect_right
+import json
+import os
+import subprocess
+import threading
 import cv2
 import numpy
 from cv2.typing import Size
 
 from facefusion.common_helper import is_windows
-from facefusion.typing import VisionFrame, Resolution, Fps
+from facefusion.typing import VisionFrame, VideoMetadata, VideoReader, Resolution, Fps
 from facefusion.choices import image_template_sizes, video_template_sizes
 from facefusion.filesystem import is_image, is_video, sanitize_path_for_windows
 
+VIDEO_POOL : Dict[str, VideoReader] = {}
+VIDEO_POOL_LOCK : threading.Lock = threading.Lock()
+VIDEO_POOL_LIMIT = 4
+
 
 @lru_cache(maxsize = 128)
 def read_static_image(image_path : str) -> Optional[VisionFrame]:
@@ -72,40 +81,205 @@ def create_image_resolutions(resolution : Resolution) -> List[str]:
 
 def get_video_frame(video_path : str, frame_number : int = 0) -> Optional[VisionFrame]:
 	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			frame_total = video_capture.get(cv2.CAP_PROP_FRAME_COUNT)
-			video_capture.set(cv2.CAP_PROP_POS_FRAMES, min(frame_total, frame_number - 1))
-			has_vision_frame, vision_frame = video_capture.read()
-			video_capture.release()
+		video_reader = get_video_reader(video_path)
+		if video_reader:
+			with video_reader.get('lock'):
+				video_capture = video_reader.get('video_capture')
+				frame_position = max(min(video_reader.get('frame_total'), frame_number - 1), 0)
+				if can_grab_video_frames(video_reader, frame_position):
+					for _ in range(frame_position - video_reader.get('frame_position')):
+						video_capture.grab()
+				else:
+					video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_position)
+				has_vision_frame, vision_frame = video_capture.read()
+				video_reader['frame_position'] = frame_position + 1 if has_vision_frame else -1
 			if has_vision_frame:
 				return vision_frame
 	return None
 
 
-def count_video_frame_total(video_path : str) -> int:
+def get_video_reader(video_path : str) -> Optional[VideoReader]:
+	video_key = os.path.getmtime(video_path), os.path.getsize(video_path)
+
+	with VIDEO_POOL_LOCK:
+		video_reader = VIDEO_POOL.pop(video_path, None)
+		if video_reader and video_reader.get('video_key') != video_key:
+			release_video_reader(video_reader)
+			video_reader = None
+		if not video_reader:
+			video_reader = create_video_reader(video_path, video_key)
+		if video_reader:
+			VIDEO_POOL[video_path] = video_reader
+		while len(VIDEO_POOL) > VIDEO_POOL_LIMIT:
+			release_video_reader(VIDEO_POOL.pop(next(iter(VIDEO_POOL))))
+	return video_reader
+
+
+def create_video_reader(video_path : str, video_key : Tuple[float, int]) -> Optional[VideoReader]:
+	if is_windows():
+		video_capture = cv2.VideoCapture(sanitize_path_for_windows(video_path))
+	else:
+		video_capture = cv2.VideoCapture(video_path)
+
+	if video_capture.isOpened():
+		video_reader : VideoReader =\
+		{
+			'video_path': video_path,
+			'video_capture': video_capture,
+			'video_key': video_key,
+			'frame_total': int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+			'frame_position': 0,
+			'keyframe_numbers': None,
+			'lock': threading.Lock()
+		}
+		return video_reader
+	return None
+
+
+def release_video_reader(video_reader : VideoReader) -> None:
+	with video_reader.get('lock'):
+		video_reader.get('video_capture').release()
+
+
+def clear_video_pool() -> None:
+	with VIDEO_POOL_LOCK:
+		for video_reader in VIDEO_POOL.values():
+			release_video_reader(video_reader)
+		VIDEO_POOL.clear()
+
+
+def can_grab_video_frames(video_reader : VideoReader, frame_number : int) -> bool:
+	frame_position = video_reader.get('frame_position')
+
+	if frame_position == frame_number:
+		return True
+	if 0 <= frame_position < frame_number:
+		keyframe_numbers = get_keyframe_numbers(video_reader)
+		if keyframe_numbers:
+			return bisect_right(keyframe_numbers, frame_position) == bisect_right(keyframe_numbers, frame_number)
+	return False
+
+
+def get_keyframe_numbers(video_reader : VideoReader) -> List[int]:
+	if video_reader.get('keyframe_numbers') is None:
+		video_reader['keyframe_numbers'] = detect_keyframe_numbers(video_reader.get('video_path'), detect_video_fps(video_reader.get('video_path')))
+	return video_reader.get('keyframe_numbers')
+
+
+def run_ffprobe(args : List[str]) -> Optional[str]:
+	commands = [ 'ffprobe', '-hide_banner', '-v', 'error' ]
+	commands.extend(args)
+	try:
+		process = subprocess.run(commands, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL, timeout = 60)
+	except (OSError, subprocess.TimeoutExpired):
+		return None
+	if process.returncode == 0:
+		return process.stdout.decode()
+	return None
+
+
+def detect_keyframe_numbers(video_path : str, video_fps : Fps) -> List[int]:
+	output = run_ffprobe([ '-select_streams', 'v:0', '-show_entries', 'packet=pts_time,flags', '-of', 'compact=print_section=0', video_path ]) or ''
+	packet_times = []
+
+	for line in output.splitlines():
+		packet = dict(entry.partition('=')[::2] for entry in line.split('|'))
+		if packet.get('pts_time', 'N/A') != 'N/A':
+			packet_times.append((float(packet.get('pts_time')), packet.get('flags', '').startswith('K')))
+	if packet_times and video_fps:
+		start_time = min(packet_time for packet_time, _ in packet_times)
+		return sorted(round((packet_time - start_time) * video_fps) for packet_time, is_keyframe in packet_times if is_keyframe)
+	return []
+
+
+def get_video_metadata(video_path : str) -> Optional[VideoMetadata]:
 	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
+		return detect_video_metadata(video_path, os.path.getmtime(video_path), os.path.getsize(video_path))
+	return None
+
+
+@lru_cache(maxsize = 128)
+def detect_video_metadata(video_path : str, video_mtime : float, video_size : int) -> Optional[VideoMetadata]:
+	return probe_video_metadata(video_path) or capture_video_metadata(video_path)
+
+
+def probe_video_metadata(video_path : str) -> Optional[VideoMetadata]:
+	output = run_ffprobe([ '-show_entries', 'stream=codec_type,codec_name,width,height,r_frame_rate,avg_frame_rate,nb_frames,duration:stream_tags=rotate:stream_side_data=rotation:format=duration', '-of', 'json', video_path ])
+
+	try:
+		probe = json.loads(output or '{}')
+	except ValueError:
+		return None
+	streams = probe.get('streams', [])
+	video_stream = next((stream for stream in streams if stream.get('codec_type') == 'video'), None)
+
+	if video_stream:
+		video_fps = parse_frame_rate(video_stream.get('r_frame_rate'))
+		average_fps = parse_frame_rate(video_stream.get('avg_frame_rate'))
+		if not video_fps or 0 < average_fps < 70 and video_fps > 210:
+			video_fps = average_fps
+		width = int(video_stream.get('width', 0))
+		height = int(video_stream.get('height', 0))
+		rotation = float(video_stream.get('tags', {}).get('rotate', 0))
+		for side_data in video_stream.get('side_data_list', []):
+			rotation = float(side_data.get('rotation', rotation))
+		if round(abs(rotation)) % 180 == 90:
+			width, height = height, width
+		frame_total = int(video_stream.get('nb_frames', 0) or 0)
+		if not frame_total:
+			video_duration = float(video_stream.get('duration', probe.get('format', {}).get('duration', 0)) or 0)
+			frame_total = int(numpy.floor(video_duration * video_fps + 0.5))
+		video_metadata : VideoMetadata =\
+		{
+			'fps': video_fps,
+			'resolution': (width, height),
+			'frame_total': frame_total,
+			'codec': video_stream.get('codec_name'),
+			'has_audio': any(stream.get('codec_type') == 'audio' for stream in streams)
+		}
+		return video_metadata
+	return None
+
+
+def capture_video_metadata(video_path : str) -> Optional[VideoMetadata]:
+	if is_windows():
+		video_capture = cv2.VideoCapture(sanitize_path_for_windows(video_path))
+	else:
 		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-			video_capture.release()
-			return video_frame_total
+
+	if video_capture.isOpened():
+		video_codec = int(video_capture.get(cv2.CAP_PROP_FOURCC)).to_bytes(4, 'little').decode('latin-1').strip('\x00 ')
+		video_metadata : VideoMetadata =\
+		{
+			'fps': video_capture.get(cv2.CAP_PROP_FPS),
+			'resolution': (int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))),
+			'frame_total': int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+			'codec': video_codec or None,
+			'has_audio': None
+		}
+		video_capture.release()
+		return video_metadata
+	return None
+
+
+def parse_frame_rate(frame_rate : Optional[str]) -> Fps:
+	numerator, _, denominator = (frame_rate or '0').partition('/')
+	if float(denominator or 1) > 0:
+		return float(numerator) / float(denominator or 1)
+	return 0.0
+
+
+def count_video_frame_total(video_path : str) -> int:
+	video_metadata = get_video_metadata(video_path)
+	if video_metadata:
+		return video_metadata.get('frame_total')
 	return 0
 
 
 def detect_video_fps(video_path : str) -> Optional[float]:
-	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			video_fps = video_capture.get(cv2.CAP_PROP_FPS)
-			video_capture.release()
-			return video_fps
+	video_metadata = get_video_metadata(video_path)
+	if video_metadata:
+		return video_metadata.get('fps')
 	return None
 
 
@@ -118,15 +292,9 @@ def restrict_video_fps(video_path : str, fps : Fps) -> Fps:
 
 
 def detect_video_resolution(video_path : str) -> Optional[Resolution]:
-	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			width = video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)
-			height = video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
-			video_capture.release()
-			return int(width), int(height)
+	video_metadata = get_video_metadata(video_path)
+	if video_metadata:
+		return video_metadata.get('resolution')
 	return None
 
 
@@ -213,13 +381,15 @@ def create_tile_frames(vision_frame : VisionFrame, size : Size) -> Tuple[List[Vi
 	return tile_vision_frames, pad_width, pad_height
 
 
-def merge_tile_frames(tile_vision_frames : List[VisionFrame], temp_width : int, temp_height : int, pad_width : int, pad_height : int, size : Size) -> VisionFrame:
-	merge_vision_frame = numpy.zeros((pad_height, pad_width, 3)).astype(numpy.uint8)
+def merge_tile_frames(tile_vision_frames : List[VisionFrame], temp_width : int, temp_height : int, pad_width : int, pad_height : int, size : Size, merge_vision_frame : Optional[VisionFrame] = None) -> VisionFrame:
+	if merge_vision_frame is None:
+		merge_vision_frame = numpy.zeros((pad_height, pad_width, 3), dtype = numpy.uint8)
+	tile_height = tile_vision_frames[0].shape[0] - 2 * size[2]
 	tile_width = tile_vision_frames[0].shape[1] - 2 * size[2]
 	tiles_per_row = min(pad_width // tile_width, len(tile_vision_frames))
 
 	for index, tile_vision_frame in enumerate(tile_vision_frames):
-		tile_vision_frame = tile_vision_frame[size[2]:-size[2], size[2]:-size[2]]
+		tile_vision_frame = tile_vision_frame[size[2]:size[2] + tile_height, size[2]:size[2] + tile_width]
 		row_index = index // tiles_per_row
 		col_index = index % tiles_per_row
 		top = row_index * tile_vision_frame.shape[0]
@@ -229,3 +399,17 @@ def merge_tile_frames(tile_vision_frames : List[VisionFrame], temp_width : int,
 		merge_vision_frame[top:bottom, left:right, :] = tile_vision_frame
 	merge_vision_frame = merge_vision_frame[size[1] : size[1] + temp_height, size[1]: size[1] + temp_width, :]
 	return merge_vision_frame
+
+
+def paste_tile_frame(paste_vision_frame : VisionFrame, tile_vision_frame : VisionFrame, tile_index : int, tiles_per_row : int, size : Size) -> None:
+	tile_height = tile_vision_frame.shape[0] - 2 * size[2]
+	tile_width = tile_vision_frame.shape[1] - 2 * size[2]
+	top = tile_index // tiles_per_row * tile_height - size[1]
+	left = tile_index % tiles_per_row * tile_width - size[1]
+	paste_top = max(top, 0)
+	paste_bottom = min(top + tile_height, paste_vision_frame.shape[0])
+	paste_left = max(left, 0)
+	paste_right = min(left + tile_width, paste_vision_frame.shape[1])
+
+	if paste_bottom > paste_top and paste_right > paste_left:
+		paste_vision_frame[paste_top:paste_bottom, paste_left:paste_right] = tile_vision_frame[size[2] + paste_top - top:size[2] + paste_bottom - top, size[2] + paste_left - left:size[2] + paste_right - left]
@@ -2,13 +2,12 @@ from typing import Any, Tuple
 from time import sleep
 import scipy
 import numpy
-import onnxruntime
 
 import facefusion.globals
 from facefusion import process_manager
-from facefusion.thread_helper import thread_lock, thread_semaphore
+from facefusion.thread_helper import thread_lock, inference_semaphore
 from facefusion.typing import ModelSet, AudioChunk, Audio
-from facefusion.execution import apply_execution_provider_options
+from facefusion.inference_manager import get_inference_session, release_inference_session
 from facefusion.filesystem import resolve_relative_path, is_file
 from facefusion.download import conditional_download
 
@@ -31,13 +30,14 @@ def get_voice_extractor() -> Any:
 			sleep(0.5)
 		if VOICE_EXTRACTOR is None:
 			model_path = MODELS.get('voice_extractor').get('path')
-			VOICE_EXTRACTOR = onnxruntime.InferenceSession(model_path, providers = apply_execution_provider_options(facefusion.globals.execution_device_id, facefusion.globals.execution_providers))
+			VOICE_EXTRACTOR = get_inference_session(model_path)
 	return VOICE_EXTRACTOR
 
 
 def clear_voice_extractor() -> None:
 	global VOICE_EXTRACTOR
 
+	release_inference_session(VOICE_EXTRACTOR)
 	VOICE_EXTRACTOR = None
 
 
@@ -71,7 +71,7 @@ def extract_voice(temp_audio_chunk : AudioChunk) -> AudioChunk:
 	trim_size = 3840
 	temp_audio_chunk, pad_size = prepare_audio_chunk(temp_audio_chunk.T, chunk_size, trim_size)
 	temp_audio_chunk = decompose_audio_chunk(temp_audio_chunk, trim_size)
-	with thread_semaphore():
+	with inference_semaphore('voice_extractor'):
 		temp_audio_chunk = voice_extractor.run(None,
 		{
 			voice_extractor.get_inputs()[0].name: temp_audio_chunk
@@ -9,8 +9,18 @@ WORDING : Dict[str, Any] =\
 	'extracting_frames': 'Extracting frames with a resolution of {resolution} and {fps} frames per second',
 	'extracting_frames_succeed': 'Extracting frames succeed',
 	'extracting_frames_failed': 'Extracting frames failed',
+	'decoding_with_hwaccel': 'Decoding frames with the {hwaccel} hardware acceleration',
+	'decoding_with_software': 'Decoding frames with the software decoder',
+	'hwaccel_not_available': 'Hardware acceleration {hwaccel} is not available, falling back to the software decoder',
+	'streaming_frames': 'Streaming frames with a resolution of {resolution} and {fps} frames per second',
+	'streaming_frames_succeed': 'Streaming frames succeed',
+	'streaming_frames_failed': 'Streaming frames failed, falling back to temporary frames',
+	'streaming_chunk': 'Streaming chunk {chunk_index} of {chunk_total}',
+	'skipping_chunk': 'Skipping chunk {chunk_index} of {chunk_total} as it was processed before',
+	'resuming_chunks': 'Resuming from previously processed chunks',
 	'analysing': 'Analysing',
 	'processing': 'Processing',
+	'frame_worker_statistics': 'Frame worker {worker_index} processed {frame_total} frames with {steal_total} steals at {utilization}% utilization',
 	'downloading': 'Downloading',
 	'temp_frames_not_found': 'Temporary frames not found',
 	'copying_image': 'Copying image with a resolution of {resolution}',
@@ -20,6 +30,10 @@ WORDING : Dict[str, Any] =\
 	'finalizing_image_succeed': 'Finalizing image succeed',
 	'finalizing_image_skipped': 'Finalizing image skipped',
 	'merging_video': 'Merging video with a resolution of {resolution} and {fps} frames per second',
+	'encoding_with_encoder': 'Encoding video with the {encoder} encoder',
+	'encoder_not_available': 'Encoder {encoder} is not available, falling back to {fallback_encoder}',
+	'encoder_not_supported': 'Encoder {encoder} is not supported by your ffmpeg build',
+	'batch_size_not_supported': 'Model {model} has a fixed batch dimension, falling back to a batch size of 1',
 	'merging_video_succeed': 'Merging video succeed',
 	'merging_video_failed': 'Merging video failed',
 	'skipping_audio': 'Skipping audio',
@@ -67,11 +81,22 @@ WORDING : Dict[str, Any] =\
 		# execution
 		'execution_device_id': 'specify the device used for processing',
 		'execution_providers': 'accelerate the model inference using different providers (choices: {choices}, ...)',
+		'execution_backend': 'choose whether the frames are processed by threads or by worker processes',
 		'execution_thread_count': 'specify the amount of parallel threads while processing',
 		'execution_queue_count': 'specify the amount of frames each thread is processing',
+		'execution_concurrency': 'specify the amount of threads that can run each model at once (0 tunes the limit to the execution providers and video memory)',
+		'execution_intra_op_thread_count': 'specify the amount of threads each model uses within an operator (0 shares the cpu cores between the execution threads)',
+		'execution_inter_op_thread_count': 'specify the amount of threads each model uses across operators in parallel mode (0 lets the runtime decide)',
+		'execution_graph_optimization': 'choose the graph optimization level applied to the models',
+		'execution_mode': 'choose whether the operators of a model run sequential or in parallel',
+		'execution_cache_path': 'specify the directory to cache the optimized models',
 		# memory
 		'video_memory_strategy': 'balance fast frame processing and low VRAM usage',
 		'system_memory_limit': 'limit the available RAM that can be used while processing',
+		'face_store_memory_limit': 'limit the memory in MB that can be used to cache the detected faces and their frames',
+		'inference_memory_limit': 'limit the memory in MB that can be used to keep unused models loaded, estimated by their file size (0 keeps them all for tolerant and none for strict)',
+		'skip_memory_pattern': 'omit the memory pattern planning of the models',
+		'skip_memory_arena': 'omit the cpu memory arena of the models',
 		# face analyser
 		'face_analyser_order': 'specify the order in which the face analyser detects faces',
 		'face_analyser_age': 'filter the detected faces based on their age',
@@ -80,6 +105,8 @@ WORDING : Dict[str, Any] =\
 		'face_detector_size': 'specify the size of the frame provided to the face detector',
 		'face_detector_score': 'filter the detected faces base on the confidence score',
 		'face_landmarker_score': 'filter the detected landmarks base on the confidence score',
+		'face_tracker_interval': 'track the faces between full detections on every n-th video frame',
+		'face_cache_path': 'specify the directory to persist the face analysis of target videos across runs',
 		# face selector
 		'face_selector_mode': 'use reference based tracking or simple matching',
 		'reference_face_position': 'specify the position used to create the reference face',
@@ -93,7 +120,10 @@ WORDING : Dict[str, Any] =\
 		# frame extraction
 		'trim_frame_start': 'specify the the start frame of the target video',
 		'trim_frame_end': 'specify the the end frame of the target video',
+		'temp_frame_mode': 'specify whether the frames are processed as temporary resources or streamed in memory',
 		'temp_frame_format': 'specify the temporary resources format',
+		'temp_frame_hwaccel': 'specify the hardware acceleration used to decode the target video',
+		'temp_chunk_duration': 'specify the duration in seconds of the resumable chunks used to stream frames (0 streams the video at once)',
 		'keep_temp': 'keep the temporary resources after processing',
 		# output creation
 		'output_image_quality': 'specify the image quality which translates to the compression factor',
@@ -110,11 +140,17 @@ WORDING : Dict[str, Any] =\
 		'face_enhancer_model': 'choose the model responsible for enhancing the face',
 		'face_enhancer_blend': 'blend the enhanced into the previous face',
 		'face_swapper_model': 'choose the model responsible for swapping the face',
+		'face_swapper_batch_size': 'specify the amount of faces that are swapped within one inference',
+		'face_swapper_batch_timeout': 'specify the milliseconds to wait for faces to fill the batch',
 		'frame_colorizer_model': 'choose the model responsible for colorizing the frame',
 		'frame_colorizer_blend': 'blend the colorized into the previous frame',
 		'frame_colorizer_size': 'specify the size of the frame provided to the frame colorizer',
 		'frame_enhancer_model': 'choose the model responsible for enhancing the frame',
 		'frame_enhancer_blend': 'blend the enhanced into the previous frame',
+		'frame_enhancer_batch_size': 'specify the amount of tiles that are enhanced within one inference',
+		'frame_enhancer_tile_overlap': 'specify the overlap in pixels between tiles (defaults to the model overlap)',
+		'frame_enhancer_thread_count': 'specify the amount of parallel threads that enhance the tiles of one frame',
+		'frame_enhancer_memory_limit': 'limit the memory in MB that can be used for the tiles in flight of one frame',
 		'lip_syncer_model': 'choose the model responsible for syncing the lips',
 		# uis
 		'open_browser': 'open the browser once the program is ready',
@@ -196,6 +232,7 @@ WORDING : Dict[str, Any] =\
 		# target
 		'target_file': 'TARGET',
 		# temp frame
+		'temp_frame_mode_dropdown': 'TEMP FRAME MODE',
 		'temp_frame_format_dropdown': 'TEMP FRAME FORMAT',
 		# trim frame
 		'trim_frame_start_slider': 'TRIM FRAME START',
@@ -0,0 +1,52 @@
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+
+from facefusion.batch_manager import run_batch, pick_batch_requests, clear_batch_states
+from facefusion.typing import BatchRequest
+
+BATCH_SIZES : List[int] = []
+
+
+def process_batch(batch_inputs : List[int]) -> List[int]:
+	BATCH_SIZES.append(len(batch_inputs))
+	return [ batch_input * 2 for batch_input in batch_inputs ]
+
+
+def test_run_batch() -> None:
+	clear_batch_states()
+	BATCH_SIZES.clear()
+
+	assert run_batch('test', [ 1, 2, 3 ], process_batch, 4, 0) == [ 2, 4, 6 ]
+	assert BATCH_SIZES == [ 3 ]
+
+
+def test_run_batch_with_threads() -> None:
+	clear_batch_states()
+	BATCH_SIZES.clear()
+
+	with ThreadPoolExecutor(max_workers = 8) as executor:
+		futures = [ executor.submit(run_batch, 'test', [ index ], process_batch, 4, 0.1) for index in range(8) ]
+
+	assert [ future.result() for future in futures ] == [ [ index * 2 ] for index in range(8) ]
+	assert sum(BATCH_SIZES) == 8
+	assert max(BATCH_SIZES) <= 4
+	assert len(BATCH_SIZES) < 8
+
+
+def test_pick_batch_requests() -> None:
+	batch_requests : List[BatchRequest] =\
+	[
+		{
+			'inputs': [ 1, 2, 3 ],
+			'outputs': None,
+			'exception': None
+		},
+		{
+			'inputs': [ 4, 5 ],
+			'outputs': None,
+			'exception': None
+		}
+	]
+
+	assert len(pick_batch_requests(batch_requests, 4)) == 1
+	assert len(batch_requests) == 1
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+
+import facefusion.globals
+from facefusion.chunk_manager import create_chunk_manifest, create_video_chunk, load_chunk_manifest, save_chunk_manifest, is_video_chunk_done, can_resume_chunks
+from facefusion.filesystem import create_temp, get_temp_directory_path
+
+
+def test_chunk_manifest() -> None:
+	temp_directory_path = tempfile.mkdtemp()
+	target_path = os.path.join(temp_directory_path, 'target-chunk.mp4')
+	with open(target_path, 'wb') as target_file:
+		target_file.write(b'target')
+	facefusion.globals.trim_frame_start = None
+	facefusion.globals.trim_frame_end = None
+	facefusion.globals.execution_thread_count = 1
+	create_temp(target_path)
+
+	assert load_chunk_manifest(target_path) is None
+
+	chunk_manifest = create_chunk_manifest(target_path)
+	video_chunk = create_video_chunk(target_path, 0, 0, 50)
+	with open(video_chunk.get('chunk_path'), 'wb') as chunk_file:
+		chunk_file.write(b'chunk')
+	chunk_manifest.get('video_chunks').append(video_chunk)
+	save_chunk_manifest(target_path, chunk_manifest)
+
+	assert is_video_chunk_done(load_chunk_manifest(target_path), video_chunk) is True
+	assert is_video_chunk_done(load_chunk_manifest(target_path), create_video_chunk(target_path, 1, 50, 100)) is False
+
+	facefusion.globals.execution_thread_count = 4
+
+	assert load_chunk_manifest(target_path) is not None
+
+	facefusion.globals.trim_frame_start = 10
+
+	assert load_chunk_manifest(target_path) is None
+
+	facefusion.globals.trim_frame_start = None
+	shutil.rmtree(get_temp_directory_path(target_path))
+	shutil.rmtree(temp_directory_path)
+
+
+def test_can_resume_chunks() -> None:
+	temp_directory_path = tempfile.mkdtemp()
+	target_path = os.path.join(temp_directory_path, 'target-resume.mp4')
+	with open(target_path, 'wb') as target_file:
+		target_file.write(b'target')
+	facefusion.globals.trim_frame_start = None
+	facefusion.globals.trim_frame_end = None
+	facefusion.globals.temp_frame_mode = 'stream'
+	facefusion.globals.temp_chunk_duration = 10
+	create_temp(target_path)
+	chunk_manifest = create_chunk_manifest(target_path)
+	save_chunk_manifest(target_path, chunk_manifest)
+
+	assert can_resume_chunks(target_path) is False
+
+	chunk_manifest.get('video_chunks').append(create_video_chunk(target_path, 0, 0, 50))
+	save_chunk_manifest(target_path, chunk_manifest)
+
+	assert can_resume_chunks(target_path) is True
+
+	facefusion.globals.temp_chunk_duration = 0
+
+	assert can_resume_chunks(target_path) is False
+
+	facefusion.globals.temp_chunk_duration = 10
+	facefusion.globals.temp_frame_mode = 'file'
+
+	assert can_resume_chunks(target_path) is False
+
+	shutil.rmtree(get_temp_directory_path(target_path))
+	shutil.rmtree(temp_directory_path)
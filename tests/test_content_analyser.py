@@ -0,0 +1,59 @@
+from typing import Any
+import os
+import tempfile
+import numpy
+import onnx
+import pytest
+
+import facefusion.globals
+from facefusion import content_analyser, process_manager
+from facefusion.inference_manager import clear_inference_pool
+
+
+def create_analyser_model(batch_dimension : Any) -> str:
+	model_path = os.path.join(tempfile.mkdtemp(), 'analyser.onnx')
+	graph = onnx.helper.make_graph(
+	[
+		onnx.helper.make_node('Flatten', [ 'input' ], [ 'flatten' ]),
+		onnx.helper.make_node('Slice', [ 'flatten', 'starts', 'ends', 'axes' ], [ 'output' ])
+	], 'analyser',
+	[
+		onnx.helper.make_tensor_value_info('input', onnx.TensorProto.FLOAT, [ batch_dimension, 224, 224, 3 ])
+	],
+	[
+		onnx.helper.make_tensor_value_info('output', onnx.TensorProto.FLOAT, [ batch_dimension, 2 ])
+	],
+	[
+		onnx.helper.make_tensor('starts', onnx.TensorProto.INT64, [ 1 ], [ 0 ]),
+		onnx.helper.make_tensor('ends', onnx.TensorProto.INT64, [ 1 ], [ 2 ]),
+		onnx.helper.make_tensor('axes', onnx.TensorProto.INT64, [ 1 ], [ 1 ])
+	])
+	onnx.save(onnx.helper.make_model(graph, ir_version = 8, opset_imports = [ onnx.helper.make_opsetid('', 13) ]), model_path)
+	return model_path
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	facefusion.globals.execution_device_id = '0'
+	facefusion.globals.execution_providers = [ 'CPUExecutionProvider' ]
+	facefusion.globals.execution_concurrency = 0
+	process_manager.end()
+	content_analyser.clear_content_analyser()
+	content_analyser.detect_analyse_batch_size.cache_clear()
+	clear_inference_pool()
+
+
+def test_analyse_frames_with_batch(monkeypatch : pytest.MonkeyPatch) -> None:
+	monkeypatch.setitem(content_analyser.MODELS, 'open_nsfw', { 'url': '', 'path': create_analyser_model('batch') })
+	vision_frames = [ numpy.full((224, 224, 3), 117 + index % 2, numpy.uint8) for index in range(3) ]
+
+	assert content_analyser.analyse_frames(vision_frames) == [ False, True, False ]
+	assert content_analyser.detect_analyse_batch_size(content_analyser.MODELS.get('open_nsfw').get('path')) == content_analyser.ANALYSE_BATCH_SIZE
+
+
+def test_analyse_frames_with_static_batch(monkeypatch : pytest.MonkeyPatch) -> None:
+	monkeypatch.setitem(content_analyser.MODELS, 'open_nsfw', { 'url': '', 'path': create_analyser_model(1) })
+	vision_frames = [ numpy.full((224, 224, 3), 117 + index % 2, numpy.uint8) for index in range(3) ]
+
+	assert content_analyser.analyse_frames(vision_frames) == [ False, True, False ]
+	assert content_analyser.detect_analyse_batch_size(content_analyser.MODELS.get('open_nsfw').get('path')) == 1
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import numpy
+
+import facefusion.globals
+from facefusion.face_cache import load_face_cache, save_face_cache, get_cached_faces, set_cached_faces, clear_face_cache
+from facefusion.typing import Face
+
+
+def create_face() -> Face:
+	return Face(
+		bounding_box = numpy.array([ 10, 20, 110, 140 ]),
+		landmarks = { '5': numpy.ones((5, 2)), '5/68': numpy.ones((5, 2)), '68': numpy.ones((68, 2)), '68/5': numpy.ones((68, 2)) },
+		scores = { 'detector': 0.9, 'landmarker': 0.5 },
+		embedding = numpy.ones(512),
+		normed_embedding = numpy.ones(512),
+		gender = 1,
+		age = 30
+	)
+
+
+def test_face_cache() -> None:
+	temp_directory_path = tempfile.mkdtemp()
+	target_path = os.path.join(temp_directory_path, 'target.mp4')
+	with open(target_path, 'wb') as target_file:
+		target_file.write(b'target')
+	facefusion.globals.face_cache_path = os.path.join(temp_directory_path, 'face_cache')
+	facefusion.globals.trim_frame_start = None
+	facefusion.globals.trim_frame_end = None
+	facefusion.globals.face_detector_model = 'yoloface'
+	facefusion.globals.face_detector_size = '640x640'
+	facefusion.globals.face_detector_score = 0.5
+	facefusion.globals.face_landmarker_score = 0.5
+	facefusion.globals.face_tracker_interval = 1
+
+	load_face_cache(target_path, '640x360', 25.0)
+	set_cached_faces(0, [ create_face(), create_face() ])
+	set_cached_faces(1, [])
+
+	assert save_face_cache() is True
+
+	load_face_cache(target_path, '640x360', 25.0)
+
+	assert len(get_cached_faces(0)) == 2
+	assert get_cached_faces(0)[0].age == 30
+	assert numpy.array_equal(get_cached_faces(0)[0].bounding_box, [ 10, 20, 110, 140 ])
+	assert get_cached_faces(1) == []
+	assert get_cached_faces(2) is None
+
+	load_face_cache(target_path, '1280x720', 25.0)
+
+	assert get_cached_faces(0) is None
+	clear_face_cache()
+	shutil.rmtree(temp_directory_path)
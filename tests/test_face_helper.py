@@ -0,0 +1,42 @@
+import numpy
+
+from facefusion.face_helper import paste_back, calc_paste_bounding_box, apply_nms
+
+
+def test_paste_back() -> None:
+	temp_vision_frame = numpy.zeros((360, 640, 3), numpy.uint8)
+	crop_vision_frame = numpy.full((128, 128, 3), 255, numpy.uint8)
+	crop_mask = numpy.ones((128, 128), numpy.float32)
+	affine_matrix = numpy.array([ [ 1, 0, -100 ], [ 0, 1, -50 ] ], numpy.float32)
+	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+
+	assert numpy.all(paste_vision_frame[50:178, 100:228] == 255)
+	assert paste_vision_frame.sum() == 128 * 128 * 3 * 255
+	assert temp_vision_frame.sum() == 0
+
+	paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix, temp_vision_frame)
+
+	assert numpy.array_equal(temp_vision_frame, paste_vision_frame)
+
+
+def test_calc_paste_bounding_box() -> None:
+	inverse_matrix = numpy.array([ [ 1, 0, 100 ], [ 0, 1, 50 ] ], numpy.float32)
+
+	assert calc_paste_bounding_box((128, 128), inverse_matrix, (640, 360)) == (99, 49, 229, 179)
+	assert calc_paste_bounding_box((128, 128), inverse_matrix, (150, 100)) == (99, 49, 150, 100)
+	assert calc_paste_bounding_box((128, 128), inverse_matrix, (50, 40)) is None
+
+
+def test_apply_nms() -> None:
+	bounding_boxes = numpy.array(
+	[
+		[ 0, 0, 100, 100 ],
+		[ 10, 10, 110, 110 ],
+		[ 200, 200, 250, 250 ],
+		[ 5, 5, 95, 95 ]
+	], numpy.float32)
+	scores = numpy.array([ 0.6, 0.9, 0.7, 0.8 ], numpy.float32)
+
+	assert apply_nms(bounding_boxes, scores, 0.4).tolist() == [ 1, 2 ]
+	assert apply_nms(bounding_boxes, scores, 0.9).tolist() == [ 1, 3, 2, 0 ]
+	assert apply_nms(numpy.empty((0, 4)), numpy.empty(0), 0.4).size == 0
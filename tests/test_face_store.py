@@ -0,0 +1,84 @@
+import numpy
+
+import facefusion.globals
+from facefusion.face_store import get_static_faces, set_static_faces, clear_static_faces, get_static_faces_metrics, create_frame_hash
+from facefusion.typing import Face
+
+
+def create_face() -> Face:
+	return Face(
+		bounding_box = numpy.zeros(49152),
+		landmarks = { '5': numpy.zeros((5, 2)) },
+		scores = { 'detector': 0.9, 'landmarker': 0.9 },
+		embedding = None,
+		normed_embedding = None,
+		gender = None,
+		age = None
+	)
+
+
+def test_static_faces() -> None:
+	facefusion.globals.face_store_memory_limit = 1
+	clear_static_faces()
+	vision_frames = [ numpy.full((64, 64, 3), index + 1, numpy.uint8) for index in range(3) ]
+
+	for vision_frame in vision_frames:
+		set_static_faces(vision_frame, [ create_face() ])
+
+	assert get_static_faces(vision_frames[0]) is None
+	assert get_static_faces(vision_frames[1]) is not None
+	assert get_static_faces(vision_frames[2]) is not None
+	assert get_static_faces_metrics().get('hits') == 2
+	assert get_static_faces_metrics().get('misses') == 1
+	assert get_static_faces_metrics().get('evictions') == 1
+
+	set_static_faces(vision_frames[0], [ create_face() ])
+
+	assert get_static_faces(vision_frames[1]) is None
+	assert get_static_faces(vision_frames[2]) is not None
+	clear_static_faces()
+
+
+def test_create_frame_hash() -> None:
+	vision_frame = numpy.full((64, 64, 3), 1, numpy.uint8)
+
+	assert create_frame_hash(vision_frame) == create_frame_hash(vision_frame.copy())
+	assert create_frame_hash(vision_frame) != create_frame_hash(numpy.full((64, 64, 3), 2, numpy.uint8))
+	assert create_frame_hash(vision_frame) != create_frame_hash(numpy.full((64, 64, 1), 1, numpy.uint8))
+	assert create_frame_hash(numpy.zeros((64, 64, 3), numpy.uint8)) is None
+
+	other_vision_frame = vision_frame.copy()
+	other_vision_frame[1, 1] = 2
+
+	assert create_frame_hash(vision_frame) == create_frame_hash(other_vision_frame)
+
+
+def test_static_faces_collision() -> None:
+	facefusion.globals.face_store_memory_limit = 0
+	clear_static_faces()
+	vision_frame = numpy.full((64, 64, 3), 1, numpy.uint8)
+	other_vision_frame = vision_frame.copy()
+	other_vision_frame[1, 1] = 2
+	set_static_faces(vision_frame, [ create_face() ])
+
+	assert get_static_faces(other_vision_frame) is None
+	assert get_static_faces(vision_frame) is not None
+	clear_static_faces()
+
+
+def test_static_faces_memory() -> None:
+	facefusion.globals.face_store_memory_limit = 0
+	clear_static_faces()
+	vision_frame = numpy.full((64, 64, 3), 1, numpy.uint8)
+	set_static_faces(vision_frame, [ create_face() ])
+	static_faces_memory = get_static_faces_metrics().get('memory')
+	faces = get_static_faces(vision_frame)
+	faces[0] = faces[0]._replace(embedding = numpy.zeros(512), normed_embedding = numpy.zeros(512))
+
+	assert get_static_faces_metrics().get('memory') == static_faces_memory
+	assert get_static_faces(vision_frame)[0].embedding is None
+
+	set_static_faces(vision_frame, faces)
+
+	assert get_static_faces_metrics().get('memory') == static_faces_memory + 8192
+	clear_static_faces()
@@ -0,0 +1,133 @@
+from typing import Any, List
+import os
+import tempfile
+import numpy
+import onnx
+import pytest
+
+import facefusion.globals
+from facefusion import process_manager
+from facefusion.batch_manager import clear_batch_states
+from facefusion.inference_manager import clear_inference_pool
+from facefusion.processors.frame import globals as frame_processors_globals
+from facefusion.processors.frame.modules import face_swapper
+from facefusion.typing import Face
+
+
+def create_swap_model(batch_dimension : Any) -> str:
+	model_path = os.path.join(tempfile.mkdtemp(), 'swap.onnx')
+	graph = onnx.helper.make_graph([ onnx.helper.make_node('Identity', [ 'target' ], [ 'output' ]) ], 'swap',
+	[
+		onnx.helper.make_tensor_value_info('source', onnx.TensorProto.FLOAT, [ batch_dimension, 512 ]),
+		onnx.helper.make_tensor_value_info('target', onnx.TensorProto.FLOAT, [ batch_dimension, 3, 128, 128 ])
+	],
+	[
+		onnx.helper.make_tensor_value_info('output', onnx.TensorProto.FLOAT, [ batch_dimension, 3, 128, 128 ])
+	])
+	onnx.save(onnx.helper.make_model(graph, ir_version = 8, opset_imports = [ onnx.helper.make_opsetid('', 13) ]), model_path)
+	return model_path
+
+
+def create_target_face(offset : int) -> Face:
+	face_landmark_5 = numpy.array([ [ 40, 50 ], [ 88, 50 ], [ 64, 76 ], [ 44, 100 ], [ 84, 100 ] ], numpy.float32) + offset
+	return Face(
+		bounding_box = numpy.array([ 24, 24, 104, 120 ]) + offset,
+		landmarks = { '5/68': face_landmark_5 },
+		scores = {},
+		embedding = None,
+		normed_embedding = None,
+		gender = None,
+		age = None
+	)
+
+
+def create_source_face() -> Face:
+	return Face(
+		bounding_box = numpy.zeros(4),
+		landmarks = {},
+		scores = {},
+		embedding = numpy.ones(512, dtype = numpy.float32),
+		normed_embedding = numpy.ones(512, dtype = numpy.float32),
+		gender = None,
+		age = None
+	)
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	facefusion.globals.execution_device_id = '0'
+	facefusion.globals.execution_providers = [ 'CPUExecutionProvider' ]
+	facefusion.globals.execution_concurrency = 0
+	frame_processors_globals.face_swapper_model = 'simswap_256'
+	frame_processors_globals.face_swapper_batch_size = 4
+	frame_processors_globals.face_swapper_batch_timeout = 0
+	facefusion.globals.face_mask_types = [ 'box' ]
+	facefusion.globals.face_mask_blur = 0.3
+	facefusion.globals.face_mask_padding = (0, 0, 0, 0)
+	process_manager.end()
+	face_swapper.get_options('model')
+	face_swapper.clear_frame_processor()
+	face_swapper.detect_batch_size.cache_clear()
+	clear_inference_pool()
+	clear_batch_states()
+
+
+def test_apply_swap_with_batch(monkeypatch : pytest.MonkeyPatch) -> None:
+	batch_sizes : List[int] = []
+	run_batch = face_swapper.run_batch
+
+	def record_batch(*args : Any) -> Any:
+		batch_sizes.append(len(args[1]))
+		return run_batch(*args)
+
+	monkeypatch.setattr(face_swapper, 'run_batch', record_batch)
+	face_swapper.set_options('model', { 'type': 'simswap', 'path': create_swap_model('batch') })
+	crop_vision_frames = [ numpy.full((1, 3, 128, 128), index, dtype = numpy.float32) for index in range(3) ]
+	output_vision_frames = face_swapper.apply_swap(create_source_face(), crop_vision_frames)
+
+	assert face_swapper.resolve_batch_size() == 4
+	assert batch_sizes == [ 3 ]
+	assert [ output_vision_frame[0, 0, 0] for output_vision_frame in output_vision_frames ] == [ 0, 1, 2 ]
+
+
+def test_apply_swap_with_static_batch() -> None:
+	face_swapper.set_options('model', { 'type': 'simswap', 'path': create_swap_model(1) })
+	crop_vision_frames = [ numpy.full((1, 3, 128, 128), index, dtype = numpy.float32) for index in range(3) ]
+	output_vision_frames = face_swapper.apply_swap(create_source_face(), crop_vision_frames)
+
+	assert face_swapper.resolve_batch_size() == 1
+	assert [ output_vision_frame[0, 0, 0] for output_vision_frame in output_vision_frames ] == [ 0, 1, 2 ]
+
+
+def test_apply_swap_with_two_faces() -> None:
+	for batch_dimension in [ 'batch', 1 ]:
+		face_swapper.set_options('model', { 'type': 'simswap', 'path': create_swap_model(batch_dimension) })
+		face_swapper.clear_frame_processor()
+		face_swapper.detect_batch_size.cache_clear()
+		output_vision_frames = face_swapper.apply_swap(create_source_face(), [ numpy.full((1, 3, 128, 128), index, dtype = numpy.float32) for index in [ 1, 2 ] ])
+		face_swapper.apply_swap(create_source_face(), [ numpy.full((1, 3, 128, 128), index, dtype = numpy.float32) for index in [ 3, 4 ] ])
+
+		assert [ output_vision_frame[0, 0, 0] for output_vision_frame in output_vision_frames ] == [ 1, 2 ]
+
+
+def test_swap_faces() -> None:
+	face_swapper.set_options('model',
+	{
+		'type': 'simswap',
+		'path': create_swap_model('batch'),
+		'template': 'arcface_128_v2',
+		'size': (128, 128),
+		'mean': [ 0.485, 0.456, 0.406 ],
+		'standard_deviation': [ 0.229, 0.224, 0.225 ]
+	})
+	temp_vision_frame = numpy.random.default_rng(0).integers(0, 255, (512, 512, 3), dtype = numpy.uint8)
+
+	for target_faces in [ [ create_target_face(0), create_target_face(300) ], [ create_target_face(0), create_target_face(40) ] ]:
+		sequential_vision_frame = temp_vision_frame
+		for target_face in target_faces:
+			sequential_vision_frame = face_swapper.swap_face(create_source_face(), target_face, sequential_vision_frame)
+
+		assert numpy.array_equal(face_swapper.swap_faces(create_source_face(), target_faces, temp_vision_frame), sequential_vision_frame)
+
+	assert len(face_swapper.create_target_face_groups([ create_target_face(0), create_target_face(300) ], (512, 512))) == 1
+	assert len(face_swapper.create_target_face_groups([ create_target_face(0), create_target_face(40) ], (512, 512))) == 2
@@ -0,0 +1,87 @@
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy
+import pytest
+
+import facefusion.globals
+from facefusion import face_tracker
+from facefusion.face_store import clear_static_faces
+from facefusion.face_tracker import track_faces, propagate_faces, detect_scene_cut, clear_face_tracker
+from facefusion.typing import Face, FaceAnalyserAttribute, VisionFrame
+
+
+def create_vision_frame() -> VisionFrame:
+	random_generator = numpy.random.default_rng(0)
+	return cv2.GaussianBlur((random_generator.random((360, 640)) * 255).astype(numpy.uint8), (7, 7), 0)
+
+
+def create_face() -> Face:
+	face_landmark_5 = numpy.array([ [ 200, 150 ], [ 260, 150 ], [ 230, 180 ], [ 205, 210 ], [ 255, 210 ] ], numpy.float32)
+	face_landmark_68 = numpy.repeat(face_landmark_5, 14, axis = 0)[:68]
+	return Face(
+		bounding_box = numpy.array([ 180, 120, 280, 240 ]),
+		landmarks = { '5': face_landmark_5, '5/68': face_landmark_5, '68': face_landmark_68, '68/5': face_landmark_68 },
+		scores = { 'detector': 0.9, 'landmarker': 0.9 },
+		embedding = None,
+		normed_embedding = None,
+		gender = None,
+		age = None
+	)
+
+
+def test_track_faces(monkeypatch : pytest.MonkeyPatch) -> None:
+	detect_vision_frames : List[VisionFrame] = []
+	analyse_faces_attributes : List[List[FaceAnalyserAttribute]] = []
+
+	def create_faces(vision_frames : List[VisionFrame]) -> List[List[Face]]:
+		detect_vision_frames.extend(vision_frames)
+		return [ [ create_face() ] for _ in vision_frames ]
+
+	def analyse_faces(vision_frame : VisionFrame, faces : List[Face], face_analyser_attributes : List[FaceAnalyserAttribute]) -> List[Face]:
+		analyse_faces_attributes.append(face_analyser_attributes)
+		return [ face._replace(embedding = numpy.ones(512), normed_embedding = numpy.ones(512)) for face in faces ]
+
+	monkeypatch.setattr(face_tracker, 'batch_create_faces', create_faces)
+	monkeypatch.setattr(face_tracker, 'analyse_faces', analyse_faces)
+	facefusion.globals.target_path = 'target.mp4'
+	facefusion.globals.face_tracker_interval = 4
+	facefusion.globals.face_selector_mode = 'reference'
+	facefusion.globals.face_analyser_age = None
+	facefusion.globals.face_analyser_gender = None
+	facefusion.globals.face_store_memory_limit = 0
+	clear_static_faces()
+	clear_face_tracker()
+	vision_frame = cv2.cvtColor(create_vision_frame(), cv2.COLOR_GRAY2BGR)
+	vision_frames = [ numpy.roll(vision_frame, (index, index), axis = (0, 1)) for index in range(3) ]
+	key_faces = track_faces(0, vision_frames[0])
+
+	with ThreadPoolExecutor(max_workers = 1) as executor:
+		track_faces_1 = executor.submit(track_faces, 1, vision_frames[1]).result()
+	track_faces_2 = track_faces(2, vision_frames[2])
+
+	assert len(detect_vision_frames) == 1
+	assert analyse_faces_attributes == [ [ 'embedding' ] ]
+	assert track_faces_1[0].embedding is key_faces[0].embedding
+	assert track_faces_2[0].embedding is key_faces[0].embedding
+	clear_static_faces()
+	clear_face_tracker()
+
+
+def test_propagate_faces() -> None:
+	vision_frame = create_vision_frame()
+	shift_vision_frame = numpy.roll(vision_frame, (3, 5), axis = (0, 1))
+	face = create_face()._replace(embedding = numpy.ones(512), normed_embedding = numpy.ones(512))
+	face_landmark_5 = face.landmarks.get('5')
+	propagate_face = propagate_faces(vision_frame, shift_vision_frame, [ face ])[0]
+
+	assert numpy.allclose(propagate_face.bounding_box, [ 185, 123, 285, 243 ], atol = 0.5)
+	assert numpy.allclose(propagate_face.landmarks.get('5'), face_landmark_5 + [ 5, 3 ], atol = 0.5)
+	assert propagate_face.embedding is face.embedding
+
+
+def test_detect_scene_cut() -> None:
+	vision_frame = create_vision_frame()
+
+	assert detect_scene_cut(vision_frame, numpy.roll(vision_frame, 5, axis = 1)) is False
+	assert detect_scene_cut(vision_frame, numpy.zeros_like(vision_frame)) is True
@@ -3,10 +3,10 @@ import subprocess
 import pytest
 
 import facefusion.globals
-from facefusion import process_manager
+from facefusion import ffmpeg, process_manager
 from facefusion.filesystem import get_temp_directory_path, create_temp, clear_temp
 from facefusion.download import conditional_download
-from facefusion.ffmpeg import extract_frames, read_audio_buffer
+from facefusion.ffmpeg import extract_frames, read_audio_buffer, get_available_encoders, resolve_temp_frame_hwaccel, resolve_output_video_encoder
 
 
 @pytest.fixture(scope = 'module', autouse = True)
@@ -29,6 +29,8 @@ def before_each() -> None:
 	facefusion.globals.trim_frame_start = None
 	facefusion.globals.trim_frame_end = None
 	facefusion.globals.temp_frame_format = 'jpg'
+	facefusion.globals.temp_frame_hwaccel = 'auto'
+	facefusion.globals.execution_providers = [ 'CPUExecutionProvider' ]
 
 
 def test_extract_frames() -> None:
@@ -111,3 +113,29 @@ def test_read_audio_buffer() -> None:
 	assert isinstance(read_audio_buffer('.assets/examples/source.mp3', 1, 1), bytes)
 	assert isinstance(read_audio_buffer('.assets/examples/source.wav', 1, 1), bytes)
 	assert read_audio_buffer('.assets/examples/invalid.mp3', 1, 1) is None
+
+
+def test_resolve_temp_frame_hwaccel() -> None:
+	assert resolve_temp_frame_hwaccel() is None
+
+	facefusion.globals.temp_frame_hwaccel = 'none'
+
+	assert resolve_temp_frame_hwaccel() is None
+
+
+def test_resolve_output_video_encoder() -> None:
+	facefusion.globals.output_video_encoder = 'libx264'
+
+	assert 'libx264' in get_available_encoders()
+	assert resolve_output_video_encoder() == 'libx264'
+
+
+def test_resolve_output_video_encoder_fallback(monkeypatch : pytest.MonkeyPatch) -> None:
+	monkeypatch.setattr(ffmpeg, 'get_available_encoders', lambda: [ 'libx264', 'libx265' ])
+	facefusion.globals.output_video_encoder = 'hevc_nvenc'
+
+	assert resolve_output_video_encoder() == 'libx265'
+
+	facefusion.globals.output_video_encoder = 'libvpx-vp9'
+
+	assert resolve_output_video_encoder() is None
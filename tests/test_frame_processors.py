@@ -0,0 +1,26 @@
+from facefusion.processors.frame.core import create_queue_payload_deques, pick_queue_payloads, create_queue_payloads
+
+
+def test_create_queue_payload_deques() -> None:
+	queue_payloads = create_queue_payloads([ str(index) + '.jpg' for index in range(10) ])
+	queue_payload_deques = create_queue_payload_deques(queue_payloads, 4)
+
+	assert [ len(queue_payload_deque) for queue_payload_deque in queue_payload_deques ] == [ 3, 3, 3, 1 ]
+	assert len(create_queue_payload_deques([], 4)) == 1
+
+
+def test_pick_queue_payloads() -> None:
+	queue_payloads = create_queue_payloads([ str(index) + '.jpg' for index in range(8) ])
+	queue_payload_deques = create_queue_payload_deques(queue_payloads, 2)
+
+	queue_payloads, is_stolen = pick_queue_payloads(1, queue_payload_deques, 2)
+
+	assert [ queue_payload.get('frame_number') for queue_payload in queue_payloads ] == [ 4, 5 ]
+	assert is_stolen is False
+
+	queue_payload_deques[0].clear()
+	queue_payloads, is_stolen = pick_queue_payloads(0, queue_payload_deques, 2)
+
+	assert [ queue_payload.get('frame_number') for queue_payload in queue_payloads ] == [ 7 ]
+	assert is_stolen is True
+	assert len(queue_payload_deques[1]) == 1
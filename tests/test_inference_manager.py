@@ -0,0 +1,181 @@
+from typing import Any, List, Optional, Sequence, Union
+from concurrent.futures import ThreadPoolExecutor
+import tempfile
+import threading
+import os
+import numpy
+import onnx
+import onnxruntime
+import pytest
+
+import facefusion.globals
+from facefusion import inference_manager
+from facefusion.inference_manager import get_inference_session, release_inference_session, get_inference_metrics, clear_inference_pool, create_session_options, create_model_cache_path, run_inference
+
+
+def create_identity_model(model_path : str, model_shape : Sequence[Optional[Union[int, str]]]) -> None:
+	graph = onnx.helper.make_graph([ onnx.helper.make_node('Identity', [ 'input' ], [ 'output' ]) ], 'identity',
+	[
+		onnx.helper.make_tensor_value_info('input', onnx.TensorProto.FLOAT, model_shape)
+	],
+	[
+		onnx.helper.make_tensor_value_info('output', onnx.TensorProto.FLOAT, model_shape)
+	])
+	onnx.save(onnx.helper.make_model(graph, ir_version = 8, opset_imports = [ onnx.helper.make_opsetid('', 13) ]), model_path)
+
+
+@pytest.fixture(scope = 'module')
+def model_paths() -> List[str]:
+	temp_directory_path = tempfile.mkdtemp()
+	model_paths = [ os.path.join(temp_directory_path, 'identity_' + str(index) + '.onnx') for index in range(3) ]
+
+	create_identity_model(model_paths[0], [ 1 ])
+	create_identity_model(model_paths[1], [ 1 ])
+	create_identity_model(model_paths[2], [ 'batch' ])
+	return model_paths
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	facefusion.globals.execution_device_id = '0'
+	facefusion.globals.execution_providers = [ 'CPUExecutionProvider' ]
+	facefusion.globals.video_memory_strategy = 'tolerant'
+	facefusion.globals.inference_memory_limit = 0
+	facefusion.globals.execution_thread_count = 1
+	facefusion.globals.execution_intra_op_thread_count = 0
+	facefusion.globals.execution_inter_op_thread_count = 0
+	facefusion.globals.execution_graph_optimization = 'all'
+	facefusion.globals.execution_mode = 'sequential'
+	facefusion.globals.execution_cache_path = None
+	facefusion.globals.skip_memory_pattern = False
+	facefusion.globals.skip_memory_arena = False
+	clear_inference_pool()
+
+
+def test_get_inference_session(model_paths : List[str]) -> None:
+	inference_session = get_inference_session(model_paths[0])
+
+	assert get_inference_session(model_paths[0]) is inference_session
+	assert get_inference_metrics().get('loads') == 1
+	assert get_inference_metrics().get('hits') == 1
+
+
+def test_get_inference_session_concurrent(model_paths : List[str], monkeypatch : pytest.MonkeyPatch) -> None:
+	create_inference_session = inference_manager.create_inference_session
+	load_event = threading.Event()
+	other_load_event = threading.Event()
+
+	def create_blocking_inference_session(model_path : str) -> Any:
+		if model_path == model_paths[0]:
+			load_event.set()
+			assert other_load_event.wait(timeout = 5)
+		else:
+			other_load_event.set()
+		return create_inference_session(model_path)
+
+	monkeypatch.setattr(inference_manager, 'create_inference_session', create_blocking_inference_session)
+
+	with ThreadPoolExecutor(max_workers = 3) as executor:
+		inference_future = executor.submit(get_inference_session, model_paths[0])
+		load_event.wait(timeout = 5)
+		other_inference_future = executor.submit(get_inference_session, model_paths[0])
+		executor.submit(get_inference_session, model_paths[1]).result()
+
+		assert inference_future.result() is other_inference_future.result()
+	assert get_inference_metrics().get('loads') == 2
+	assert get_inference_metrics().get('hits') == 1
+
+
+def test_release_inference_session(model_paths : List[str]) -> None:
+	inference_session = get_inference_session(model_paths[0])
+	release_inference_session(inference_session)
+
+	assert get_inference_session(model_paths[0]) is inference_session
+	assert get_inference_metrics().get('loads') == 1
+
+	facefusion.globals.video_memory_strategy = 'strict'
+	release_inference_session(inference_session)
+
+	assert get_inference_metrics().get('evictions') == 1
+	assert get_inference_session(model_paths[0]) is not inference_session
+
+
+def test_evict_inference_sessions(model_paths : List[str]) -> None:
+	facefusion.globals.inference_memory_limit = 1
+	first_inference_session = get_inference_session(model_paths[0])
+	second_inference_session = get_inference_session(model_paths[1])
+	release_inference_session(first_inference_session)
+	release_inference_session(second_inference_session)
+
+	assert get_inference_metrics().get('evictions') == 0
+
+	facefusion.globals.inference_memory_limit = 0
+	facefusion.globals.video_memory_strategy = 'strict'
+	get_inference_session(model_paths[0])
+
+	assert get_inference_metrics().get('evictions') == 1
+	assert len(inference_manager.INFERENCE_POOL) == 1
+
+
+def test_evict_inference_sessions_strict(model_paths : List[str]) -> None:
+	facefusion.globals.video_memory_strategy = 'strict'
+	facefusion.globals.inference_memory_limit = 1
+	inference_session = get_inference_session(model_paths[0])
+	release_inference_session(inference_session)
+
+	assert get_inference_session(model_paths[0]) is inference_session
+	assert get_inference_metrics().get('evictions') == 0
+
+	release_inference_session(inference_session)
+	facefusion.globals.inference_memory_limit = 0
+	get_inference_session(model_paths[1])
+
+	assert get_inference_metrics().get('evictions') == 1
+	assert len(inference_manager.INFERENCE_POOL) == 1
+
+
+def test_create_session_options() -> None:
+	facefusion.globals.execution_intra_op_thread_count = 2
+	facefusion.globals.execution_graph_optimization = 'basic'
+	facefusion.globals.execution_mode = 'parallel'
+	facefusion.globals.skip_memory_arena = True
+	session_options = create_session_options(False)
+
+	assert session_options.intra_op_num_threads == 2
+	assert session_options.graph_optimization_level == onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC
+	assert session_options.execution_mode == onnxruntime.ExecutionMode.ORT_PARALLEL
+	assert session_options.enable_mem_pattern is True
+	assert session_options.enable_cpu_mem_arena is False
+	assert create_session_options(True).graph_optimization_level == onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+
+
+def test_create_model_cache_path(model_paths : List[str]) -> None:
+	assert create_model_cache_path(model_paths[0]) is None
+
+	facefusion.globals.execution_cache_path = tempfile.mkdtemp()
+	model_cache_path = create_model_cache_path(model_paths[0])
+	get_inference_session(model_paths[0])
+
+	assert os.path.isfile(model_cache_path)
+
+	clear_inference_pool()
+	inference_session = get_inference_session(model_paths[0])
+
+	assert inference_session.run(None, { 'input': numpy.array([ 1 ], dtype = numpy.float32) })[0][0] == 1
+
+
+def test_run_inference(model_paths : List[str]) -> None:
+	inference_session = get_inference_session(model_paths[0])
+	inference_output = run_inference(inference_session, { 'input': numpy.array([ 1 ], dtype = numpy.float32) })[0]
+
+	assert inference_output[0] == 1
+	assert run_inference(inference_session, { 'input': numpy.array([ 2 ], dtype = numpy.float32) })[0] is inference_output
+	assert inference_output[0] == 2
+
+	with ThreadPoolExecutor(max_workers = 1) as executor:
+		assert executor.submit(run_inference, inference_session, { 'input': numpy.array([ 3 ], dtype = numpy.float32) }).result()[0] is not inference_output
+
+	inference_session = get_inference_session(model_paths[2])
+
+	assert run_inference(inference_session, { 'input': numpy.array([ 1, 2 ], dtype = numpy.float32) })[0].tolist() == [ 1, 2 ]
+	assert run_inference(inference_session, { 'input': numpy.array([ 3, 4, 5 ], dtype = numpy.float32) })[0].tolist() == [ 3, 4, 5 ]
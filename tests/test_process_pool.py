@@ -0,0 +1,38 @@
+from multiprocessing.shared_memory import SharedMemory
+from time import sleep
+import numpy
+
+import facefusion.globals
+from facefusion import process_manager
+from facefusion.process_pool import create_process_pool, create_shared_frames, read_shared_frames, release_shared_memory
+
+
+def test_shared_frames() -> None:
+	vision_frames = [ numpy.full((48, 64, 3), index, numpy.uint8) for index in range(3) ]
+	shared_memory = create_shared_frames(vision_frames)
+	attach_shared_memory = SharedMemory(name = shared_memory.name)
+	shared_vision_frames = read_shared_frames(attach_shared_memory, (48, 64, 3), 3)
+	attach_shared_memory.close()
+	release_shared_memory(shared_memory)
+
+	assert len(shared_vision_frames) == 3
+	assert all(numpy.array_equal(shared_vision_frame, vision_frame) for shared_vision_frame, vision_frame in zip(shared_vision_frames, vision_frames))
+
+
+def wait_process_stop() -> bool:
+	while process_manager.is_processing():
+		sleep(0.1)
+	return process_manager.is_stopping()
+
+
+def test_process_pool_stop() -> None:
+	facefusion.globals.execution_thread_count = 1
+	facefusion.globals.source_paths = []
+	process_manager.start()
+
+	with create_process_pool() as executor:
+		future = executor.submit(wait_process_stop)
+		process_manager.stop()
+
+		assert future.result(timeout = 60) is True
+	process_manager.end()
@@ -0,0 +1,59 @@
+import timeit
+import tracemalloc
+import numpy
+
+from facefusion.tensor_helper import prepare_vision_frames, normalize_vision_tensor
+
+
+def test_prepare_vision_frames() -> None:
+	vision_frame = numpy.random.randint(0, 256, (64, 48, 3), dtype = numpy.uint8)
+	vision_tensor = prepare_vision_frames(vision_frame, [ 0.5, 0.4, 0.3 ], [ 0.2, 0.3, 0.4 ], True)
+	reference_tensor = ((vision_frame[:, :, ::-1] / 255.0 - [ 0.5, 0.4, 0.3 ]) / [ 0.2, 0.3, 0.4 ]).transpose(2, 0, 1)[numpy.newaxis]
+
+	assert vision_tensor.dtype == numpy.float32
+	assert vision_tensor.shape == (1, 3, 64, 48)
+	assert numpy.allclose(vision_tensor, reference_tensor, atol = 1e-5)
+
+
+def test_prepare_vision_frames_into_tensor() -> None:
+	vision_frames = numpy.random.randint(0, 256, (2, 32, 32, 3), dtype = numpy.uint8)
+	vision_tensor = numpy.zeros((2, 6, 32, 32), dtype = numpy.float32)
+	prepare_vision_frames(vision_frames, [ 0.5, 0.5, 0.5 ], [ 128 / 255, 128 / 255, 128 / 255 ], False, vision_tensor[:, 3:])
+
+	assert numpy.allclose(vision_tensor[:, 3:], (vision_frames.transpose(0, 3, 1, 2) - 127.5) / 128.0, atol = 1e-5)
+	assert not numpy.any(vision_tensor[:, :3])
+
+
+def test_normalize_vision_tensor() -> None:
+	vision_tensor = numpy.random.uniform(-1.2, 1.2, (3, 32, 32)).astype(numpy.float32)
+	vision_frame = normalize_vision_tensor(vision_tensor, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], True)
+	reference_frame = ((numpy.clip(vision_tensor, -1, 1) + 1) / 2 * 255.0).round().astype(numpy.uint8).transpose(1, 2, 0)[:, :, ::-1]
+
+	assert vision_frame.dtype == numpy.uint8
+	assert numpy.array_equal(vision_frame, reference_frame)
+
+
+def test_prepare_vision_frames_memory() -> None:
+	vision_frame = numpy.random.randint(0, 256, (512, 512, 3), dtype = numpy.uint8)
+
+	tracemalloc.start()
+	reference_tensor = ((vision_frame[:, :, ::-1] / 255.0 - 0.5) / 0.5).transpose(2, 0, 1)
+	reference_tensor = numpy.expand_dims(reference_tensor, axis = 0).astype(numpy.float32)
+	_, reference_peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	tracemalloc.start()
+	vision_tensor = prepare_vision_frames(vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], True)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	assert peak <= vision_tensor.nbytes * 1.1
+	assert peak * 2 < reference_peak
+
+
+def test_prepare_vision_frames_benchmark() -> None:
+	vision_frames = numpy.random.randint(0, 256, (4, 512, 512, 3), dtype = numpy.uint8)
+	reference_duration = min(timeit.repeat(lambda: ((vision_frames[:, :, :, ::-1] / 255.0 - 0.5) / 0.5).transpose(0, 3, 1, 2).astype(numpy.float32), number = 3, repeat = 3))
+	duration = min(timeit.repeat(lambda: prepare_vision_frames(vision_frames, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], True), number = 3, repeat = 3))
+
+	assert duration < reference_duration
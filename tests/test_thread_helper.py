@@ -0,0 +1,71 @@
+import os
+import threading
+from queue import Queue
+import numpy
+import pytest
+
+import facefusion.globals
+from facefusion.thread_helper import inference_semaphore, resolve_inference_concurrency, put_stream_queue, iterate_stream_queue, NULL_CONTEXT
+from facefusion.typing import StreamQueue
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	facefusion.globals.execution_device_id = '0'
+	facefusion.globals.execution_providers = [ 'CPUExecutionProvider' ]
+	facefusion.globals.execution_thread_count = 4
+	facefusion.globals.execution_intra_op_thread_count = 0
+	facefusion.globals.execution_concurrency = 0
+
+
+def test_resolve_inference_concurrency(monkeypatch : pytest.MonkeyPatch) -> None:
+	monkeypatch.setattr(os, 'cpu_count', lambda: 8)
+
+	assert resolve_inference_concurrency('face_detector_yunet') == 1
+	assert resolve_inference_concurrency('face_detector_yoloface') == 4
+	assert resolve_inference_concurrency('face_enhancer_gfpgan_1.4') == 4
+	assert resolve_inference_concurrency('voice_extractor') == 4
+	assert resolve_inference_concurrency('inswapper_128') == 0
+
+	facefusion.globals.execution_intra_op_thread_count = 4
+
+	assert resolve_inference_concurrency('face_detector_yoloface') == 2
+
+	facefusion.globals.execution_concurrency = 2
+
+	assert resolve_inference_concurrency('face_detector_yoloface') == 2
+	assert resolve_inference_concurrency('face_detector_yunet') == 1
+
+	facefusion.globals.execution_providers = [ 'DmlExecutionProvider' ]
+
+	assert resolve_inference_concurrency('face_detector_yoloface') == 1
+	assert resolve_inference_concurrency('inswapper_128') == 1
+
+
+def test_inference_semaphore() -> None:
+	assert inference_semaphore('inswapper_128') is NULL_CONTEXT
+	assert isinstance(inference_semaphore('face_detector_yunet'), threading.Semaphore)
+
+	facefusion.globals.execution_concurrency = 2
+
+	assert inference_semaphore('face_detector_yoloface') is inference_semaphore('face_detector_yoloface')
+	assert inference_semaphore('face_detector_yoloface') is not inference_semaphore('face_detector_scrfd')
+
+
+def test_stream_queue() -> None:
+	stream_queue : StreamQueue = Queue(maxsize = 1)
+	stop_event = threading.Event()
+	vision_frame = numpy.zeros((2, 2, 3), dtype = numpy.uint8)
+
+	assert put_stream_queue(stream_queue, vision_frame, stop_event) is True
+	assert next(iterate_stream_queue(stream_queue, stop_event)) is vision_frame
+
+	put_stream_queue(stream_queue, None, stop_event)
+
+	assert list(iterate_stream_queue(stream_queue, stop_event)) == []
+
+	put_stream_queue(stream_queue, vision_frame, stop_event)
+	stop_event.set()
+
+	assert put_stream_queue(stream_queue, vision_frame, stop_event) is False
+	assert len(list(iterate_stream_queue(stream_queue, stop_event))) == 1
@@ -1,8 +1,10 @@
 import subprocess
+import numpy
 import pytest
 
 from facefusion.download import conditional_download
-from facefusion.vision import detect_image_resolution, restrict_image_resolution, create_image_resolutions, get_video_frame, count_video_frame_total, detect_video_fps, restrict_video_fps, detect_video_resolution, restrict_video_resolution, create_video_resolutions, normalize_resolution, pack_resolution, unpack_resolution
+from facefusion import vision
+from facefusion.vision import detect_image_resolution, restrict_image_resolution, create_image_resolutions, get_video_frame, clear_video_pool, get_video_metadata, count_video_frame_total, detect_video_fps, restrict_video_fps, detect_video_resolution, restrict_video_resolution, create_video_resolutions, normalize_resolution, pack_resolution, unpack_resolution, create_tile_frames, merge_tile_frames, paste_tile_frame
 
 
 @pytest.fixture(scope = 'module', autouse = True)
@@ -51,6 +53,31 @@ def test_get_video_frame() -> None:
 	assert get_video_frame('invalid') is None
 
 
+def test_get_video_frame_with_video_pool() -> None:
+	clear_video_pool()
+	frame_numbers = [ 100, 101, 160, 50, 270, 100 ]
+	vision_frames = [ get_video_frame('.assets/examples/target-240p-25fps.mp4', frame_number) for frame_number in frame_numbers ]
+
+	assert len(vision.VIDEO_POOL) == 1
+	assert vision.VIDEO_POOL.get('.assets/examples/target-240p-25fps.mp4').get('frame_position') == 100
+
+	for frame_number, vision_frame in zip(frame_numbers, vision_frames):
+		clear_video_pool()
+
+		assert numpy.array_equal(get_video_frame('.assets/examples/target-240p-25fps.mp4', frame_number), vision_frame)
+
+
+def test_get_video_metadata() -> None:
+	video_metadata = get_video_metadata('.assets/examples/target-240p-25fps.mp4')
+
+	assert video_metadata.get('fps') == 25.0
+	assert video_metadata.get('resolution') == (426, 226)
+	assert video_metadata.get('frame_total') == 270
+	assert video_metadata.get('codec') == 'h264'
+	assert get_video_metadata('.assets/examples/target-240p-25fps.mp4') is video_metadata
+	assert get_video_metadata('invalid') is None
+
+
 def test_count_video_frame_total() -> None:
 	assert count_video_frame_total('.assets/examples/target-240p-25fps.mp4') == 270
 	assert count_video_frame_total('.assets/examples/target-240p-30fps.mp4') == 324
@@ -107,3 +134,26 @@ def test_pack_resolution() -> None:
 def test_unpack_resolution() -> None:
 	assert unpack_resolution('0x0') == (0, 0)
 	assert unpack_resolution('2x2') == (2, 2)
+
+
+def test_create_and_merge_tile_frames() -> None:
+	vision_frame = numpy.random.randint(0, 256, (100, 150, 3), dtype = numpy.uint8)
+
+	for size in [ (32, 4, 4), (32, 4, 0) ]:
+		tile_vision_frames, pad_width, pad_height = create_tile_frames(vision_frame, size)
+		merge_vision_frame = numpy.zeros((pad_height, pad_width, 3), dtype = numpy.uint8)
+
+		assert numpy.array_equal(merge_tile_frames(tile_vision_frames, 150, 100, pad_width, pad_height, size), vision_frame)
+		assert numpy.array_equal(merge_tile_frames(tile_vision_frames, 150, 100, pad_width, pad_height, size, merge_vision_frame), vision_frame)
+
+
+def test_paste_tile_frame() -> None:
+	vision_frame = numpy.random.randint(0, 256, (100, 150, 3), dtype = numpy.uint8)
+	size = (32, 4, 4)
+	tile_vision_frames, pad_width, _ = create_tile_frames(vision_frame, size)
+	tiles_per_row = (pad_width - 2 * size[2]) // (size[0] - 2 * size[2])
+	paste_vision_frame = numpy.zeros_like(vision_frame)
+
+	for tile_index, tile_vision_frame in enumerate(tile_vision_frames):
+		paste_tile_frame(paste_vision_frame, tile_vision_frame, tile_index, tiles_per_row, size)
+	assert numpy.array_equal(paste_vision_frame, vision_frame)